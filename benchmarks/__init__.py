@@ -0,0 +1,4 @@
+"""Benchmarks of template_analysis on synthetic corpora.
+
+Run ``python -m benchmarks`` from the repository root. See ``--help``.
+"""
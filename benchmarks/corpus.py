@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import string
+from collections.abc import Callable
+from dataclasses import dataclass
+from random import Random
+
+Generator = Callable[["Shape"], list[str]]
+
+SYMBOLS = string.ascii_lowercase + string.ascii_uppercase + string.digits
+
+
+@dataclass(frozen=True)
+class Shape:
+    """Parameters shared by every corpus generator.
+
+    Attributes:
+        count: Number of texts.
+        fields: Number of fields per text; text length grows with it.
+        density: Fraction of the fields whose value differs per text.
+        alphabet: Number of distinct characters values are drawn from.
+        seed: Seed of the generator, so that a shape is one fixed corpus.
+
+    """
+
+    count: int = 200
+    fields: int = 8
+    density: float = 0.25
+    alphabet: int = 26
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.alphabet <= len(SYMBOLS):
+            raise ValueError(
+                f"alphabet must be between 1 and {len(SYMBOLS)}, "
+                f"got {self.alphabet}.",
+            )
+
+
+def _word(rng: Random, alphabet: int, size: int) -> str:
+    return "".join(rng.choices(SYMBOLS[:alphabet], k=size))
+
+
+@dataclass(frozen=True)
+class _Fields:
+    """Constant field values plus the fields that vary per text."""
+
+    rng: Random
+    shape: Shape
+    names: list[str]
+    constants: list[str]
+    variable: frozenset[int]
+
+    @classmethod
+    def create(cls, shape: Shape) -> _Fields:
+        rng = Random(shape.seed)  # noqa: S311 - reproducible, not secret
+        names = [_word(rng, shape.alphabet, 4) for _ in range(shape.fields)]
+        constants = [_word(rng, shape.alphabet, 6) for _ in names]
+        varying = round(shape.fields * shape.density)
+        variable = frozenset(rng.sample(range(shape.fields), varying))
+        return cls(rng, shape, names, constants, variable)
+
+    def value(self, field: int) -> str:
+        if field not in self.variable:
+            return self.constants[field]
+        return _word(self.rng, self.shape.alphabet, self.rng.randint(1, 8))
+
+    def rows(self) -> list[list[str]]:
+        return [
+            [self.value(field) for field in range(self.shape.fields)]
+            for _ in range(self.shape.count)
+        ]
+
+
+def log_lines(shape: Shape) -> list[str]:
+    """Log lines such as ``'2024-01-01 00:00:07 INFO k=v k=v'``."""
+    fields = _Fields.create(shape)
+    return [
+        f"2024-01-01 00:{i // 60 % 60:02}:{i % 60:02} INFO "
+        + " ".join(
+            f"{name}={value}"
+            for name, value in zip(fields.names, row, strict=True)
+        )
+        for i, row in enumerate(fields.rows())
+    ]
+
+
+def html_documents(shape: Shape) -> list[str]:
+    """HTML lists with one ``<li>`` element per field."""
+    fields = _Fields.create(shape)
+    return [
+        "<ul>"
+        + "".join(
+            f'<li class="{name}"><a href="/{value}">{value}</a></li>'
+            for name, value in zip(fields.names, row, strict=True)
+        )
+        + "</ul>"
+        for row in fields.rows()
+    ]
+
+
+def csv_rows(shape: Shape) -> list[str]:
+    """Comma-separated rows with one column per field."""
+    return [",".join(row) for row in _Fields.create(shape).rows()]
+
+
+def repetitive_strings(shape: Shape) -> list[str]:
+    """Periodic strings with point mutations; a hard case for alignment.
+
+    Every text repeats the same short unit, so most characters have many
+    equally good partners in the other text, and ``density`` of the units
+    are replaced with random ones.
+    """
+    rng = Random(shape.seed)  # noqa: S311 - reproducible, not secret
+    unit = _word(rng, shape.alphabet, 3)
+    return [
+        "".join(
+            _word(rng, shape.alphabet, 3)
+            if rng.random() < shape.density
+            else unit
+            for _ in range(shape.fields * 4)
+        )
+        for _ in range(shape.count)
+    ]
+
+
+CORPORA: dict[str, Generator] = {
+    "log": log_lines,
+    "html": html_documents,
+    "csv": csv_rows,
+    "repetitive": repetitive_strings,
+}
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from template_analysis import analyze
+
+from .corpus import CORPORA, Shape
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# Every axis is scaled on its own, with the other parameters left at the
+# defaults of Shape, which gives one scaling curve per corpus and axis.
+CURVES: dict[str, tuple[Shape, ...]] = {
+    "count": tuple(Shape(count=n) for n in (50, 100, 200, 400)),
+    "fields": tuple(Shape(fields=n) for n in (4, 8, 16, 32)),
+    "density": tuple(Shape(density=d) for d in (0.1, 0.25, 0.5)),
+    "alphabet": tuple(Shape(alphabet=n) for n in (2, 8, 26, 62)),
+}
+
+
+@dataclass(frozen=True)
+class Case:
+    corpus: str
+    shape: Shape
+    backend: str
+
+    @property
+    def name(self) -> str:
+        s = self.shape
+        return (
+            f"{self.corpus}/{self.backend}/count={s.count},fields={s.fields},"
+            f"density={s.density},alphabet={s.alphabet}"
+        )
+
+    def texts(self) -> list[str]:
+        return CORPORA[self.corpus](self.shape)
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Cost of analyzing one corpus.
+
+    Attributes:
+        name: Name of the case, which identifies it in baselines.
+        seconds: Best wall time of analyze() over the repeats.
+        peak_bytes: Peak memory allocated by analyze(), from tracemalloc.
+        merges_per_second: Pairwise merges (texts - 1) per second.
+
+    """
+
+    name: str
+    seconds: float
+    peak_bytes: int
+    merges_per_second: float
+
+
+def cases(corpora: Sequence[str], backend: str) -> Iterator[Case]:
+    """Yield every point of every scaling curve once."""
+    shapes = dict.fromkeys(s for curve in CURVES.values() for s in curve)
+    for corpus in corpora:
+        yield from (Case(corpus, shape, backend) for shape in shapes)
+
+
+def _wall_time(texts: list[str], backend: str) -> float:
+    start = time.perf_counter()
+    analyze(texts, backend=backend)
+    return time.perf_counter() - start
+
+
+def _peak_bytes(texts: list[str], backend: str) -> int:
+    # Measured in a separate run: tracing slows allocation down and would
+    # distort the wall time.
+    tracemalloc.start()
+    try:
+        analyze(texts, backend=backend)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case: Case, repeat: int = 1) -> Measurement:
+    texts = case.texts()
+    seconds = min(_wall_time(texts, case.backend) for _ in range(repeat))
+    return Measurement(
+        case.name,
+        seconds,
+        _peak_bytes(texts, case.backend),
+        (len(texts) - 1) / seconds,
+    )
+
+
+def load_baseline(path: Path) -> dict[str, Measurement]:
+    if not path.exists():
+        return {}
+    records = json.loads(path.read_text())["measurements"]
+    return {record["name"]: Measurement(**record) for record in records}
+
+
+def save_baseline(path: Path, measurements: list[Measurement]) -> None:
+    records = [asdict(m) for m in measurements]
+    path.write_text(json.dumps({"measurements": records}, indent=2) + "\n")
+
+
+def _report(measurement: Measurement, baseline: Measurement | None) -> str:
+    line = (
+        f"{measurement.name}: {measurement.seconds * 1000:.1f} ms, "
+        f"{measurement.peak_bytes / 1024:.0f} KiB, "
+        f"{measurement.merges_per_second:.0f} merges/s"
+    )
+    if baseline is None:
+        return line
+    return f"{line} ({measurement.seconds / baseline.seconds:.2f}x baseline)"
+
+
+def _is_regression(
+    measurement: Measurement,
+    baseline: Measurement | None,
+    tolerance: float,
+) -> bool:
+    if baseline is None:
+        return False
+    return measurement.seconds > baseline.seconds * tolerance
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Measure analyze() on synthetic corpora.",
+    )
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=sorted(CORPORA),
+        help="corpus to run; may be repeated (default: all)",
+    )
+    parser.add_argument("--backend", default="difflib")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="write the measurements to the baseline file",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="slowdown over the baseline reported as a regression",
+    )
+    return parser
+
+
+def run(
+    selected: Iterator[Case],
+    baseline: dict[str, Measurement],
+    options: argparse.Namespace,
+) -> tuple[list[Measurement], int]:
+    """Measure and report every case; also count the regressions."""
+    measurements = []
+    regressions = 0
+    for case in selected:
+        measurement = measure(case, options.repeat)
+        previous = baseline.get(measurement.name)
+        print(_report(measurement, previous))
+        measurements.append(measurement)
+        regressions += _is_regression(measurement, previous, options.tolerance)
+    return measurements, regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks and compare them with the baseline.
+
+    Returns:
+        1 if a case is slower than the baseline by more than the
+        tolerance, otherwise 0.
+
+    """
+    options = _parser().parse_args(argv)
+    baseline = {} if options.save else load_baseline(options.baseline)
+    selected = cases(options.corpus or list(CORPORA), options.backend)
+    measurements, regressions = run(selected, baseline, options)
+    if options.save:
+        save_baseline(options.baseline, measurements)
+    return int(regressions > 0)
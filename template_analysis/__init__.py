@@ -10,21 +10,71 @@ try:
     from ._version import __version__
 except ImportError:
     __version__ = "unknown"
-from .analyzer import Analyzer, AnalyzerResult, analyze
+from .aio import analyze_async, analyze_incremental
+from .alignment import AlignmentBackend, AnchoredBackend, BackendLike
+from .analyzer import Analyzer, AnalyzerResult, MergeOrder, analyze
+from .cache import AnalysisCache
+from .clustering import ClusterResult, analyze_clusters
+from .columns import SpanTable
+from .extract import ExtractedColumns, extract_columns, extract_file
+from .matcher import TemplateMatcher
+from .refine import refine
+from .serialization import (
+    SerializationFormat,
+    dump_result,
+    dump_template,
+    load_result,
+    load_template,
+)
+from .spill import SpilledResult, analyze_spilled
+from .stats import AnalyzerStats, MergeStats
+from .streaming import StreamingAnalyzer
 from .symbol import Chunks, Symbol, SymbolString, SymbolTable
 from .template import PlainText, Template, TemplatePart, Variable
+from .tokenizer import Tokenizer, TokenizerLike
+from .tree import TreeFormat, TreeResult, analyze_tree
 
 __all__ = [
+    "AlignmentBackend",
+    "AnalysisCache",
     "Analyzer",
     "AnalyzerResult",
+    "AnalyzerStats",
+    "AnchoredBackend",
+    "BackendLike",
     "Chunks",
+    "ClusterResult",
+    "ExtractedColumns",
+    "MergeOrder",
+    "MergeStats",
     "PlainText",
+    "SerializationFormat",
+    "SpanTable",
+    "SpilledResult",
+    "StreamingAnalyzer",
     "Symbol",
     "SymbolString",
     "SymbolTable",
     "Template",
+    "TemplateMatcher",
     "TemplatePart",
+    "Tokenizer",
+    "TokenizerLike",
+    "TreeFormat",
+    "TreeResult",
     "Variable",
     "__version__",
     "analyze",
+    "analyze_async",
+    "analyze_clusters",
+    "analyze_incremental",
+    "analyze_spilled",
+    "analyze_tree",
+    "dump_result",
+    "dump_template",
+    "extract_columns",
+    "extract_file",
+    "load_result",
+    "load_template",
+    "refine",
 ]
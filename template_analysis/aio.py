@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+from functools import partial
+
+from .alignment import BackendLike
+from .analyzer import Analyzer, AnalyzerResult
+from .streaming import StreamingAnalyzer
+from .tokenizer import TokenizerLike
+
+Texts = AsyncIterable[str] | Iterable[str]
+
+
+async def _from_iterable(texts: Iterable[str]) -> AsyncIterator[str]:
+    for text in texts:
+        yield text
+
+
+def _aiter(texts: Texts) -> AsyncIterator[str]:
+    if isinstance(texts, AsyncIterable):
+        return aiter(texts)
+    return _from_iterable(texts)
+
+
+async def _take(texts: AsyncIterator[str], size: int) -> list[str]:
+    batch: list[str] = []
+    while len(batch) < size and (text := await anext(texts, None)) is not None:
+        batch.append(text)
+    return batch
+
+
+async def analyze_incremental(
+    texts: Texts,
+    *,
+    batch_size: int = 256,
+    tokenizer: TokenizerLike = "char",
+    backend: BackendLike = "difflib",
+    max_texts: int | None = None,
+    executor: Executor | None = None,
+) -> AsyncIterator[AnalyzerResult]:
+    """Analyze texts from an async iterable without blocking the loop.
+
+    Texts are read in batches. Each batch is analyzed in ``executor`` and
+    then merged into the result so far in a worker thread, and the result
+    after every batch is yielded. The next batch is only read once the
+    previous result has been consumed, so a slow consumer slows down the
+    reading instead of buffering texts.
+
+    Args:
+        texts: Texts to analyze, from an async or a plain iterable.
+        batch_size: Number of texts analyzed per step.
+        tokenizer: See ``analyze``.
+        backend: See ``analyze``.
+        max_texts: Optional upper bound on the number of texts.
+        executor: Executor that analyzes the batches; None (default) uses
+            the default executor of the loop. A ``ProcessPoolExecutor``
+            keeps the merges off the loop's thread entirely, but then the
+            tokenizer and backend must be picklable.
+
+    Yields:
+        The result for all texts read so far, after every batch.
+
+    Raises:
+        ValueError: If batch_size is less than 1, texts would exceed
+            max_texts, or an option is invalid.
+
+    Example:
+        >>> async def results():
+        ...     texts = ["id=1", "id=2", "id=3"]
+        ...     async for result in analyze_incremental(texts, batch_size=2):
+        ...         print(result.to_format_string(), len(result.args))
+        >>> asyncio.run(results())
+        id={0} 2
+        id={0} 3
+
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}.")
+    loop = asyncio.get_running_loop()
+    stream = StreamingAnalyzer.create(
+        tokenizer=tokenizer,
+        backend=backend,
+        max_texts=max_texts,
+    )
+    analyze_batch = partial(
+        Analyzer.analyze,
+        tokenizer=tokenizer,
+        backend=backend,
+    )
+    source = _aiter(texts)
+    while batch := await _take(source, batch_size):
+        Analyzer._assert_max_texts(stream.count + len(batch), max_texts)
+        result = await loop.run_in_executor(executor, analyze_batch, batch)
+        await asyncio.to_thread(stream.feed_result, result)
+        yield stream.snapshot()
+
+
+async def analyze_async(
+    texts: Texts,
+    *,
+    batch_size: int = 256,
+    tokenizer: TokenizerLike = "char",
+    backend: BackendLike = "difflib",
+    max_texts: int | None = None,
+    executor: Executor | None = None,
+) -> AnalyzerResult:
+    """Analyze texts from an async iterable and return the final result.
+
+    See ``analyze_incremental`` for the options.
+
+    Raises:
+        ValueError: If texts is empty, or as ``analyze_incremental``.
+
+    """
+    result = None
+    async for snapshot in analyze_incremental(
+        texts,
+        batch_size=batch_size,
+        tokenizer=tokenizer,
+        backend=backend,
+        max_texts=max_texts,
+        executor=executor,
+    ):
+        result = snapshot
+    if result is None:
+        raise ValueError("texts are empty.")
+    return result
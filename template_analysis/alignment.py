@@ -0,0 +1,509 @@
+from __future__ import annotations
+
+import bisect
+import difflib
+import time
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from itertools import pairwise
+
+# (a, b, size): seq1[a:a + size] == seq2[b:b + size]
+Match = difflib.Match
+Element = Hashable
+AlignmentBackend = Callable[
+    [Sequence[Element], Sequence[Element]],
+    list[Match],
+]
+BackendLike = str | AlignmentBackend
+Gram = tuple[Element, ...]
+# Differences after which myers_blocks hands the alignment to difflib: the
+# trace of Myers' forward pass grows with their square, and the pure Python
+# rounds get slower than difflib's search.
+MYERS_MAX_EDITS = 1024
+
+
+def difflib_blocks(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+) -> list[Match]:
+    """Align two sequences with ``difflib.SequenceMatcher``.
+
+    autojunk is disabled: it drops frequent elements such as spaces from
+    matching on texts over 200 elements, which splits shared text into
+    spurious variables.
+    """
+    matcher = difflib.SequenceMatcher(None, seq1, seq2, autojunk=False)
+    return matcher.get_matching_blocks()
+
+
+def _common_prefix(seq1: Sequence[Element], seq2: Sequence[Element]) -> int:
+    size = 0
+    for x, y in zip(seq1, seq2, strict=False):
+        if x != y:
+            break
+        size += 1
+    return size
+
+
+def _common_suffix(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+    limit: int,
+) -> int:
+    size = 0
+    while size < limit and seq1[-1 - size] == seq2[-1 - size]:
+        size += 1
+    return size
+
+
+def _goes_down(window: list[int], k: int, d: int) -> bool:
+    # window[i] holds V[k] for k = i - d - 1.
+    if k == -d:
+        return True
+    return k != d and window[k + d] < window[k + d + 2]
+
+
+def _start_x(window: list[int], k: int, d: int) -> int:
+    """Return where round d enters diagonal k: down from k + 1 or right."""
+    if _goes_down(window, k, d):
+        return window[k + d + 2]
+    return window[k + d] + 1
+
+
+def _snake(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+    x: int,
+    y: int,
+) -> int:
+    while x < len(seq1) and y < len(seq2) and seq1[x] == seq2[y]:
+        x += 1
+        y += 1
+    return x
+
+
+def _myers_trace(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+) -> list[list[int]] | None:
+    """Run the forward pass of Myers' O(ND) algorithm.
+
+    Returns the V array before each round d, clipped to k in [-d-1, d+1],
+    which is all the backtracking pass needs, or None if the sequences
+    differ in more than ``MYERS_MAX_EDITS`` places.
+    """
+    offset = len(seq1) + len(seq2) + 1
+    v = [0] * (2 * offset + 1)
+    trace: list[list[int]] = []
+    for d in range(min(offset, MYERS_MAX_EDITS + 1)):
+        window = v[offset - d - 1 : offset + d + 2]
+        trace.append(window)
+        if _myers_round(seq1, seq2, v, offset, window, d):
+            return trace
+    return None
+
+
+def _myers_round(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+    v: list[int],
+    offset: int,
+    window: list[int],
+    d: int,
+) -> bool:
+    """Extend every diagonal by one edit; return True once (n, m) is hit."""
+    for k in range(-d, d + 1, 2):
+        x = _start_x(window, k, d)
+        v[offset + k] = x = _snake(seq1, seq2, x, x - k)
+        if x >= len(seq1) and x - k >= len(seq2):
+            return True
+    return False
+
+
+def _myers_snakes(
+    trace: list[list[int]],
+    x: int,
+    y: int,
+) -> Iterator[Match]:
+    for d in range(len(trace) - 1, -1, -1):
+        window, k = trace[d], x - y
+        start_x = _start_x(window, k, d)
+        yield Match(start_x, start_x - k, x - start_x)
+        prev_k = k + 1 if _goes_down(window, k, d) else k - 1
+        x = window[prev_k + d + 1]
+        y = x - prev_k
+
+
+def _append_block(merged: list[Match], block: Match) -> None:
+    last = merged[-1] if merged else None
+    if last and (last.a + last.size, last.b + last.size) == block[:2]:
+        merged[-1] = Match(last.a, last.b, last.size + block.size)
+        return
+    merged.extend([block] if block.size else [])
+
+
+def _merge_adjacent(blocks: Iterator[Match]) -> list[Match]:
+    merged: list[Match] = []
+    for block in blocks:
+        _append_block(merged, block)
+    return merged
+
+
+def _myers_middle(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+) -> Iterable[Match]:
+    trace = _myers_trace(seq1, seq2)
+    if trace is None:
+        return difflib_blocks(seq1, seq2)
+    return reversed(list(_myers_snakes(trace, len(seq1), len(seq2))))
+
+
+def myers_blocks(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+) -> list[Match]:
+    """Align two sequences with Myers' O(ND) diff algorithm.
+
+    The common prefix and suffix are stripped first. The remaining middle
+    is aligned with a longest common subsequence whose time grows with the
+    number of differences D rather than with the product of the lengths,
+    which keeps long, mostly equal texts fast. Its memory grows with D
+    squared, and on dissimilar texts the pure Python rounds are slower
+    than difflib, so a middle with more than ``MYERS_MAX_EDITS``
+    differences is aligned by difflib instead.
+    """
+    prefix = _common_prefix(seq1, seq2)
+    limit = min(len(seq1), len(seq2)) - prefix
+    suffix = _common_suffix(seq1, seq2, limit)
+    mid1 = seq1[prefix : len(seq1) - suffix]
+    mid2 = seq2[prefix : len(seq2) - suffix]
+    snakes = _myers_middle(mid1, mid2)
+    blocks = [
+        Match(0, 0, prefix),
+        *(Match(s.a + prefix, s.b + prefix, s.size) for s in snakes),
+        Match(len(seq1) - suffix, len(seq2) - suffix, suffix),
+    ]
+    return [
+        *_merge_adjacent(iter(blocks)),
+        Match(len(seq1), len(seq2), 0),
+    ]
+
+
+def _unique_grams(seq: Sequence[Element], size: int) -> dict[Gram, int]:
+    """Return the position of every ``size``-gram that occurs once."""
+    first: dict[Gram, int] = {}
+    repeated: set[Gram] = set()
+    for i in range(len(seq) - size + 1):
+        gram = tuple(seq[i : i + size])
+        if first.setdefault(gram, i) != i:
+            repeated.add(gram)
+    return {gram: i for gram, i in first.items() if gram not in repeated}
+
+
+def _increasing(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Return a longest run of pairs increasing in both positions.
+
+    ``pairs`` are sorted by their first position; this is patience sorting
+    on the second one, in O(n log n).
+    """
+    tops: list[int] = []
+    top_index: list[int] = []
+    previous = [-1] * len(pairs)
+    for i, (_, b) in enumerate(pairs):
+        pile = bisect.bisect_left(tops, b)
+        previous[i] = top_index[pile - 1] if pile else -1
+        del tops[pile:], top_index[pile:]
+        tops.append(b)
+        top_index.append(i)
+    chain = [top_index[-1]] if top_index else []
+    while chain and previous[chain[-1]] >= 0:
+        chain.append(previous[chain[-1]])
+    return [pairs[i] for i in reversed(chain)]
+
+
+def _anchors(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+    size: int,
+) -> list[Match]:
+    """Return non-overlapping grams that are unique in and common to both.
+
+    Like patience diff, an element run that occurs exactly once on each
+    side almost surely belongs to the alignment, and any increasing chain
+    of them splits the problem into independent segments.
+    """
+    grams1, grams2 = _unique_grams(seq1, size), _unique_grams(seq2, size)
+    pairs = sorted((i, grams2[g]) for g, i in grams1.items() if g in grams2)
+    anchors: list[Match] = []
+    end_a = end_b = 0
+    for a, b in _increasing(pairs):
+        if a >= end_a and b >= end_b:
+            anchors.append(Match(a, b, size))
+            end_a, end_b = a + size, b + size
+    return anchors
+
+
+def _segments(
+    anchors: list[Match],
+    end_a: int,
+    end_b: int,
+) -> list[tuple[int, int, int, int]]:
+    """Return the ranges of both sequences around and between anchors."""
+    bounds = [Match(0, 0, 0), *anchors, Match(end_a, end_b, 0)]
+    return [
+        (x.a + x.size, y.a, x.b + x.size, y.b) for x, y in pairwise(bounds)
+    ]
+
+
+def _offset(block: Match, a: int, b: int) -> Match:
+    return Match(block.a + a, block.b + b, block.size)
+
+
+@dataclass(frozen=True)
+class AnchoredBackend:
+    """Split an alignment at unique common anchors, then align each segment.
+
+    The common prefix and suffix are stripped, and runs of ``anchor_size``
+    elements that occur exactly once in both sequences, in the same order,
+    are matched up front. The segments between those anchors are aligned
+    independently by ``inner``, so one long quadratic problem becomes many
+    small ones, and the blocks are stitched back together.
+
+    Attributes:
+        inner: Backend that aligns every segment.
+        anchor_size: Number of elements per anchor. Longer anchors are
+            rarer but safer to match blindly.
+        executor: Optional executor that aligns the segments of a merge
+            concurrently. It is not pickled, so merges in worker processes
+            align their segments serially.
+
+    Example:
+        >>> backend = AnchoredBackend.create(anchor_size=3)
+        >>> backend("xxabcdefyy", "zabcdefw")
+        [Match(a=2, b=1, size=6), Match(a=10, b=8, size=0)]
+
+    """
+
+    inner: AlignmentBackend = difflib_blocks
+    anchor_size: int = 8
+    executor: Executor | None = field(default=None, compare=False)
+
+    @classmethod
+    def create(
+        cls,
+        inner: BackendLike = "difflib",
+        *,
+        anchor_size: int = 8,
+        executor: Executor | None = None,
+    ) -> AnchoredBackend:
+        """Create an anchored backend.
+
+        Raises:
+            ValueError: If ``inner`` is unknown or anchor_size is less
+                than 1.
+
+        """
+        if anchor_size < 1:
+            raise ValueError(
+                f"anchor_size must be at least 1, got {anchor_size}.",
+            )
+        return cls(resolve_backend(inner), anchor_size, executor)
+
+    def __repr__(self) -> str:
+        # Stable across processes, so that caches can key on it.
+        name = getattr(self.inner, "__qualname__", repr(self.inner))
+        return f"AnchoredBackend({name}, anchor_size={self.anchor_size})"
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return (AnchoredBackend, (self.inner, self.anchor_size))
+
+    def __call__(
+        self,
+        seq1: Sequence[Element],
+        seq2: Sequence[Element],
+    ) -> list[Match]:
+        prefix = _common_prefix(seq1, seq2)
+        limit = min(len(seq1), len(seq2)) - prefix
+        suffix = _common_suffix(seq1, seq2, limit)
+        middle = self._align_middle(
+            seq1[prefix : len(seq1) - suffix],
+            seq2[prefix : len(seq2) - suffix],
+        )
+        blocks = [
+            Match(0, 0, prefix),
+            *(_offset(block, prefix, prefix) for block in middle),
+            Match(len(seq1) - suffix, len(seq2) - suffix, suffix),
+        ]
+        return [
+            *_merge_adjacent(iter(blocks)),
+            Match(len(seq1), len(seq2), 0),
+        ]
+
+    def _align_middle(
+        self,
+        seq1: Sequence[Element],
+        seq2: Sequence[Element],
+    ) -> list[Match]:
+        anchors = _anchors(seq1, seq2, self.anchor_size)
+        segments = _segments(anchors, len(seq1), len(seq2))
+        aligned = self._align_segments(
+            [seq1[a1:a2] for a1, a2, _, _ in segments],
+            [seq2[b1:b2] for _, _, b1, b2 in segments],
+        )
+        inner = (
+            _offset(block, a1, b1)
+            for blocks, (a1, _, b1, _) in zip(aligned, segments, strict=True)
+            for block in blocks
+        )
+        return sorted([*anchors, *inner])
+
+    def _align_segments(
+        self,
+        segments1: list[Sequence[Element]],
+        segments2: list[Sequence[Element]],
+    ) -> list[list[Match]]:
+        if self.executor is None:
+            return list(map(self.inner, segments1, segments2))
+        return list(self.executor.map(self.inner, segments1, segments2))
+
+
+def _unaligned(
+    seq1: Sequence[Element],
+    seq2: Sequence[Element],
+) -> list[Match]:
+    return [Match(len(seq1), len(seq2), 0)]
+
+
+# Matches only the common prefix and suffix and the unique anchors between
+# them, in O(n log n); everything between two anchors becomes a variable.
+anchors_only = AnchoredBackend(_unaligned, anchor_size=4)
+
+
+def comparisons(seq1: Sequence[Element], seq2: Sequence[Element]) -> int:
+    """Return the number of pairs of equal elements of two sequences.
+
+    This is how many element pairs a quadratic alignment such as difflib's
+    compares in the worst case, and it takes linear time to count.
+
+    Example:
+        >>> comparisons("abab", "aab")
+        6
+
+    """
+    counts = Counter(seq1)
+    return sum(counts[element] for element in seq2)
+
+
+@dataclass(frozen=True)
+class BudgetBackend:
+    """Align with ``inner`` within a budget, and with ``fallback`` beyond.
+
+    The deadline is a ``time.monotonic()`` value, which worker processes
+    share with their parent on the usual platforms.
+
+    Attributes:
+        inner: Backend used within the budget.
+        deadline: Time from which on ``fallback`` is used, or None.
+        max_comparisons: ``fallback`` is used for sequences with more
+            ``comparisons`` than this, or None.
+        fallback: Backend used beyond the budget; by default
+            ``anchors_only``.
+
+    Example:
+        >>> backend = BudgetBackend.create(difflib_blocks, max_comparisons=4)
+        >>> backend.select("abab", "aab")[1]
+        True
+        >>> backend("xxabcdyy", "zzabcdww")
+        [Match(a=2, b=2, size=4), Match(a=8, b=8, size=0)]
+
+    """
+
+    inner: AlignmentBackend
+    deadline: float | None = None
+    max_comparisons: int | None = None
+    fallback: AlignmentBackend = anchors_only
+
+    @classmethod
+    def create(
+        cls,
+        inner: AlignmentBackend,
+        *,
+        seconds: float | None = None,
+        max_comparisons: int | None = None,
+    ) -> BudgetBackend:
+        """Create a backend whose time budget starts now.
+
+        Raises:
+            ValueError: If seconds is negative or max_comparisons is less
+                than 1.
+
+        """
+        if seconds is not None and seconds < 0:
+            raise ValueError(f"budget must be at least 0, got {seconds}.")
+        if max_comparisons is not None and max_comparisons < 1:
+            raise ValueError(
+                f"max_comparisons must be at least 1, got {max_comparisons}.",
+            )
+        deadline = None if seconds is None else time.monotonic() + seconds
+        return cls(inner, deadline, max_comparisons)
+
+    def select(
+        self,
+        seq1: Sequence[Element],
+        seq2: Sequence[Element],
+    ) -> tuple[AlignmentBackend, bool]:
+        """Return the backend to use and whether it is the fallback."""
+        if self._expired() or self._too_large(seq1, seq2):
+            return self.fallback, True
+        return self.inner, False
+
+    def _expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _too_large(
+        self,
+        seq1: Sequence[Element],
+        seq2: Sequence[Element],
+    ) -> bool:
+        limit = self.max_comparisons
+        return limit is not None and comparisons(seq1, seq2) > limit
+
+    def __call__(
+        self,
+        seq1: Sequence[Element],
+        seq2: Sequence[Element],
+    ) -> list[Match]:
+        return self.select(seq1, seq2)[0](seq1, seq2)
+
+
+BACKENDS: dict[str, AlignmentBackend] = {
+    "difflib": difflib_blocks,
+    "myers": myers_blocks,
+    "anchored": AnchoredBackend(),
+}
+
+
+def resolve_backend(backend: BackendLike) -> AlignmentBackend:
+    """Turn a backend name or callable into an alignment backend.
+
+    A backend takes two sequences and returns matching blocks with the
+    contract of ``difflib.SequenceMatcher.get_matching_blocks()``: blocks
+    are non-overlapping, increasing in both sequences, and the list ends
+    with the sentinel ``(len(seq1), len(seq2), 0)``.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+
+    """
+    if not isinstance(backend, str):
+        return backend
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown backend {backend!r}; expected one of "
+            f"{sorted(BACKENDS)} or a callable.",
+        ) from None
@@ -1,28 +1,55 @@
 from __future__ import annotations
 
-import difflib
-import unicodedata
-from collections.abc import Iterator
+from array import array
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
-
+from functools import cached_property
+from itertools import chain, repeat
+from random import Random
+from time import perf_counter
+from types import MappingProxyType
+from typing import Literal
+
+from .alignment import (
+    AlignmentBackend,
+    BackendLike,
+    BudgetBackend,
+    Match,
+    difflib_blocks,
+    resolve_backend,
+)
+from .columns import SpanTable
+from .matcher import Span, scan_spans
+from .minhash import guide_tree, signature
+from .stats import AnalyzerStats, MergeStats
 from .symbol import (
     Chunks,
     Symbol,
-    SymbolChunk,
     SymbolChunks,
     SymbolOrCharacter,
     SymbolString,
     SymbolTable,
     SymbolTemplate,
-    to_symbol_chunks,
 )
 from .template import Template
+from .tokenizer import (
+    Tokenizer,
+    TokenizerLike,
+    nfc,
+    resolve_tokenizer,
+    tokenize_chars,
+)
 
-
-def chunk_to_symbol_string(chunk: SymbolChunk) -> SymbolString:
-    if isinstance(chunk, Symbol):
-        return [chunk]
-    return list(chunk)
+# "sequential" folds texts left to right; "tree" merges them pairwise in a
+# balanced reduction whose independent merges can run in worker processes;
+# "similarity" merges the most similar texts first, along a guide tree.
+MergeOrder = Literal["sequential", "tree", "similarity"]
+MERGE_ORDERS: tuple[MergeOrder, ...] = ("sequential", "tree", "similarity")
+# Bytes-like texts are analyzed byte by byte.
+TextLike = str | bytes | memoryview
+BINARY_ENCODING = "latin-1"
 
 
 @dataclass(frozen=True, eq=False)
@@ -31,8 +58,14 @@ class AnalyzerResult:
 
     Attributes:
         text: Symbolic string representing the generalized template structure.
-        tables: One symbol table per analyzed text, mapping symbols to their
-            concrete values in that text.
+        table: Columnar store of where every symbol's value lies in each
+            analyzed text.
+        approximate: Whether some merge exceeded the ``budget`` or
+            ``max_comparisons`` of ``analyze`` and used approximate
+            alignment. The template may then have more variables than an
+            exact analysis would find, but it still matches every text and
+            the args are exact. Results are only equal if both or neither
+            are approximate.
 
     Example:
         >>> result = analyze(["Hello Alice", "Hello Bob"])
@@ -46,42 +79,166 @@ class AnalyzerResult:
     """
 
     text: tuple[SymbolOrCharacter, ...]
-    tables: tuple[SymbolTable, ...]
+    table: SpanTable
+    approximate: bool = False
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, AnalyzerResult):
             return NotImplemented
         return (
             self.to_format_string() == other.to_format_string()
-            and self.args == other.args
+            and self.columns == other.columns
+            and self.table.binary == other.table.binary
+            and self.approximate == other.approximate
         )
 
     def __hash__(self) -> int:
+        return self._hash
+
+    # Results are immutable, so everything derived from them is computed on
+    # first access and kept on the instance.
+
+    @cached_property
+    def _hash(self) -> int:
         return hash(
-            (self.to_format_string(), tuple(tuple(a) for a in self.args)),
+            (
+                self.to_format_string(),
+                self.columns,
+                self.table.binary,
+                self.approximate,
+            ),
         )
 
-    @property
+    @cached_property
+    def _format_string(self) -> str:
+        return self.template.to_format_string()
+
+    @cached_property
     def template(self) -> Template:
         return Template.from_symbol_template(
             SymbolTemplate(list(self.text), SymbolTable.create()),
         )
 
-    @property
+    @cached_property
+    def symbols(self) -> tuple[Symbol, ...]:
+        return tuple(s for s in self.text if isinstance(s, Symbol))
+
+    @cached_property
+    def columns(self) -> tuple[tuple[str, ...], ...]:
+        """Materialized args matrix: the values of each variable per text."""
+        return tuple(self.table.column(symbol) for symbol in self.symbols)
+
+    @cached_property
     def args(self) -> list[Chunks]:
-        return [
-            SymbolTemplate(list(self.text), table).args()
-            for table in self.tables
-        ]
+        """The values of the variables for each text.
+
+        The list is built once and shared between accesses; treat it as
+        read-only, or use ``row`` for a fresh copy of one row.
+        """
+        if not self.columns:
+            return [[] for _ in range(len(self.table))]
+        return [list(row) for row in zip(*self.columns, strict=True)]
+
+    @cached_property
+    def byte_columns(self) -> tuple[tuple[bytes, ...], ...]:
+        """The values of each variable per text, as bytes.
+
+        For texts given as bytes these equal the slices of the original
+        bytes; otherwise the values are encoded as UTF-8. This is a
+        convenience, not a fast path: the original bytes are not kept, so
+        every value is encoded again, from one Latin-1 character per byte.
+        Use ``spans`` to slice the original bytes without copying.
+        """
+        encoding = BINARY_ENCODING if self.table.binary else "utf-8"
+        return tuple(
+            tuple(value.encode(encoding) for value in column)
+            for column in self.columns
+        )
+
+    @cached_property
+    def byte_args(self) -> list[list[bytes]]:
+        """The values of the variables for each text, as bytes.
+
+        See ``byte_columns``; shared between accesses like ``args``.
+
+        Example:
+            >>> analyze([b"id=7", b"id=42"]).byte_args
+            [[b'7'], [b'42']]
+
+        """
+        if not self.byte_columns:
+            return [[] for _ in range(len(self.table))]
+        return [list(row) for row in zip(*self.byte_columns, strict=True)]
+
+    @cached_property
+    def sources(self) -> tuple[str, ...]:
+        """The analyzed texts after NFC normalization, in input order.
+
+        Texts given as bytes are decoded as Latin-1 instead, one character
+        per byte.
+        """
+        return tuple(self.table.sources)
+
+    def spans(self, var_id: int) -> tuple[array[int], array[int]]:
+        """Return where variable ``var_id`` lies in every source text.
+
+        Row ``i`` of the result is ``sources[i]``, and the value of the
+        variable in it is ``sources[i][starts[i]:ends[i]]``. The offsets
+        are compact integer arrays, so they can be handed to columnar
+        writers without creating a string per value.
+
+        Returns:
+            The arrays ``(starts, ends)``, one item per text.
+
+        Example:
+            >>> result = analyze(["id=7", "id=42"])
+            >>> starts, ends = result.spans(0)
+            >>> starts.tolist(), ends.tolist()
+            ([3, 3], [4, 5])
+
+        """
+        return self.table.offsets(self.symbols[var_id])
+
+    def row(self, index: int) -> Chunks:
+        """Return the values of the variables for the text at ``index``."""
+        if not -len(self.table) <= index < len(self.table):
+            raise IndexError("row index out of range")
+        return [column[index] for column in self.columns]
+
+    def column(self, var_id: int) -> tuple[str, ...]:
+        """Return the values of variable ``var_id`` for every text."""
+        return self.columns[var_id]
+
+    def byte_column(self, var_id: int) -> tuple[bytes, ...]:
+        """Return the values of variable ``var_id`` as bytes."""
+        return self.byte_columns[var_id]
+
+    @property
+    def tables(self) -> tuple[SymbolTable, ...]:
+        """One symbol table per analyzed text, mapping symbols to values."""
+        return tuple(
+            SymbolTable(
+                MappingProxyType(dict(zip(self.symbols, row, strict=True))),
+            )
+            for row in self.args
+        )
 
     def to_format_string(self) -> str:
-        return self.template.to_format_string()
+        return self._format_string
 
     @classmethod
-    def _from_text(cls, text: str) -> AnalyzerResult:
+    def _from_text(
+        cls,
+        text: TextLike,
+        tokenizer: Tokenizer = tokenize_chars,
+    ) -> AnalyzerResult:
+        source = _source(text)
         return AnalyzerResult(
-            text=tuple(unicodedata.normalize("NFC", text)),
-            tables=(SymbolTable.create(),),
+            text=tuple(tokenizer(source)),
+            table=SpanTable.from_source(
+                source,
+                binary=not isinstance(text, str),
+            ),
         )
 
 
@@ -97,7 +254,8 @@ class Analyzer:
     text: SymbolString
     pos: int
     parsed: SymbolChunks
-    table: SymbolTable
+    # Every symbol created with the range of `text` elements it replaces.
+    spans: list[tuple[Symbol, int, int]]
 
     @classmethod
     def create(cls, text: str | SymbolString) -> Analyzer:
@@ -105,7 +263,7 @@ class Analyzer:
             list(text),
             pos=0,
             parsed=[],
-            table=SymbolTable.create(),
+            spans=[],
         )
 
     def _proceed(self, size: int) -> None:
@@ -113,15 +271,21 @@ class Analyzer:
 
     @property
     def parsed_text(self) -> SymbolString:
+        # Matched tokens are kept one per element so that multi-character
+        # tokens survive later merges intact.
+        return list(self.parsed)
+
+    @property
+    def kept(self) -> list[Symbol]:
+        # Symbols present on both sides are matched like any element and
+        # pass into the parsed text without a span of their own.
+        created = {symbol for symbol, _, _ in self.spans}
         return [
-            symbol_or_character
-            for chunk in self.parsed
-            for symbol_or_character in chunk_to_symbol_string(chunk)
+            element
+            for element in self.parsed
+            if isinstance(element, Symbol) and element not in created
         ]
 
-    def __read_n_tokens(self, size: int) -> Iterator[SymbolChunk]:
-        yield from to_symbol_chunks(self.__read_symbol_string(size))
-
     def __read_symbol_string(self, size: int) -> SymbolString:
         start = self.pos
         stop = self.pos + size
@@ -130,19 +294,12 @@ class Analyzer:
         return token
 
     def _append_match(self, size: int) -> None:
-        for s in self.__read_n_tokens(size):
-            self.parsed.append(s)
-
-    def _append_unique(self, size: int, symbol: Symbol) -> None:
-        self.parsed.append(symbol)
-        self.table = self.table.add(symbol, self.__read_symbol_string(size))
+        self.parsed.extend(self.__read_symbol_string(size))
 
     def _append_unique_or_empty(self, size: int, symbol: Symbol) -> None:
-        if size == 0:
-            self.parsed.append(symbol)
-            self.table = self.table.add(symbol, "")
-            return
-        self._append_unique(size, symbol)
+        self.parsed.append(symbol)
+        self.spans.append((symbol, self.pos, self.pos + size))
+        self._proceed(size)
 
     def _advance(
         self,
@@ -158,12 +315,23 @@ class Analyzer:
 
     @classmethod
     def _analyze_two_symbol_strings(
-        cls, seq1: SymbolString, seq2: SymbolString,
+        cls,
+        seq1: SymbolString,
+        seq2: SymbolString,
+        backend: AlignmentBackend = difflib_blocks,
     ) -> tuple[Analyzer, Analyzer]:
-        matcher = difflib.SequenceMatcher(None, seq1, seq2, autojunk=False)
-        blocks = matcher.get_matching_blocks()
-        # SequenceMatcher guarantees a sentinel (len(seq1), len(seq2), 0) that
-        # drives tail content through advance() to complete both analyzers.
+        return cls._walk(seq1, seq2, cls._align(seq1, seq2, backend))
+
+    @staticmethod
+    def _align(
+        seq1: SymbolString,
+        seq2: SymbolString,
+        backend: AlignmentBackend,
+    ) -> list[Match]:
+        blocks = backend(seq1, seq2)
+        # Backends must end with the sentinel (len(seq1), len(seq2), 0), as
+        # SequenceMatcher does; it drives tail content through advance() to
+        # complete both analyzers.
         sentinel = blocks[-1] if blocks else None
         if sentinel is None or (sentinel.a, sentinel.b, sentinel.size) != (
             len(seq1),
@@ -176,6 +344,15 @@ class Analyzer:
                 "without it."
             )
             raise RuntimeError(msg)
+        return blocks
+
+    @classmethod
+    def _walk(
+        cls,
+        seq1: SymbolString,
+        seq2: SymbolString,
+        blocks: list[Match],
+    ) -> tuple[Analyzer, Analyzer]:
         analyzer_a = cls.create(seq1)
         analyzer_b = cls.create(seq2)
 
@@ -202,33 +379,147 @@ class Analyzer:
     @classmethod
     def analyze(
         cls,
-        texts: list[str],
+        texts: Sequence[TextLike],
         max_texts: int | None = None,
+        *,
+        tokenizer: TokenizerLike = "char",
+        merge_order: MergeOrder = "sequential",
+        workers: int = 1,
+        backend: BackendLike = "difflib",
+        stats: AnalyzerStats | None = None,
+        sample_size: int | None = None,
+        seed: int = 0,
+        budget: float | None = None,
+        max_comparisons: int | None = None,
     ) -> AnalyzerResult:
         """Analyze a list of texts and extract a common template.
 
         Args:
-            texts: Non-empty list of strings to analyze.
+            texts: Non-empty list of strings to analyze, or of bytes-like
+                objects. Bytes are aligned byte by byte, each decoded as
+                one Latin-1 character and never normalized, and
+                ``byte_args`` returns their values as bytes. ASCII strings
+                skip NFC normalization, which cannot change them.
             max_texts: Optional upper bound on the number of texts to analyze.
+            tokenizer: Unit of alignment. ``"char"`` (default) aligns single
+                characters; ``"word"`` aligns runs of word characters,
+                whitespace and punctuation. A compiled regex or a callable
+                returning tokens can also be given. Coarser tokens make
+                alignment much faster on long texts, and variables never
+                split a token.
+            merge_order: ``"sequential"`` (default) folds the texts left to
+                right. ``"tree"`` merges them pairwise like a merge sort, so
+                independent merges can run in parallel and the intermediate
+                templates stay small. ``"similarity"`` sketches every text
+                with MinHash and merges the most similar texts first, so a
+                dissimilar text is merged only once the others agree,
+                which gives fewer spurious variables on mixed inputs.
+                Templates may differ between the orders; the rows of
+                ``args`` always follow ``texts``.
+            workers: Number of worker processes for ``merge_order="tree"``.
+                ``1`` (default) merges in the calling process, and is the
+                only value the other merge orders accept.
+            backend: Alignment algorithm used for every merge. ``"difflib"``
+                (default) uses ``difflib.SequenceMatcher``; ``"myers"`` uses
+                Myers' O(ND) diff, which is much faster on long texts with
+                few differences. A callable with the contract of
+                ``SequenceMatcher.get_matching_blocks()`` can also be given.
+            stats: Optional collector that receives the sizes and phase
+                timings of every merge, including merges run in worker
+                processes.
+            sample_size: Analyze only a random sample of this many texts,
+                then match the template against all texts and merge only
+                the texts that do not match. Most texts then cost a linear
+                scan instead of a diff, which pays off for large batches of
+                similar texts. The args of every text come from matching
+                the final template, leftmost.
+            seed: Seed of the random sample.
+            budget: Optional time budget in seconds. Once it is spent,
+                every further merge matches only the common prefix and
+                suffix and unique runs of tokens, in O(n log n), and the
+                result has ``approximate`` set. A merge that is running
+                when the budget runs out still finishes, so combine it
+                with ``max_comparisons`` to bound the latency.
+            max_comparisons: Optional limit on the work of one merge: the
+                number of pairs of equal tokens of its two templates,
+                which is what a quadratic alignment compares in the worst
+                case. Larger merges are approximated like merges beyond
+                ``budget``. One million takes well under a second with
+                ``"difflib"``.
 
         Returns:
             An AnalyzerResult containing the extracted template and per-text
             argument lists.
 
         Raises:
-            ValueError: If texts is empty or exceeds max_texts.
+            ValueError: If texts is empty, exceeds max_texts or mixes str
+                and bytes, if the tokenizer is unknown or does not preserve
+                the text, or if merge_order, workers, backend,
+                sample_size, budget or max_comparisons is invalid.
 
         """
-        return cls._analyze_texts(texts, max_texts=max_texts)
+        return cls._analyze_texts(
+            texts,
+            max_texts=max_texts,
+            tokenizer=resolve_tokenizer(tokenizer),
+            merge_order=merge_order,
+            workers=workers,
+            backend=_with_budget(
+                resolve_backend(backend),
+                budget,
+                max_comparisons,
+            ),
+            stats=stats,
+            sample_size=sample_size,
+            seed=seed,
+        )
 
     @classmethod
     def _analyze_two_result(
-        cls, result1: AnalyzerResult, result2: AnalyzerResult,
+        cls,
+        result1: AnalyzerResult,
+        result2: AnalyzerResult,
+        backend: AlignmentBackend = difflib_blocks,
+        stats: AnalyzerStats | None = None,
     ) -> AnalyzerResult:
-        analyzer_a, analyzer_b = cls._analyze_two_symbol_strings(
-            list(result1.text),
-            list(result2.text),
+        seq1, seq2 = list(result1.text), list(result2.text)
+        backend, fallback = _select(backend, seq1, seq2)
+        started = perf_counter()
+        blocks = cls._align(seq1, seq2, backend)
+        aligned = perf_counter()
+        analyzer_a, analyzer_b = cls._walk(seq1, seq2, blocks)
+        cls._assert_same_parsed_text(analyzer_a, analyzer_b)
+        walked = perf_counter()
+        # Only the symbols of the new template get columns; the columns of
+        # a symbol that survives the merge unchanged are shared, not copied.
+        kept = analyzer_a.kept
+        left = result1.table.select(result1.text, analyzer_a.spans, kept)
+        right = result2.table.select(result2.text, analyzer_b.spans, kept)
+        merged = AnalyzerResult(
+            tuple(analyzer_a.parsed_text),
+            left.concat(right),
+            fallback or result1.approximate or result2.approximate,
         )
+        if stats is not None:
+            stats.record(
+                MergeStats(
+                    left_length=len(seq1),
+                    right_length=len(seq2),
+                    blocks=len(blocks) - 1,
+                    symbols=len(analyzer_a.spans),
+                    rows=len(merged.table),
+                    align_seconds=aligned - started,
+                    walk_seconds=walked - aligned,
+                    table_seconds=perf_counter() - walked,
+                ),
+            )
+        return merged
+
+    @staticmethod
+    def _assert_same_parsed_text(
+        analyzer_a: Analyzer,
+        analyzer_b: Analyzer,
+    ) -> None:
         if analyzer_a.parsed_text != analyzer_b.parsed_text:
             raise RuntimeError(
                 "Internal invariant violated: both analyzers must produce "
@@ -236,49 +527,334 @@ class Analyzer:
                 f"algorithm. Got: {analyzer_a.parsed_text!r} vs "
                 f"{analyzer_b.parsed_text!r}",
             )
-        return AnalyzerResult(
-            tuple(analyzer_a.parsed_text),
-            (
-                *[
-                    analyzer_a.table.combined(table)
-                    for table in result1.tables
-                ],
-                *[
-                    analyzer_b.table.combined(table)
-                    for table in result2.tables
-                ],
-            ),
-        )
 
     @staticmethod
     def _assert_max_texts(n: int, max_texts: int | None) -> None:
         if max_texts is not None and n > max_texts:
             raise ValueError(
                 f"Too many texts: got {n}, max_texts={max_texts}. "
-                "analyze_texts holds O(N) SymbolTable entries in memory.",
+                "analyze_texts holds O(N) rows of args in memory; "
+                "analyze_spilled keeps them on disk instead.",
+            )
+
+    @staticmethod
+    def _assert_merge_order(merge_order: str, workers: int) -> None:
+        if merge_order not in MERGE_ORDERS:
+            raise ValueError(
+                f"Unknown merge_order {merge_order!r}; expected one of "
+                f"{list(MERGE_ORDERS)}.",
+            )
+        Analyzer._assert_workers(merge_order, workers)
+
+    @staticmethod
+    def _assert_workers(merge_order: str, workers: int) -> None:
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}.")
+        if workers > 1 and merge_order != "tree":
+            raise ValueError(
+                f"workers={workers} needs merge_order='tree'; "
+                f"{merge_order!r} merges in the calling process.",
             )
 
     @classmethod
     def _analyze_texts(
         cls,
-        texts: list[str],
+        texts: Sequence[TextLike],
         max_texts: int | None = None,
+        tokenizer: Tokenizer = tokenize_chars,
+        merge_order: MergeOrder = "sequential",
+        workers: int = 1,
+        backend: AlignmentBackend = difflib_blocks,
+        stats: AnalyzerStats | None = None,
+        sample_size: int | None = None,
+        seed: int = 0,
     ) -> AnalyzerResult:
-        texts = texts[:]
-
         if not texts:
             raise ValueError("texts are empty.")
 
+        cls._assert_same_kind(texts)
         cls._assert_max_texts(len(texts), max_texts)
+        cls._assert_merge_order(merge_order, workers)
+        cls._assert_sample_size(sample_size)
+
+        if sample_size is None or sample_size >= len(texts):
+            return cls._reduce(
+                texts,
+                tokenizer,
+                merge_order,
+                workers,
+                backend,
+                stats,
+            )
+        candidate = cls._reduce(
+            _sample(texts, sample_size, seed),
+            tokenizer,
+            merge_order,
+            workers,
+            backend,
+            stats,
+        )
+        return cls._verify(texts, candidate, tokenizer, backend, stats)
+
+    @staticmethod
+    def _assert_same_kind(texts: Sequence[TextLike]) -> None:
+        if len({isinstance(text, str) for text in texts}) > 1:
+            raise ValueError("texts mix str and bytes-like objects.")
 
-        text = texts.pop(0)
-        acc = AnalyzerResult._from_text(text)
-        while texts:
-            text = texts.pop(0)
-            curr = AnalyzerResult._from_text(text)
-            acc = cls._analyze_two_result(acc, curr)
+    @staticmethod
+    def _assert_sample_size(sample_size: int | None) -> None:
+        if sample_size is not None and sample_size < 1:
+            raise ValueError(
+                f"sample_size must be at least 1, got {sample_size}.",
+            )
+
+    @classmethod
+    def _reduce(
+        cls,
+        texts: Sequence[TextLike],
+        tokenizer: Tokenizer,
+        merge_order: MergeOrder,
+        workers: int,
+        backend: AlignmentBackend,
+        stats: AnalyzerStats | None,
+    ) -> AnalyzerResult:
+        results = (AnalyzerResult._from_text(t, tokenizer) for t in texts)
+        if merge_order == "tree":
+            return cls._reduce_tree(list(results), workers, backend, stats)
+        if merge_order == "similarity":
+            return cls._reduce_similarity(list(results), backend, stats)
+        return cls._reduce_sequential(results, backend, stats)
 
+    @classmethod
+    def _verify(
+        cls,
+        texts: Sequence[TextLike],
+        candidate: AnalyzerResult,
+        tokenizer: Tokenizer,
+        backend: AlignmentBackend,
+        stats: AnalyzerStats | None,
+    ) -> AnalyzerResult:
+        """Match every text against the candidate, refining it as needed.
+
+        Texts that do not match are merged into the candidate, and the
+        texts are matched again against the refined template. A merged
+        template accepts every text its inputs accepted, so this ends
+        after a few rounds; usually the second round matches everything.
+        """
+        sources = list(map(_source, texts))
+        rows = _match_all(sources, candidate)
+        while failed := _unmatched(sources, rows):
+            candidate = cls._reduce_sequential(
+                iter([candidate, *_from_texts(failed, tokenizer)]),
+                backend,
+                stats,
+            )
+            rows = _match_all(sources, candidate)
+        spans = [row for row in rows if row is not None]
+        return AnalyzerResult(
+            candidate.text,
+            SpanTable.from_spans(
+                sources,
+                candidate.symbols,
+                spans,
+                binary=not isinstance(texts[0], str),
+            ),
+            candidate.approximate,
+        )
+
+    @classmethod
+    def _reduce_sequential(
+        cls,
+        results: Iterator[AnalyzerResult],
+        backend: AlignmentBackend,
+        stats: AnalyzerStats | None = None,
+    ) -> AnalyzerResult:
+        acc = next(results)
+        for curr in results:
+            acc = cls._analyze_two_result(acc, curr, backend, stats)
         return acc
 
+    @classmethod
+    def _reduce_tree(
+        cls,
+        results: list[AnalyzerResult],
+        workers: int,
+        backend: AlignmentBackend,
+        stats: AnalyzerStats | None = None,
+    ) -> AnalyzerResult:
+        with _merge_executor(workers) as executor:
+            while len(results) > 1:
+                results = _merge_pairs(
+                    results,
+                    executor,
+                    workers,
+                    backend,
+                    stats,
+                )
+        return results[0]
+
+    @classmethod
+    def _reduce_similarity(
+        cls,
+        results: list[AnalyzerResult],
+        backend: AlignmentBackend,
+        stats: AnalyzerStats | None = None,
+    ) -> AnalyzerResult:
+        """Merge results along a guide tree, then restore the row order."""
+        merges = guide_tree([signature(_tokens(r)) for r in results])
+        clusters = dict(enumerate(results))
+        # Input index of every row of every cluster, in table order.
+        rows = {i: [i] for i in clusters}
+        for left, right in merges:
+            clusters[left] = cls._analyze_two_result(
+                clusters[left],
+                clusters.pop(right),
+                backend,
+                stats,
+            )
+            rows[left] += rows.pop(right)
+        merged = clusters[0]
+        positions = sorted(range(len(rows[0])), key=rows[0].__getitem__)
+        return AnalyzerResult(
+            merged.text,
+            merged.table.take(positions),
+            merged.approximate,
+        )
+
+
+def _with_budget(
+    backend: AlignmentBackend,
+    budget: float | None,
+    max_comparisons: int | None,
+) -> AlignmentBackend:
+    if budget is None and max_comparisons is None:
+        return backend
+    return BudgetBackend.create(
+        backend,
+        seconds=budget,
+        max_comparisons=max_comparisons,
+    )
+
+
+def _select(
+    backend: AlignmentBackend,
+    seq1: SymbolString,
+    seq2: SymbolString,
+) -> tuple[AlignmentBackend, bool]:
+    """Return the backend for a merge and whether it approximates."""
+    if isinstance(backend, BudgetBackend):
+        return backend.select(seq1, seq2)
+    return backend, False
+
+
+def _tokens(result: AnalyzerResult) -> list[str]:
+    return [token for token in result.text if isinstance(token, str)]
+
+
+def _source(text: TextLike) -> str:
+    """Return the text to align: NFC-normalized, or bytes as Latin-1."""
+    if isinstance(text, str):
+        return nfc(text)
+    return str(text, BINARY_ENCODING)
+
+
+def _sample(
+    texts: Sequence[TextLike],
+    size: int,
+    seed: int,
+) -> list[TextLike]:
+    # Input order is kept so that the sample merges like the full batch.
+    picked = sorted(Random(seed).sample(range(len(texts)), size))  # noqa: S311
+    return [texts[i] for i in picked]
+
+
+def _from_texts(
+    texts: Sequence[TextLike],
+    tokenizer: Tokenizer,
+) -> Iterator[AnalyzerResult]:
+    return (AnalyzerResult._from_text(text, tokenizer) for text in texts)
+
+
+def _match_all(
+    sources: list[str],
+    result: AnalyzerResult,
+) -> list[list[Span] | None]:
+    """Return the spans of every source in ``result``, None if unmatched."""
+    literals = result.template.literals()
+    return [
+        spans if matched else None
+        for spans, matched in (
+            scan_spans(source, literals, 0, len(source)) for source in sources
+        )
+    ]
+
+
+def _unmatched(
+    sources: list[str],
+    rows: list[list[Span] | None],
+) -> list[str]:
+    return [s for s, row in zip(sources, rows, strict=True) if row is None]
+
+
+def _merge_executor(
+    workers: int,
+) -> AbstractContextManager[Executor | None]:
+    if workers == 1:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _merge_pair(
+    result1: AnalyzerResult,
+    result2: AnalyzerResult,
+    backend: AlignmentBackend,
+    timed: bool,
+) -> tuple[AnalyzerResult, list[MergeStats]]:
+    # Stats are returned rather than recorded so that merges run in worker
+    # processes reach the caller's collector.
+    stats = AnalyzerStats() if timed else None
+    merged = Analyzer._analyze_two_result(result1, result2, backend, stats)
+    return merged, stats.merges if stats else []
+
+
+def _merge_pairs(
+    results: list[AnalyzerResult],
+    executor: Executor | None,
+    workers: int,
+    backend: AlignmentBackend,
+    stats: AnalyzerStats | None = None,
+) -> list[AnalyzerResult]:
+    """Merge neighbours (0, 1), (2, 3), ...; an odd last result carries over.
+
+    Merging only neighbours keeps the rows in input order.
+    """
+    lefts, rights = results[0::2], results[1::2]
+    args = (repeat(backend, len(rights)), repeat(stats is not None))
+    if executor is None:
+        merged = list(map(_merge_pair, lefts, rights, *args))
+    else:
+        chunksize = max(1, len(rights) // (workers * 4))
+        merged = list(
+            executor.map(
+                _merge_pair,
+                lefts,
+                rights,
+                *args,
+                chunksize=chunksize,
+            ),
+        )
+    _record_all(stats, merged)
+    return [result for result, _ in merged] + results[len(rights) * 2 :]
+
+
+def _record_all(
+    stats: AnalyzerStats | None,
+    merged: list[tuple[AnalyzerResult, list[MergeStats]]],
+) -> None:
+    if stats is None:
+        return
+    for merge in chain.from_iterable(merges for _, merges in merged):
+        stats.record(merge)
+
 
 analyze = Analyzer.analyze
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+
+from .alignment import AlignmentBackend, BackendLike, resolve_backend
+from .analyzer import (
+    Analyzer,
+    AnalyzerResult,
+    MergeOrder,
+    TextLike,
+    _from_texts,
+    _with_budget,
+)
+from .serialization import dump_result, load_result
+from .stats import AnalyzerStats
+from .tokenizer import Tokenizer, TokenizerLike, nfc, resolve_tokenizer
+
+SUFFIX = ".tpla"
+
+
+def _assert_stable_name(name: str) -> None:
+    # Every lambda, and every function defined in a function, shares its
+    # qualified name with the others defined at the same place.
+    if "<lambda>" in name or "<locals>" in name:
+        raise ValueError(
+            f"{name} cannot be cached: lambdas and local functions have no "
+            "stable name. Define it at module level.",
+        )
+
+
+def _option_key(option: object) -> str:
+    """Return a stable description of a tokenizer or backend option."""
+    if isinstance(option, str):
+        return option
+    if isinstance(option, re.Pattern):
+        return f"re:{option.flags}:{option.pattern}"
+    module = getattr(option, "__module__", "")
+    name = str(getattr(option, "__qualname__", option))
+    _assert_stable_name(name)
+    return f"{module}.{name}"
+
+
+def _digest(previous: bytes, data: bytes) -> bytes:
+    size = len(data).to_bytes(8, "little")
+    return hashlib.blake2b(previous + size + data, digest_size=16).digest()
+
+
+def _text_bytes(text: TextLike) -> bytes:
+    if isinstance(text, str):
+        return nfc(text).encode()
+    return bytes(text)
+
+
+def _chain(options: str, texts: Sequence[TextLike]) -> list[str]:
+    """Return the key of every prefix of ``texts`` analyzed with ``options``.
+
+    Each key hashes the key of the previous prefix with the next text, so
+    corpora that start with the same texts share the keys of those
+    prefixes.
+    """
+    keys = []
+    digest = _digest(b"", options.encode())
+    for text in texts:
+        digest = _digest(digest, _text_bytes(text))
+        keys.append(digest.hex())
+    return keys
+
+
+def _checkpoints(start: int, end: int) -> list[int]:
+    """Return the prefix lengths in (start, end] to cache: powers of 2, end."""
+    powers = {1 << i for i in range(end.bit_length())}
+    return [size for size in sorted({*powers, end}) if start < size <= end]
+
+
+@dataclass
+class _MemoryStore:
+    max_entries: int
+    entries: OrderedDict[str, AnalyzerResult] = field(
+        default_factory=OrderedDict,
+    )
+
+    def read(self, key: str) -> AnalyzerResult | None:
+        return self.entries.get(key)
+
+    def write(self, key: str, result: AnalyzerResult) -> None:
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def keys(self) -> set[str]:
+        return set(self.entries)
+
+
+@dataclass
+class _DiskStore:
+    """Results serialized to one file per key; the LRU order is the mtime."""
+
+    directory: Path
+    max_bytes: int
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def read(self, key: str) -> AnalyzerResult | None:
+        path = self._path(key)
+        try:
+            result = load_result(path.read_bytes())
+        except (OSError, ValueError):
+            # A missing, truncated or outdated file is just a miss.
+            return None
+        path.touch()
+        return result
+
+    def write(self, key: str, result: AnalyzerResult) -> None:
+        path = self._path(key)
+        partial = path.with_suffix(f".{os.getpid()}.partial")
+        partial.write_bytes(dump_result(result))
+        partial.replace(path)
+        self._evict()
+
+    def keys(self) -> set[str]:
+        return {path.stem for path in self.directory.glob(f"*{SUFFIX}")}
+
+    def _evict(self) -> None:
+        files = [(p.stat(), p) for p in self.directory.glob(f"*{SUFFIX}")]
+        files.sort(key=lambda file: file[0].st_mtime)
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in files:
+            if total <= self.max_bytes:
+                return
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+@dataclass
+class AnalysisCache:
+    """Content-addressed cache of analysis results.
+
+    Results are keyed by a hash of the texts, NFC-normalized if they are
+    str, and of the options that change the result, and kept in a
+    size-bounded LRU in memory and, if a directory is given, in another
+    one on disk.
+
+    With the default sequential merge order, the results for some prefixes
+    of the texts are cached as well, at every power of two. A corpus that
+    starts with the texts of an earlier one resumes from the longest cached
+    prefix and only merges the rest.
+
+    Attributes:
+        hits: Number of analyses that started from a cached result.
+        misses: Number of analyses that started from scratch.
+
+    Example:
+        >>> cache = AnalysisCache.create()
+        >>> _ = cache.analyze(["id=1", "id=2"])
+        >>> cache.analyze(["id=1", "id=2", "id=3"]).to_format_string()
+        'id={0}'
+        >>> cache.hits, cache.misses
+        (1, 1)
+
+    """
+
+    memory: _MemoryStore
+    disk: _DiskStore | None
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def create(
+        cls,
+        directory: str | os.PathLike[str] | None = None,
+        *,
+        max_entries: int = 128,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> AnalysisCache:
+        """Create a cache.
+
+        Args:
+            directory: Directory of the on-disk cache, created if needed.
+                None (default) keeps results in memory only.
+            max_entries: Number of results kept in memory.
+            max_bytes: Total size of the files kept on disk; the least
+                recently used files are removed first.
+
+        """
+        disk = None
+        if directory is not None:
+            disk = _DiskStore(Path(directory), max_bytes)
+            disk.directory.mkdir(parents=True, exist_ok=True)
+        return cls(_MemoryStore(max_entries), disk)
+
+    def get(self, key: str) -> AnalyzerResult | None:
+        """Return the result cached under ``key``, or None."""
+        found = self.memory.read(key)
+        if found is None and self.disk is not None:
+            found = self.disk.read(key)
+        if found is not None:
+            self.memory.write(key, found)
+        return found
+
+    def put(self, key: str, result: AnalyzerResult) -> None:
+        """Cache ``result`` under ``key`` in memory and on disk."""
+        self.memory.write(key, result)
+        if self.disk is not None:
+            self.disk.write(key, result)
+
+    def _keys(self) -> set[str]:
+        disk = set() if self.disk is None else self.disk.keys()
+        return self.memory.keys() | disk
+
+    def _longest_prefix(
+        self,
+        keys: list[str],
+    ) -> tuple[int, AnalyzerResult | None]:
+        """Return the longest prefix with a readable cached result."""
+        cached = self._keys()
+        sizes = [n for n in range(len(keys), 0, -1) if keys[n - 1] in cached]
+        for size in sizes:
+            found = self.get(keys[size - 1])
+            if found is not None:
+                return size, found
+        return 0, None
+
+    def analyze(
+        self,
+        texts: Sequence[TextLike],
+        *,
+        tokenizer: TokenizerLike = "char",
+        merge_order: MergeOrder = "sequential",
+        workers: int = 1,
+        backend: BackendLike = "difflib",
+        sample_size: int | None = None,
+        seed: int = 0,
+        stats: AnalyzerStats | None = None,
+        budget: float | None = None,
+        max_comparisons: int | None = None,
+    ) -> AnalyzerResult:
+        """Analyze texts like ``analyze()``, reusing cached results.
+
+        Tokenizers and backends given as callables are identified by their
+        qualified name, so a changed callable needs a new name or a fresh
+        cache. ``budget`` and ``max_comparisons`` are part of the key: a
+        result approximated under them is returned again for the same
+        values, never for an analysis without them.
+
+        Raises:
+            ValueError: If texts is empty or mixes str and bytes, if a
+                tokenizer or backend callable is a lambda or a local
+                function, or if an option is invalid.
+
+        """
+        if not texts:
+            raise ValueError("texts are empty.")
+        Analyzer._assert_same_kind(texts)
+        Analyzer._assert_merge_order(merge_order, workers)
+        options = [
+            _option_key(tokenizer),
+            _option_key(backend),
+            merge_order,
+            isinstance(texts[0], str),
+        ]
+        limits = f"{sample_size} {seed} {budget} {max_comparisons}"
+        keys = _chain(f"{options} {limits}", texts)
+        if merge_order != "sequential" or sample_size is not None:
+            return self._analyze_whole(
+                keys[-1],
+                lambda: Analyzer.analyze(
+                    texts,
+                    tokenizer=tokenizer,
+                    merge_order=merge_order,
+                    workers=workers,
+                    backend=backend,
+                    sample_size=sample_size,
+                    seed=seed,
+                    stats=stats,
+                    budget=budget,
+                    max_comparisons=max_comparisons,
+                ),
+            )
+        return self._analyze_prefixes(
+            texts,
+            keys,
+            resolve_tokenizer(tokenizer),
+            _with_budget(resolve_backend(backend), budget, max_comparisons),
+            stats,
+        )
+
+    def _count(self, found: AnalyzerResult | None) -> None:
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def _analyze_whole(
+        self,
+        key: str,
+        compute: Callable[[], AnalyzerResult],
+    ) -> AnalyzerResult:
+        found = self.get(key)
+        self._count(found)
+        if found is not None:
+            return found
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def _analyze_prefixes(
+        self,
+        texts: Sequence[TextLike],
+        keys: list[str],
+        tokenizer: Tokenizer,
+        backend: AlignmentBackend,
+        stats: AnalyzerStats | None,
+    ) -> AnalyzerResult:
+        size, acc = self._longest_prefix(keys)
+        self._count(acc)
+        if acc is None:
+            size, acc = 1, AnalyzerResult._from_text(texts[0], tokenizer)
+            self.put(keys[0], acc)
+        for end in _checkpoints(size, len(texts)):
+            results = _from_texts(texts[size:end], tokenizer)
+            acc = Analyzer._reduce_sequential(
+                chain([acc], results),
+                backend,
+                stats,
+            )
+            self.put(keys[end - 1], acc)
+            size = end
+        return acc
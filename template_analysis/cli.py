@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice, repeat
+from pathlib import Path
+from typing import TextIO
+
+from .alignment import BACKENDS
+from .analyzer import Analyzer, AnalyzerResult
+from .extract import extract_file
+from .serialization import dump_template, load_template
+from .streaming import StreamingAnalyzer
+from .symbol import Chunks
+from .template import Template
+from .tokenizer import TOKENIZERS
+
+PROG = "template-analysis"
+STDIN = "-"
+
+
+def _lines(path: str, encoding: str) -> Iterator[str]:
+    """Yield the lines of a file, or of stdin, without line endings."""
+    if path == STDIN:
+        yield from (line.removesuffix("\n") for line in sys.stdin)
+        return
+    with Path(path).open(encoding=encoding) as file:
+        yield from (line.removesuffix("\n") for line in file)
+
+
+def _read_lines(paths: Sequence[str], encoding: str) -> Iterator[str]:
+    for path in paths or [STDIN]:
+        yield from _lines(path, encoding)
+
+
+def _limited(lines: Iterable[str], max_texts: int | None) -> Iterator[str]:
+    """Yield the lines, failing once there are more than ``max_texts``."""
+    lines = iter(lines)
+    yield from islice(lines, max_texts)
+    if max_texts is not None and next(lines, None) is not None:
+        raise ValueError(
+            f"Too many texts: the input has more than {max_texts} lines. "
+            "Raise --max-texts or split the input.",
+        )
+
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    lines = iter(lines)
+    while batch := list(islice(lines, size)):
+        yield batch
+
+
+def _write_json(out: TextIO, row: object) -> None:
+    out.write(json.dumps(row, ensure_ascii=False))
+    out.write("\n")
+
+
+def _write_result(out: TextIO, result: AnalyzerResult) -> None:
+    _write_json(out, {"template": result.to_format_string()})
+    rows: Iterable[tuple[str, ...]] = (
+        zip(*result.columns, strict=True)
+        if result.columns
+        else repeat((), len(result.table))
+    )
+    for index, args in enumerate(rows):
+        _write_json(out, {"index": index, "args": list(args)})
+
+
+def _feed(
+    stream: StreamingAnalyzer,
+    lines: Iterable[str],
+    workers: int,
+    batch_size: int,
+) -> None:
+    """Feed lines one at a time, or batch by batch with worker processes."""
+    if workers == 1:
+        stream.feed_many(lines)
+        return
+    for batch in _batches(lines, batch_size):
+        stream.feed_result(
+            Analyzer.analyze(
+                batch,
+                tokenizer=stream.tokenizer,
+                merge_order="tree",
+                workers=workers,
+                backend=stream.backend,
+            ),
+        )
+
+
+def _run_analyze(options: argparse.Namespace) -> int:
+    stream = StreamingAnalyzer.create(
+        tokenizer=options.tokenizer,
+        backend=options.backend,
+    )
+    lines = _limited(
+        _read_lines(options.files, options.encoding),
+        options.max_texts,
+    )
+    _feed(stream, lines, options.workers, options.batch_size)
+    result = stream.snapshot()
+    _write_result(sys.stdout, result)
+    if options.save_template is not None:
+        options.save_template.write_bytes(dump_template(result.template))
+    return 0
+
+
+def _extract_rows(
+    path: str,
+    template: Template,
+    options: argparse.Namespace,
+) -> Iterator[Chunks | None]:
+    if path == STDIN:
+        matcher = template.compile()
+        return map(matcher.match, _lines(path, options.encoding))
+    return extract_file(
+        path,
+        template,
+        encoding=options.encoding,
+        workers=options.workers,
+    )
+
+
+def _run_extract(options: argparse.Namespace) -> int:
+    template = load_template(options.template.read_bytes())
+    for path in options.files or [STDIN]:
+        rows = _extract_rows(path, template, options)
+        for line, args in enumerate(rows):
+            _write_extracted(sys.stdout, path, line, args, options.unmatched)
+    return 0
+
+
+def _write_extracted(
+    out: TextIO,
+    path: str,
+    line: int,
+    args: Chunks | None,
+    unmatched: bool,
+) -> None:
+    if args is not None or unmatched:
+        _write_json(out, {"file": path, "line": line, "args": args})
+
+
+def _positive(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _add_input_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="input files, one text per line (default: stdin)",
+    )
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument(
+        "--workers",
+        type=_positive,
+        default=1,
+        help="worker processes (default: 1)",
+    )
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=PROG,
+        description="Generate templates from texts and extract variables.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser(
+        "analyze",
+        help="derive a template from lines and print it with the args",
+        description=(
+            "Read one text per line, merge them into a template as they "
+            "arrive, and print the template followed by the args of every "
+            "line as JSON lines."
+        ),
+    )
+    _add_input_options(analyze)
+    analyze.add_argument(
+        "--tokenizer",
+        choices=sorted(TOKENIZERS),
+        default="char",
+    )
+    analyze.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="difflib",
+    )
+    analyze.add_argument(
+        "--max-texts",
+        type=_positive,
+        help="fail without output if the input has more lines than this",
+    )
+    analyze.add_argument(
+        "--batch-size",
+        type=_positive,
+        default=10_000,
+        help="lines analyzed in parallel at a time with --workers",
+    )
+    analyze.add_argument(
+        "--save-template",
+        type=Path,
+        help="also write the template for the extract command",
+    )
+    analyze.set_defaults(run=_run_analyze)
+
+    extract = commands.add_parser(
+        "extract",
+        help="apply a saved template to lines",
+        description=(
+            "Match every line against a template saved with analyze "
+            "--save-template and print the args of the matching lines as "
+            "JSON lines. Files are memory-mapped and scanned as bytes."
+        ),
+    )
+    extract.add_argument("template", type=Path, help="saved template")
+    _add_input_options(extract)
+    extract.add_argument(
+        "--unmatched",
+        action="store_true",
+        help="also print lines that do not match, with null args",
+    )
+    extract.set_defaults(run=_run_extract)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface and return the exit status."""
+    parser = _parser()
+    options = parser.parse_args(argv)
+    try:
+        return int(options.run(options))
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"{PROG}: error: {error}\n")
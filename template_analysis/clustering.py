@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from .analyzer import Analyzer, AnalyzerResult
+from .tokenizer import TOKENIZERS, TokenizerLike, nfc
+
+# Prefix tokens containing digits are treated as variables when choosing a
+# group, so that "id 1 ..." and "id 2 ..." land in the same group.
+PREFIX_WILDCARD = "<*>"
+
+GroupKey = tuple[int, tuple[str, ...]]
+
+
+@dataclass
+class _Cluster:
+    id: int
+    # Token per position, or None where the members disagree.
+    pattern: list[str | None]
+    members: list[int] = field(default_factory=list)
+
+    def similarity(self, tokens: Sequence[str]) -> float:
+        if not tokens:
+            return 1.0
+        same = sum(p == t for p, t in zip(self.pattern, tokens, strict=True))
+        return same / len(tokens)
+
+    def add(self, index: int, tokens: Sequence[str]) -> None:
+        self.members.append(index)
+        self.pattern = [
+            p if p == t else None
+            for p, t in zip(self.pattern, tokens, strict=True)
+        ]
+
+
+def _words(text: str) -> list[str]:
+    """Return the word tokens of a text, without whitespace and punctuation.
+
+    Separators are about half of all tokens and agree between unrelated
+    lines, so counting them would let any two lines of the same shape meet
+    the similarity threshold.
+    """
+    split = TOKENIZERS["word"]
+    return [token for token in split(nfc(text)) if _is_word(token)]
+
+
+def _is_word(token: str) -> bool:
+    return token[0].isalnum() or token[0] == "_"
+
+
+def _prefix_token(token: str) -> str:
+    return PREFIX_WILDCARD if any(c.isdigit() for c in token) else token
+
+
+@dataclass
+class ClusterIndex:
+    """Length/prefix tree that assigns texts to clusters.
+
+    Texts are grouped by token count and their first ``depth`` tokens, in
+    the style of log template miners such as Drain. A new text is compared
+    only with the clusters of its group, and joins the most similar one if
+    at least ``similarity`` of its tokens agree with the cluster pattern.
+    """
+
+    similarity: float
+    depth: int
+    clusters: list[_Cluster] = field(default_factory=list)
+    groups: dict[GroupKey, list[_Cluster]] = field(default_factory=dict)
+
+    def _key(self, tokens: Sequence[str]) -> GroupKey:
+        prefix = tuple(_prefix_token(t) for t in tokens[: self.depth])
+        return len(tokens), prefix
+
+    def _best(
+        self,
+        group: list[_Cluster],
+        tokens: Sequence[str],
+    ) -> _Cluster | None:
+        scored = [(c.similarity(tokens), c) for c in group]
+        best = max(scored, key=lambda sc: sc[0], default=None)
+        if best is None or best[0] < self.similarity:
+            return None
+        return best[1]
+
+    def _create(
+        self,
+        group: list[_Cluster],
+        tokens: Sequence[str],
+    ) -> _Cluster:
+        created = _Cluster(len(self.clusters), list(tokens))
+        self.clusters.append(created)
+        group.append(created)
+        return created
+
+    def insert(self, index: int, tokens: Sequence[str]) -> int:
+        """Add the text at ``index`` and return the id of its cluster."""
+        group = self.groups.setdefault(self._key(tokens), [])
+        found = self._best(group, tokens) or self._create(group, tokens)
+        found.add(index, tokens)
+        return found.id
+
+
+@dataclass(frozen=True)
+class ClusterResult:
+    """Result of analyzing a corpus that mixes several templates.
+
+    Attributes:
+        results: One analysis result per cluster.
+        membership: Cluster index of every input text. The rows of
+            ``results[c]`` follow the order of the texts assigned to ``c``.
+
+    """
+
+    results: tuple[AnalyzerResult, ...]
+    membership: tuple[int, ...]
+
+    def members(self, cluster: int) -> list[int]:
+        """Return the indices of the input texts in a cluster."""
+        return [i for i, c in enumerate(self.membership) if c == cluster]
+
+
+def _assert_similarity(similarity: float) -> None:
+    if not 0.0 <= similarity <= 1.0:
+        raise ValueError(
+            f"similarity must be between 0 and 1, got {similarity}.",
+        )
+
+
+def analyze_clusters(
+    texts: list[str],
+    *,
+    similarity: float = 0.5,
+    depth: int = 1,
+    tokenizer: TokenizerLike = "char",
+) -> ClusterResult:
+    """Partition texts by template and analyze every partition.
+
+    Args:
+        texts: Non-empty list of strings to analyze.
+        similarity: Fraction of word tokens that must agree with a
+            cluster's pattern for a text to join it. Whitespace and
+            punctuation are not counted.
+        depth: Number of leading word tokens used to pre-group texts.
+            Texts that differ in one of them never share a cluster.
+        tokenizer: Tokenizer used to analyze each cluster; see ``analyze``.
+
+    Returns:
+        A ClusterResult with one AnalyzerResult per cluster.
+
+    Raises:
+        ValueError: If texts is empty or similarity is out of range.
+
+    Example:
+        >>> result = analyze_clusters(
+        ...     ["open a.txt", "close b.txt", "open c.txt", "close d.txt"],
+        ... )
+        >>> [r.to_format_string() for r in result.results]
+        ['open {0}.txt', 'close {0}.txt']
+        >>> result.membership
+        (0, 1, 0, 1)
+
+    """
+    if not texts:
+        raise ValueError("texts are empty.")
+    _assert_similarity(similarity)
+
+    index = ClusterIndex(similarity, depth)
+    membership = tuple(
+        index.insert(i, _words(text)) for i, text in enumerate(texts)
+    )
+    results = tuple(
+        Analyzer.analyze([texts[i] for i in c.members], tokenizer=tokenizer)
+        for c in index.clusters
+    )
+    return ClusterResult(results, membership)
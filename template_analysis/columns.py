@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import (
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Sequence,
+)
+from dataclasses import dataclass
+from itertools import islice
+from typing import Generic, TypeVar
+
+from .symbol import Symbol, SymbolOrCharacter
+
+T = TypeVar("T")
+
+# Where a symbol's value lies in every source text: (start, end) columns.
+SpanColumns = tuple["Column[int]", "Column[int]"]
+# Where a template element lies in every source text: a column plus a
+# constant offset, or just an offset when no symbol precedes the element.
+Anchor = tuple["Column[int] | None", int]
+
+
+@dataclass(frozen=True, eq=False)
+class Column(Generic[T]):
+    """Immutable view of the first ``size`` items of an append-only buffer.
+
+    Extending the newest view of a buffer appends to the buffer in place,
+    while older views keep seeing only their own items. Columns therefore
+    behave as persistent values, yet a fold that keeps extending its
+    latest result appends in amortized O(1) instead of copying.
+    """
+
+    buffer: MutableSequence[T]
+    size: int
+
+    @classmethod
+    def of(cls, values: MutableSequence[T]) -> Column[T]:
+        return cls(values, len(values))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[T]:
+        return islice(self.buffer, self.size)
+
+    def __getitem__(self, index: int) -> T:
+        if not 0 <= index < self.size:
+            raise IndexError("column index out of range")
+        return self.buffer[index]
+
+    def __reduce__(self) -> tuple[object, ...]:
+        # Only this view's items travel to worker processes.
+        return (Column.of, (self._items(),))
+
+    def _items(self) -> MutableSequence[T]:
+        if len(self.buffer) == self.size:
+            return self.buffer
+        return self.buffer[: self.size]
+
+    def extend(self, other: Column[T]) -> Column[T]:
+        """Return a column with the items of ``other`` appended."""
+        buffer = self._items()
+        buffer.extend(other._items())
+        return Column.of(buffer)
+
+
+def constant(value: int, size: int) -> Column[int]:
+    return Column.of(array("q", [value]) * size)
+
+
+def shift(column: Column[int], delta: int) -> Column[int]:
+    """Add ``delta`` to every item; a zero shift shares the column."""
+    if delta == 0:
+        return column
+    return Column.of(array("q", map(delta.__add__, column)))
+
+
+def _take(column: Column[int], rows: Sequence[int]) -> Column[int]:
+    items = column._items()
+    return Column.of(array("q", (items[i] for i in rows)))
+
+
+@dataclass(frozen=True, eq=False)
+class SpanTable:
+    """Columnar store of the args of every analyzed text.
+
+    Each row is one text and each symbol of the template is a pair of
+    integer columns holding where its value starts and ends in that text.
+    A merge only builds columns for symbols whose span changed; a symbol
+    that survives a merge unchanged shares its columns with the previous
+    result, so memory is O(texts x variables) and nothing is copied per
+    text on a merge.
+
+    Attributes:
+        sources: The analyzed texts, after normalization.
+        columns: Start and end column of every symbol of the template.
+        binary: Whether the sources are bytes decoded as Latin-1, one
+            character per byte.
+
+    """
+
+    sources: Column[str]
+    columns: Mapping[Symbol, SpanColumns]
+    binary: bool = False
+
+    @classmethod
+    def from_source(cls, source: str, *, binary: bool = False) -> SpanTable:
+        return cls(Column.of([source]), {}, binary)
+
+    @classmethod
+    def from_spans(
+        cls,
+        sources: list[str],
+        symbols: Sequence[Symbol],
+        rows: Sequence[Sequence[tuple[int, int]]],
+        *,
+        binary: bool = False,
+    ) -> SpanTable:
+        """Build a table from the span of every symbol in every source."""
+        return cls(
+            Column.of(sources),
+            {
+                symbol: (
+                    Column.of(array("q", (row[i][0] for row in rows))),
+                    Column.of(array("q", (row[i][1] for row in rows))),
+                )
+                for i, symbol in enumerate(symbols)
+            },
+            binary,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def without_rows(self) -> SpanTable:
+        """Return a table with the same symbols and no rows."""
+        return SpanTable(
+            Column.of([]),
+            {
+                symbol: (Column.of(array("q")), Column.of(array("q")))
+                for symbol in self.columns
+            },
+            self.binary,
+        )
+
+    def take(self, rows: Sequence[int]) -> SpanTable:
+        """Return a table of the given rows, in the given order."""
+        sources = list(self.sources)
+        return SpanTable(
+            Column.of([sources[i] for i in rows]),
+            {
+                symbol: (_take(start, rows), _take(end, rows))
+                for symbol, (start, end) in self.columns.items()
+            },
+            self.binary,
+        )
+
+    def _anchors(self, text: Sequence[SymbolOrCharacter]) -> list[Anchor]:
+        """Return the position of every element of ``text`` and its end."""
+        anchors: list[Anchor] = []
+        base: Column[int] | None = None
+        delta = 0
+        for element in text:
+            if isinstance(element, Symbol):
+                start, base = self.columns[element]
+                anchors.append((start, 0))
+                delta = 0
+                continue
+            anchors.append((base, delta))
+            delta += len(element)
+        anchors.append((base, delta))
+        return anchors
+
+    def _column(self, anchor: Anchor) -> Column[int]:
+        base, delta = anchor
+        if base is None:
+            return constant(delta, len(self))
+        return shift(base, delta)
+
+    def select(
+        self,
+        text: Sequence[SymbolOrCharacter],
+        spans: Iterable[tuple[Symbol, int, int]],
+        kept: Iterable[Symbol] = (),
+    ) -> SpanTable:
+        """Re-express the rows in terms of new symbols.
+
+        Args:
+            text: Template the rows currently follow.
+            spans: Every new symbol with the range of ``text`` elements it
+                replaces.
+            kept: Symbols of ``text`` that the new template still has;
+                their columns are shared, not copied.
+
+        """
+        anchors = self._anchors(text)
+        columns = {symbol: self.columns[symbol] for symbol in kept}
+        columns.update(
+            (symbol, (self._column(anchors[p]), self._column(anchors[q])))
+            for symbol, p, q in spans
+        )
+        return SpanTable(self.sources, columns, self.binary)
+
+    def concat(self, other: SpanTable) -> SpanTable:
+        """Append the rows of ``other``, which must share the symbols."""
+        return SpanTable(
+            self.sources.extend(other.sources),
+            {
+                symbol: (start.extend(other_start), end.extend(other_end))
+                for symbol, (start, end) in self.columns.items()
+                for other_start, other_end in [other.columns[symbol]]
+            },
+            self.binary and other.binary,
+        )
+
+    def offsets(self, symbol: Symbol) -> tuple[array[int], array[int]]:
+        """Return the start and end offsets of ``symbol`` in every row.
+
+        The offsets are copied into fresh arrays: exporting the shared
+        buffers would stop later merges from appending to them.
+        """
+        start, end = self.columns[symbol]
+        return array("q", start), array("q", end)
+
+    def column(self, symbol: Symbol) -> tuple[str, ...]:
+        """Return the value of ``symbol`` in every row."""
+        start, end = self.columns[symbol]
+        return tuple(
+            source[a:b]
+            for source, a, b in zip(self.sources, start, end, strict=True)
+        )
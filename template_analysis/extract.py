@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import mmap
+import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice, pairwise
+from pathlib import Path
+
+from .matcher import scan_spans
+from .symbol import Chunks
+from .template import Template
+
+Buffer = mmap.mmap | bytes
+
+# Each worker gets a few shards so that an uneven shard does not leave the
+# other workers idle.
+SHARDS_PER_WORKER = 4
+# Shards are at most about this large, so that the rows a worker returns
+# for one shard take bounded memory however large the file is.
+SHARD_BYTES = 16 << 20
+# Shards submitted per worker ahead of the one whose rows are yielded.
+IN_FLIGHT_PER_WORKER = 2
+
+Rows = list["Chunks | None"]
+
+
+@dataclass
+class ExtractedColumns:
+    """Arguments extracted from a file, stored column by column.
+
+    Attributes:
+        lines: Zero-based line number of every matching line.
+        columns: One list per variable, holding its value for every
+            matching line.
+
+    """
+
+    lines: list[int] = field(default_factory=list)
+    columns: list[Chunks] = field(default_factory=list)
+
+    def append(self, line: int, row: Chunks) -> None:
+        self.lines.append(line)
+        for column, value in zip(self.columns, row, strict=True):
+            column.append(value)
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[Buffer]:
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # mmap refuses to map empty files.
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+def _strip_cr(buf: Buffer, start: int, stop: int) -> int:
+    return stop - 1 if stop > start and buf[stop - 1] == ord("\r") else stop
+
+
+def _line_ranges(buf: Buffer, start: int, end: int) -> Iterator[range]:
+    pos = start
+    while pos < end:
+        newline = buf.find(b"\n", pos, end)
+        stop = end if newline < 0 else newline
+        yield range(pos, _strip_cr(buf, pos, stop))
+        pos = stop + 1
+
+
+def _extract_lines(
+    buf: Buffer,
+    literals: tuple[bytes, ...],
+    encoding: str,
+    start: int,
+    end: int,
+) -> Iterator[Chunks | None]:
+    for line in _line_ranges(buf, start, end):
+        spans, matched = scan_spans(buf, literals, line.start, line.stop)
+        # Only the variable values are copied out of the mapping and decoded.
+        yield (
+            [buf[a:b].decode(encoding) for a, b in spans] if matched else None
+        )
+
+
+def _extract_range(
+    path: Path,
+    literals: tuple[bytes, ...],
+    encoding: str,
+    start: int,
+    end: int,
+) -> Rows:
+    with _mapped(path) as buf:
+        return list(_extract_lines(buf, literals, encoding, start, end))
+
+
+def _next_line_start(buf: Buffer, pos: int) -> int:
+    if pos == 0:
+        return 0
+    newline = buf.find(b"\n", pos - 1, len(buf))
+    return len(buf) if newline < 0 else newline + 1
+
+
+def _shards(buf: Buffer, count: int) -> list[tuple[int, int]]:
+    size = len(buf)
+    edges = sorted(
+        {_next_line_start(buf, size * i // count) for i in range(count)},
+    )
+    return [(a, b) for a, b in pairwise([*edges, size]) if a < b]
+
+
+def _shard_count(size: int, workers: int) -> int:
+    return max(workers * SHARDS_PER_WORKER, -(-size // SHARD_BYTES))
+
+
+def _extract_serial(
+    path: Path,
+    literals: tuple[bytes, ...],
+    encoding: str,
+) -> Iterator[Chunks | None]:
+    with _mapped(path) as buf:
+        yield from _extract_lines(buf, literals, encoding, 0, len(buf))
+
+
+def _extract_sharded(
+    path: Path,
+    literals: tuple[bytes, ...],
+    encoding: str,
+    workers: int,
+) -> Iterator[Chunks | None]:
+    with _mapped(path) as buf:
+        shards = _shards(buf, _shard_count(len(buf), workers))
+    task = partial(_extract_range, path, literals, encoding)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from _map_bounded(
+            executor,
+            task,
+            shards,
+            workers * IN_FLIGHT_PER_WORKER,
+        )
+
+
+def _map_bounded(
+    executor: Executor,
+    task: Callable[[int, int], Rows],
+    shards: list[tuple[int, int]],
+    limit: int,
+) -> Iterator[Chunks | None]:
+    """Yield the rows of every shard in order.
+
+    At most ``limit`` shards are submitted and not yet yielded at a time,
+    so a slow consumer holds back the workers instead of letting the rows
+    of the whole file pile up.
+    """
+    remaining = iter(shards)
+    pending: deque[Future[Rows]] = deque(
+        executor.submit(task, *shard) for shard in islice(remaining, limit)
+    )
+    while pending:
+        done = pending.popleft()
+        pending.extend(
+            executor.submit(task, *shard) for shard in islice(remaining, 1)
+        )
+        yield from done.result()
+
+
+def extract_file(
+    path: str | os.PathLike[str],
+    template: Template,
+    *,
+    encoding: str = "utf-8",
+    workers: int = 1,
+) -> Iterator[Chunks | None]:
+    """Apply a template to every line of a file.
+
+    The file is memory-mapped and scanned as bytes: the template literals
+    are encoded once and located directly in the mapping, so only the
+    variable values are copied and decoded. Texts are not NFC-normalized
+    on this path. ``"\\n"`` and ``"\\r\\n"`` line endings are supported.
+
+    Args:
+        path: File to scan.
+        template: Template whose variables are extracted.
+        encoding: Encoding of the file. It must be ASCII-compatible, such
+            as UTF-8, so that encoded literals can be searched as bytes.
+        workers: Number of worker processes. With more than one, the file
+            is split at line boundaries into shards of at most about 16
+            MiB, scanned in parallel; rows are still yielded in file
+            order, and only a few shards per worker are in flight.
+
+    Yields:
+        The arguments of each line, or None for a line that does not
+        match the template.
+
+    Raises:
+        ValueError: If workers is less than 1.
+
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}.")
+    literals = tuple(
+        literal.encode(encoding) for literal in template.literals()
+    )
+    if workers == 1:
+        return _extract_serial(Path(path), literals, encoding)
+    return _extract_sharded(Path(path), literals, encoding, workers)
+
+
+def extract_columns(
+    path: str | os.PathLike[str],
+    template: Template,
+    *,
+    encoding: str = "utf-8",
+    workers: int = 1,
+) -> ExtractedColumns:
+    """Apply a template to every line of a file and collect columns.
+
+    Lines that do not match the template are skipped; ``lines`` records
+    which lines the rows came from. See ``extract_file`` for the options.
+    """
+    extracted = ExtractedColumns(
+        columns=[[] for _ in range(len(template.literals()) - 1)],
+    )
+    rows = extract_file(path, template, encoding=encoding, workers=workers)
+    for line, row in enumerate(rows):
+        if row is not None:
+            extracted.append(line, row)
+    return extracted
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Sequence, Sized
+from dataclasses import dataclass
+from typing import Protocol, TypeVar
+
+from .symbol import Chunks
+from .tokenizer import nfc
+
+# A half-open (start, stop) range of a variable value in a matched text.
+Span = tuple[int, int]
+
+LiteralT_contra = TypeVar("LiteralT_contra", contravariant=True)
+LiteralT = TypeVar("LiteralT", bound=Sized)
+
+
+class Searchable(Protocol[LiteralT_contra]):
+    """Anything with ``str.find`` semantics: ``str``, ``bytes``, ``mmap``."""
+
+    def find(self, sub: LiteralT_contra, start: int, end: int, /) -> int: ...
+
+
+def _is_at(
+    haystack: Searchable[LiteralT],
+    literal: LiteralT,
+    size: int,
+    pos: int,
+    end: int,
+) -> bool:
+    return haystack.find(literal, pos, end) == pos and pos + size <= end
+
+
+def _scan_middle(
+    haystack: Searchable[LiteralT],
+    middle: Sequence[LiteralT],
+    sizes: Sequence[int],
+    pos: int,
+    stop: int,
+) -> tuple[list[Span], int]:
+    spans: list[Span] = []
+    for literal, size in zip(middle, sizes, strict=True):
+        found = haystack.find(literal, pos, stop)
+        if found < 0:
+            return spans, -1
+        spans.append((pos, found))
+        pos = found + size
+    return spans, pos
+
+
+def scan_spans(
+    haystack: Searchable[LiteralT],
+    literals: Sequence[LiteralT],
+    start: int,
+    end: int,
+) -> tuple[list[Span], bool]:
+    """Locate the variables between ``literals`` in ``haystack[start:end]``.
+
+    Each literal is anchored at its leftmost occurrence after the previous
+    one; the first literal must be a prefix and the last one a suffix.
+    Leftmost anchoring never rejects a text that some other placement
+    would accept, so a single left-to-right pass is enough.
+
+    Returns:
+        The spans found so far and whether the whole range matched.
+        On a mismatch the spans cover the variables before it.
+
+    """
+    sizes = [len(literal) for literal in literals]
+    if not _is_at(haystack, literals[0], sizes[0], start, end):
+        return [], False
+    pos = start + sizes[0]
+    if len(literals) == 1:
+        return [], pos == end
+    return _scan_rest(haystack, literals[1:], sizes[1:], pos, end)
+
+
+def _scan_rest(
+    haystack: Searchable[LiteralT],
+    literals: Sequence[LiteralT],
+    sizes: Sequence[int],
+    pos: int,
+    end: int,
+) -> tuple[list[Span], bool]:
+    # Never let stop go below pos: negative bounds mean "from the end" to
+    # find(), and the suffix cannot fit there anyway.
+    stop = max(end - sizes[-1], pos)
+    spans, pos = _scan_middle(haystack, literals[:-1], sizes[:-1], pos, stop)
+    suffix = _is_at(haystack, literals[-1], sizes[-1], stop, end)
+    if 0 <= pos <= stop and suffix:
+        return [*spans, (pos, stop)], True
+    return spans, False
+
+
+@dataclass(frozen=True)
+class TemplateMatcher:
+    """Fast argument extraction for texts that follow a known template.
+
+    A matcher is built with ``Template.compile()`` and scans a text once,
+    anchoring on the plain text between the variables, instead of
+    re-running the diff-based analysis.
+
+    Attributes:
+        literals: Plain text around the variables; there is always one
+            more literal than there are variables.
+
+    Example:
+        >>> matcher = TemplateMatcher(("Hello ", "!"))
+        >>> matcher.match("Hello Alice!")
+        ['Alice']
+        >>> matcher.match("Goodbye Alice!") is None
+        True
+
+    """
+
+    literals: tuple[str, ...]
+
+    @property
+    def variables(self) -> int:
+        return len(self.literals) - 1
+
+    def match_spans(self, text: str) -> list[Span] | None:
+        """Return the span of every variable, or None on a mismatch.
+
+        Spans index into the NFC-normalized text, which is what
+        ``analyze`` aligns as well.
+        """
+        text = nfc(text)
+        spans, matched = scan_spans(text, self.literals, 0, len(text))
+        return spans if matched else None
+
+    def match(self, text: str) -> Chunks | None:
+        """Return the value of every variable, or None on a mismatch."""
+        text = nfc(text)
+        spans, matched = scan_spans(text, self.literals, 0, len(text))
+        return [text[a:b] for a, b in spans] if matched else None
+
+    def partial_match(self, text: str) -> Chunks:
+        """Return the values of the variables before the first mismatch.
+
+        For a text that matches completely this is the same as ``match``.
+        """
+        text = nfc(text)
+        spans, _ = scan_spans(text, self.literals, 0, len(text))
+        return [text[a:b] for a, b in spans]
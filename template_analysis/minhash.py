@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import chain, pairwise
+from operator import eq
+
+# MinHash sketches of texts and a guide tree over them, which
+# merge_order="similarity" follows to merge similar texts first.
+
+# Number of values in a signature, and the bands of it that locality
+# sensitive hashing compares: texts agreeing on any whole band become
+# candidate neighbours. 16 bands of 4 values find most pairs whose Jaccard
+# similarity is above 0.5 and few pairs below 0.2.
+SIGNATURE_SIZE = 64
+BANDS = 16
+# Number of tokens per shingle.
+SHINGLE_SIZE = 3
+# Value of a signature slot that no shingle hashed to, before it is filled
+# from the next slot that one did, plus this offset per slot skipped.
+EMPTY = -1
+SKIP_OFFSET = 1 << 32
+SEPARATOR = "\x1f"
+
+Signature = tuple[int, ...]
+# Two clusters to merge, named after their first text; the merged cluster
+# keeps the name of the left one.
+Merge = tuple[int, int]
+
+
+def _shingles(tokens: Sequence[str]) -> list[str]:
+    if len(tokens) <= SHINGLE_SIZE:
+        return [SEPARATOR.join(tokens)]
+    return [
+        SEPARATOR.join(tokens[i : i + SHINGLE_SIZE])
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    ]
+
+
+def signature(tokens: Sequence[str]) -> Signature:
+    """Return the MinHash signature of the shingles of ``tokens``.
+
+    This is densified one-permutation MinHash: every shingle is hashed
+    once, the low bits of the hash pick a slot and the slot keeps the
+    smallest remaining bits; empty slots then borrow from the next full
+    one. The hash is CRC-32, so signatures do not depend on the hash seed
+    of the process.
+
+    Example:
+        >>> signature("abc") == signature("abc")
+        True
+        >>> similarity(signature("abcdef"), signature("abcdef"))
+        1.0
+
+    """
+    slots = [EMPTY] * SIGNATURE_SIZE
+    for shingle in _shingles(tokens):
+        value, slot = divmod(zlib.crc32(shingle.encode()), SIGNATURE_SIZE)
+        if slots[slot] == EMPTY or value < slots[slot]:
+            slots[slot] = value
+    return _densify(slots)
+
+
+def _densify(slots: list[int]) -> Signature:
+    """Fill every empty slot from the next full one, circularly.
+
+    Two texts only agree on a filled slot if the same full slot lies at
+    the same distance, which keeps the similarity estimate unbiased.
+    """
+    full = [i for i, value in enumerate(slots) if value != EMPTY]
+    size = len(slots)
+    for previous, current in pairwise([full[-1] - size, *full]):
+        for i in range(previous + 1, current):
+            slots[i] = slots[current] + (current - i) * SKIP_OFFSET
+    return tuple(slots)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimate the Jaccard similarity of the shingles of two signatures."""
+    same: int = sum(map(eq, a, b))
+    return same / len(a)
+
+
+def _band_keys(sig: Signature) -> list[tuple[int, Signature]]:
+    width = SIGNATURE_SIZE // BANDS
+    return [
+        (band, sig[band * width : (band + 1) * width])
+        for band in range(BANDS)
+    ]
+
+
+def _candidates(signatures: Sequence[Signature]) -> set[Merge]:
+    """Return pairs of texts that agree on at least one band.
+
+    Each text is paired with the previous text of every bucket it falls
+    in rather than with all of them, which keeps the number of pairs
+    linear even when many texts are identical.
+    """
+    last: dict[tuple[int, Signature], int] = {}
+    pairs: set[Merge] = set()
+    for i, sig in enumerate(signatures):
+        keys = _band_keys(sig)
+        pairs.update((last[key], i) for key in keys if key in last)
+        last.update(dict.fromkeys(keys, i))
+    return pairs
+
+
+@dataclass
+class _Forest:
+    """Union-find whose roots are the first text of every cluster."""
+
+    parents: list[int]
+    merges: list[Merge] = field(default_factory=list)
+
+    def root(self, i: int) -> int:
+        while self.parents[i] != i:
+            self.parents[i] = self.parents[self.parents[i]]
+            i = self.parents[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        a, b = sorted((self.root(i), self.root(j)))
+        if a != b:
+            self.parents[b] = a
+            self.merges.append((a, b))
+
+
+def guide_tree(signatures: Sequence[Signature]) -> list[Merge]:
+    """Return the order in which to merge texts, most similar first.
+
+    Candidate pairs are joined by decreasing similarity, which builds a
+    single-linkage tree like Kruskal's algorithm. Clusters that no
+    candidate pair connects are then merged into the first one, in input
+    order. There is always one merge fewer than texts.
+
+    Example:
+        >>> sigs = [signature(t) for t in ["GET /a", "POST x y", "GET /b"]]
+        >>> guide_tree(sigs)
+        [(0, 2), (0, 1)]
+
+    """
+    scored = sorted(
+        _candidates(signatures),
+        key=lambda p: (-similarity(signatures[p[0]], signatures[p[1]]), p),
+    )
+    forest = _Forest(list(range(len(signatures))))
+    for i, j in chain(scored, ((0, k) for k in range(1, len(signatures)))):
+        forest.union(i, j)
+    return forest.merges
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .alignment import AlignmentBackend, BackendLike, resolve_backend
+from .analyzer import Analyzer, AnalyzerResult, TextLike, _source
+from .columns import SpanTable
+from .matcher import Span, scan_spans
+from .stats import AnalyzerStats
+from .tokenizer import Tokenizer, TokenizerLike, resolve_tokenizer
+
+# Texts that matched the current template, with the spans of its
+# variables, waiting to be appended as rows in one go.
+Pending = list[tuple[str, list[Span]]]
+
+
+def refine(
+    result: AnalyzerResult,
+    texts: Iterable[TextLike],
+    *,
+    tokenizer: TokenizerLike = "char",
+    backend: BackendLike = "difflib",
+    stats: AnalyzerStats | None = None,
+) -> AnalyzerResult:
+    """Add texts to an existing result without analyzing it again.
+
+    Every new text is first matched against the current template; a text
+    that matches only costs a linear scan. A text that does not is merged
+    into the template, which splits the literal parts it disagrees with
+    into new variables. The rows analyzed before are not aligned again:
+    the columns of new variables are derived from the columns they were
+    cut out of, and every other column is shared. The cost therefore
+    grows with the new texts and the template, not with the history.
+
+    ``result`` itself is not changed.
+
+    Args:
+        result: Result to refine, for example from ``analyze``.
+        texts: New texts, appended as rows in order. They must be of the
+            same kind, str or bytes, as the texts of ``result``.
+        tokenizer: Tokenizer of the new texts; use the one ``result`` was
+            analyzed with. See ``analyze``.
+        backend: See ``analyze``.
+        stats: Optional collector that receives every merge.
+
+    Returns:
+        The result for the texts of ``result`` followed by ``texts``.
+
+    Raises:
+        ValueError: If the texts are not of the kind of ``result`` or an
+            option is invalid.
+
+    Example:
+        >>> from template_analysis import analyze
+        >>> result = analyze(["GET /a OK", "GET /b OK"])
+        >>> result.to_format_string()
+        'GET /{0} OK'
+        >>> refined = refine(result, ["GET /c OK", "GET /d FAIL"])
+        >>> refined.to_format_string()
+        'GET /{0} {1}'
+        >>> refined.args
+        [['a', 'OK'], ['b', 'OK'], ['c', 'OK'], ['d', 'FAIL']]
+
+    """
+    split, align = resolve_tokenizer(tokenizer), resolve_backend(backend)
+    literals = result.template.literals()
+    pending: Pending = []
+    for text in texts:
+        _assert_kind(result, text)
+        source = _source(text)
+        spans, matched = scan_spans(source, literals, 0, len(source))
+        if matched:
+            pending.append((source, spans))
+            continue
+        result = _merge(_append(result, pending), text, split, align, stats)
+        literals = result.template.literals()
+        pending = []
+    return _append(result, pending)
+
+
+def _assert_kind(result: AnalyzerResult, text: TextLike) -> None:
+    if isinstance(text, str) == result.table.binary:
+        raise ValueError("texts mix str and bytes-like objects.")
+
+
+def _append(result: AnalyzerResult, pending: Pending) -> AnalyzerResult:
+    if not pending:
+        return result
+    rows = SpanTable.from_spans(
+        [source for source, _ in pending],
+        result.symbols,
+        [spans for _, spans in pending],
+        binary=result.table.binary,
+    )
+    return AnalyzerResult(
+        result.text,
+        result.table.concat(rows),
+        result.approximate,
+    )
+
+
+def _merge(
+    result: AnalyzerResult,
+    text: TextLike,
+    tokenizer: Tokenizer,
+    backend: AlignmentBackend,
+    stats: AnalyzerStats | None,
+) -> AnalyzerResult:
+    return Analyzer._analyze_two_result(
+        result,
+        AnalyzerResult._from_text(text, tokenizer),
+        backend,
+        stats,
+    )
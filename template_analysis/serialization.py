@@ -0,0 +1,520 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate, chain, groupby, islice, pairwise
+from typing import Any, Literal
+
+from .analyzer import AnalyzerResult
+from .columns import SpanTable
+from .matcher import Span
+from .symbol import Chunks, Symbol, SymbolOrCharacter
+from .template import PlainText, Template, TemplatePart, Variable
+
+SerializationFormat = Literal["binary", "json"]
+Kind = Literal["template", "result"]
+
+VERSION = 2
+MAGIC = b"TPLA"
+JSON_FORMAT = "template-analysis"
+KINDS: tuple[Kind, ...] = ("template", "result")
+
+# A run of plain text, or the id of a variable.
+Item = str | int
+# Whether a value read from a JSON document has the expected type.
+Check = Callable[[Any], bool]
+# Default of the JSON fields every document must have.
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class _Payload:
+    """What both formats store.
+
+    Attributes:
+        kind: Whether a Template or an AnalyzerResult is stored.
+        items: The template as runs of plain text and variable ids.
+        tokens: Length of every plain text token of a result, or None when
+            every token is a single character.
+        rows: Number of analyzed texts.
+        columns: Value of every variable in every text.
+        binary: Whether the texts of a result were bytes, stored as one
+            Latin-1 character per byte.
+        approximate: Whether the result was approximated beyond a budget.
+
+    """
+
+    kind: Kind
+    items: list[Item]
+    tokens: list[int] | None = None
+    rows: int = 0
+    columns: list[Chunks] = field(default_factory=list)
+    binary: bool = False
+    approximate: bool = False
+
+
+def _join_runs(items: Iterable[Item]) -> list[Item]:
+    """Join adjacent plain text items into one."""
+    joined: list[Item] = []
+    for is_text, group in groupby(items, key=lambda i: isinstance(i, str)):
+        runs = list(group)
+        joined.extend(["".join(map(str, runs))] if is_text else runs)
+    return joined
+
+
+def _part_item(part: TemplatePart) -> Item:
+    return part.value if isinstance(part, PlainText) else part.id
+
+
+def _template_payload(template: Template) -> _Payload:
+    return _Payload("template", _join_runs(map(_part_item, template.parts)))
+
+
+def _template(payload: _Payload) -> Template:
+    return Template(
+        [
+            PlainText(item) if isinstance(item, str) else Variable(item)
+            for item in payload.items
+        ],
+    )
+
+
+def _token_lengths(text: Sequence[SymbolOrCharacter]) -> list[int] | None:
+    lengths = [len(token) for token in text if isinstance(token, str)]
+    return None if all(n == 1 for n in lengths) else lengths
+
+
+def _result_item(element: SymbolOrCharacter, ids: dict[Symbol, int]) -> Item:
+    return ids[element] if isinstance(element, Symbol) else element
+
+
+def _result_payload(result: AnalyzerResult) -> _Payload:
+    ids = {symbol: i for i, symbol in enumerate(result.symbols)}
+    return _Payload(
+        "result",
+        _join_runs(_result_item(element, ids) for element in result.text),
+        _token_lengths(result.text),
+        len(result.table),
+        [list(column) for column in result.columns],
+        result.table.binary,
+        result.approximate,
+    )
+
+
+def _next_token(run: str, pos: int, lengths: Iterator[int]) -> str:
+    length = next(lengths, 0)
+    if not 0 < length <= len(run) - pos:
+        raise ValueError("Corrupt serialized result: bad token lengths.")
+    return run[pos : pos + length]
+
+
+def _split_tokens(run: str, lengths: Iterator[int] | None) -> list[str]:
+    if lengths is None:
+        return list(run)
+    tokens: list[str] = []
+    pos = 0
+    while pos < len(run):
+        tokens.append(_next_token(run, pos, lengths))
+        pos += len(tokens[-1])
+    return tokens
+
+
+def _result_text(
+    payload: _Payload,
+    symbols: list[Symbol],
+) -> tuple[SymbolOrCharacter, ...]:
+    lengths = None if payload.tokens is None else iter(payload.tokens)
+    text: list[SymbolOrCharacter] = []
+    for item in payload.items:
+        if isinstance(item, int):
+            text.append(symbols[item])
+            continue
+        text.extend(_split_tokens(item, lengths))
+    return tuple(text)
+
+
+def _literals(items: list[Item]) -> list[str]:
+    """Return the plain text before, between and after the variables."""
+    literals = [""]
+    for item in items:
+        if isinstance(item, int):
+            literals.append("")
+            continue
+        literals[-1] += item
+    return literals
+
+
+def _rebuild_row(
+    literals: list[str],
+    values: Sequence[str],
+) -> tuple[str, list[Span]]:
+    """Rebuild an analyzed text from the literals and its variables."""
+    spans: list[Span] = []
+    pos = len(literals[0])
+    for value, literal in zip(values, literals[1:], strict=True):
+        spans.append((pos, pos + len(value)))
+        pos += len(value) + len(literal)
+    pieces = chain.from_iterable(zip(literals, [*values, ""], strict=True))
+    return "".join(pieces), spans
+
+
+def _assert_shape(payload: _Payload) -> None:
+    ids = [item for item in payload.items if isinstance(item, int)]
+    if ids != list(range(len(payload.columns))) or any(
+        len(column) != payload.rows for column in payload.columns
+    ):
+        raise ValueError(
+            "Corrupt serialized result: variables and columns disagree.",
+        )
+
+
+def _assert_tokens(payload: _Payload) -> None:
+    """Check that the token lengths cover the plain text runs exactly."""
+    if payload.tokens is None:
+        return
+    size = sum(len(item) for item in payload.items if isinstance(item, str))
+    if 0 in payload.tokens or sum(payload.tokens) != size:
+        raise ValueError("Corrupt serialized result: bad token lengths.")
+
+
+def _result(payload: _Payload) -> AnalyzerResult:
+    _assert_shape(payload)
+    _assert_tokens(payload)
+    symbols = [Symbol.create() for _ in payload.columns]
+    literals = _literals(payload.items)
+    values = (
+        zip(*payload.columns, strict=True)
+        if payload.columns
+        else [()] * payload.rows
+    )
+    rows = [_rebuild_row(literals, row) for row in values]
+    sources = [source for source, _ in rows]
+    return AnalyzerResult(
+        _result_text(payload, symbols),
+        SpanTable.from_spans(
+            sources,
+            symbols,
+            [spans for _, spans in rows],
+            binary=payload.binary,
+        ),
+        payload.approximate,
+    )
+
+
+def _assert_version(version: object) -> None:
+    if version != VERSION:
+        raise ValueError(
+            f"Unsupported serialization version {version!r}; "
+            f"expected {VERSION}.",
+        )
+
+
+def _to_json(payload: _Payload) -> bytes:
+    document: dict[str, Any] = {
+        "format": JSON_FORMAT,
+        "version": VERSION,
+        "kind": payload.kind,
+        "items": payload.items,
+    }
+    if payload.kind == "result":
+        document.update(
+            tokens=payload.tokens,
+            rows=payload.rows,
+            columns=payload.columns,
+            binary=payload.binary,
+            approximate=payload.approximate,
+        )
+    return json.dumps(document, ensure_ascii=False).encode()
+
+
+def _instance_of(kind: type) -> Check:
+    return lambda value: isinstance(value, kind)
+
+
+def _list_of(check: Check) -> Check:
+    return lambda value: isinstance(value, list) and all(map(check, value))
+
+
+def _is_count(value: object) -> bool:
+    return type(value) is int and value >= 0
+
+
+def _is_item(value: object) -> bool:
+    return isinstance(value, str) or _is_count(value)
+
+
+def _is_tokens(value: object) -> bool:
+    return value is None or _list_of(_is_count)(value)
+
+
+# The check of every field of a JSON document and its default; fields
+# without a default are required.
+JSON_FIELDS: dict[str, tuple[Check, object]] = {
+    "kind": (KINDS.__contains__, MISSING),
+    "items": (_list_of(_is_item), MISSING),
+    "tokens": (_is_tokens, None),
+    "rows": (_is_count, 0),
+    "columns": (_list_of(_list_of(_instance_of(str))), []),
+    "binary": (_instance_of(bool), False),
+    "approximate": (_instance_of(bool), False),
+}
+
+
+def _assert_fields(document: dict[str, Any]) -> None:
+    for key, (check, default) in JSON_FIELDS.items():
+        value = document.get(key, default)
+        if value is MISSING or not check(value):
+            raise ValueError(
+                f"Corrupt serialized data: missing or invalid {key!r}.",
+            )
+
+
+def _from_json(data: bytes) -> _Payload:
+    document = json.loads(data)
+    if not isinstance(document, dict) or document.get("format") != JSON_FORMAT:
+        raise ValueError("Not a serialized template or result.")
+    _assert_version(document.get("version"))
+    _assert_fields(document)
+    return _Payload(
+        document["kind"],
+        document["items"],
+        document.get("tokens"),
+        document.get("rows", 0),
+        document.get("columns", []),
+        document.get("binary", False),
+        document.get("approximate", False),
+    )
+
+
+# magic, version, kind, has tokens, flags, typecode of the string lengths,
+# items, tokens, rows, columns, text size
+HEADER = struct.Struct("<4sBBBBcIIIIQ")
+# Bits of the flags byte.
+FLAG_BINARY = 1
+FLAG_APPROXIMATE = 2
+FLAGS = FLAG_BINARY | FLAG_APPROXIMATE
+# Unsigned typecodes from narrow to wide, to store lengths compactly.
+TYPECODES = "BHIQ"
+
+
+def _flags(payload: _Payload) -> int:
+    binary = FLAG_BINARY if payload.binary else 0
+    return binary | (FLAG_APPROXIMATE if payload.approximate else 0)
+
+
+def _little_endian(values: array[int]) -> array[int]:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _narrowest(values: list[int]) -> array[int]:
+    """Store ``values`` in the narrowest unsigned array that fits them."""
+    top = max(values, default=0)
+    typecode = next(t for t in TYPECODES if top < 256 ** array(t).itemsize)
+    return array(typecode, values)
+
+
+def _to_binary(payload: _Payload) -> bytes:
+    runs = [item for item in payload.items if isinstance(item, str)]
+    strings = runs + [value for column in payload.columns for value in column]
+    run_ids = iter(range(len(runs)))
+    codes = array(
+        "q",
+        (
+            next(run_ids) if isinstance(i, str) else -1 - i
+            for i in payload.items
+        ),
+    )
+    tokens = array("I", payload.tokens or [])
+    lengths = _narrowest(list(map(len, strings)))
+    blob = "".join(strings).encode()
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        KINDS.index(payload.kind),
+        payload.tokens is not None,
+        _flags(payload),
+        lengths.typecode.encode(),
+        len(codes),
+        len(tokens),
+        payload.rows,
+        len(payload.columns),
+        len(blob),
+    )
+    arrays = (_little_endian(a).tobytes() for a in (codes, tokens, lengths))
+    return b"".join([header, *arrays, blob])
+
+
+@dataclass
+class _Reader:
+    data: memoryview
+    pos: int = 0
+
+    def take(self, size: int) -> memoryview:
+        if self.pos + size > len(self.data):
+            raise ValueError("Truncated serialized data.")
+        self.pos += size
+        return self.data[self.pos - size : self.pos]
+
+    def array(self, typecode: str, count: int) -> array[int]:
+        values = array(typecode)
+        values.frombytes(self.take(values.itemsize * count))
+        return _little_endian(values)
+
+    def strings(self, typecode: str, count: int, size: int) -> list[str]:
+        """Read ``count`` strings stored as their lengths plus one blob."""
+        lengths = self.array(typecode, count)
+        text = str(self.take(size), "utf-8")
+        if sum(lengths) != len(text):
+            raise ValueError("Corrupt serialized data: bad string lengths.")
+        return [text[a:b] for a, b in pairwise([0, *accumulate(lengths)])]
+
+
+def _assert_header(
+    kind: int,
+    has_tokens: int,
+    flags: int,
+    typecode: bytes,
+) -> None:
+    if kind >= len(KINDS) or has_tokens > 1 or flags & ~FLAGS:
+        raise ValueError("Corrupt serialized data: bad header.")
+    if typecode not in TYPECODES.encode():
+        raise ValueError(
+            f"Corrupt serialized data: bad typecode {typecode!r}.",
+        )
+
+
+def _assert_codes(codes: array[int]) -> None:
+    """Check that the plain text runs are numbered in order."""
+    runs = [code for code in codes if code >= 0]
+    if runs != list(range(len(runs))):
+        raise ValueError("Corrupt serialized data: bad template items.")
+
+
+def _from_binary(data: bytes) -> _Payload:
+    reader = _Reader(memoryview(data))
+    header = HEADER.unpack(reader.take(HEADER.size))
+    _, version, kind, has_tokens, flags, typecode, *counts = header
+    _assert_version(version)
+    _assert_header(kind, has_tokens, flags, typecode)
+    items, tokens, rows, columns, size = counts
+    codes = reader.array("q", items)
+    _assert_codes(codes)
+    token_lengths = reader.array("I", tokens).tolist()
+    runs = sum(code >= 0 for code in codes)
+    strings = reader.strings(typecode.decode(), runs + rows * columns, size)
+    values = iter(strings[runs:])
+    return _Payload(
+        KINDS[kind],
+        [strings[code] if code >= 0 else -1 - code for code in codes],
+        token_lengths if has_tokens else None,
+        rows,
+        [list(islice(values, rows)) for _ in range(columns)],
+        bool(flags & FLAG_BINARY),
+        bool(flags & FLAG_APPROXIMATE),
+    )
+
+
+ENCODERS = {"binary": _to_binary, "json": _to_json}
+
+
+def _dump(payload: _Payload, fmt: SerializationFormat) -> bytes:
+    try:
+        encode = ENCODERS[fmt]
+    except KeyError:
+        raise ValueError(
+            f"Unknown format {fmt!r}; expected one of {sorted(ENCODERS)}.",
+        ) from None
+    return encode(payload)
+
+
+def _load(data: bytes | str, kind: Kind) -> _Payload:
+    if isinstance(data, str):
+        data = data.encode()
+    decode = _from_binary if data.startswith(MAGIC) else _from_json
+    payload = decode(data)
+    if payload.kind != kind:
+        raise ValueError(
+            f"Expected a serialized {kind}, got a {payload.kind}.",
+        )
+    return payload
+
+
+def dump_template(
+    template: Template,
+    *,
+    fmt: SerializationFormat = "binary",
+) -> bytes:
+    """Serialize a template.
+
+    Adjacent plain text parts are stored as one part, so a loaded template
+    has the same format string and matches the same texts, but may have
+    fewer parts.
+
+    Args:
+        template: Template to serialize.
+        fmt: ``"binary"`` (default) for a compact encoding, or ``"json"``
+            for a UTF-8 JSON document.
+
+    Raises:
+        ValueError: If the format is unknown.
+
+    Example:
+        >>> template = Template([PlainText("id="), Variable(0)])
+        >>> json.loads(dump_template(template, fmt="json"))["items"]
+        ['id=', 0]
+        >>> load_template(dump_template(template)).to_format_string()
+        'id={0}'
+
+    """
+    return _dump(_template_payload(template), fmt)
+
+
+def load_template(data: bytes | str) -> Template:
+    """Load a template written by ``dump_template`` in either format.
+
+    Raises:
+        ValueError: If the data is not a serialized template of a supported
+            version.
+
+    """
+    return _template(_load(data, "template"))
+
+
+def dump_result(
+    result: AnalyzerResult,
+    *,
+    fmt: SerializationFormat = "binary",
+) -> bytes:
+    """Serialize an analysis result.
+
+    Only the template, its tokens and the args are stored; the analyzed
+    texts are rebuilt from them on load. A loaded result is equal to the
+    original and can be merged further like any other result.
+
+    Args:
+        result: Result to serialize.
+        fmt: ``"binary"`` (default) for a compact encoding, or ``"json"``
+            for a UTF-8 JSON document.
+
+    Raises:
+        ValueError: If the format is unknown.
+
+    """
+    return _dump(_result_payload(result), fmt)
+
+
+def load_result(data: bytes | str) -> AnalyzerResult:
+    """Load a result written by ``dump_result`` in either format.
+
+    Raises:
+        ValueError: If the data is not a serialized result of a supported
+            version, or is corrupt.
+
+    """
+    return _result(_load(data, "result"))
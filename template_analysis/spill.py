@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import weakref
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import chain, islice
+from pathlib import Path
+from typing import BinaryIO
+
+from .alignment import BackendLike, resolve_backend
+from .analyzer import Analyzer, AnalyzerResult, _from_texts
+from .columns import SpanTable
+from .matcher import Span, scan_spans
+from .symbol import (
+    Chunks,
+    Symbol,
+    SymbolOrCharacter,
+    SymbolTable,
+    SymbolTemplate,
+)
+from .template import Template
+from .tokenizer import TokenizerLike, nfc, resolve_tokenizer
+
+# Every spilled text is stored as its UTF-8 size followed by its bytes.
+SIZE_BYTES = 4
+
+
+def _write_records(file: BinaryIO, texts: list[str]) -> None:
+    for text in texts:
+        data = text.encode()
+        file.write(len(data).to_bytes(SIZE_BYTES, "little"))
+        file.write(data)
+
+
+def _read_records(file: BinaryIO) -> Iterator[str]:
+    while header := file.read(SIZE_BYTES):
+        yield file.read(int.from_bytes(header, "little")).decode()
+
+
+def _spans(source: str, literals: tuple[str, ...]) -> list[Span]:
+    spans, matched = scan_spans(source, literals, 0, len(source))
+    if not matched:
+        raise RuntimeError(
+            "Internal invariant violated: a spilled text does not match "
+            "the template derived from it.",
+        )
+    return spans
+
+
+@dataclass(eq=False)
+class SpilledResult:
+    """Result of ``analyze_spilled`` whose texts are kept on disk.
+
+    Only the template is held in memory. Args are extracted on demand by
+    matching every spilled text against the template, one text at a time,
+    so iterating over rows or columns takes constant memory. Call
+    ``close`` or use the result as a context manager to delete the file;
+    it is also deleted when the result is garbage collected.
+
+    Attributes:
+        text: The template as tokens and symbols.
+        path: File that holds the analyzed texts.
+        count: Number of analyzed texts.
+
+    """
+
+    text: tuple[SymbolOrCharacter, ...]
+    path: Path
+    count: int
+    _cleanup: weakref.finalize[[Path], SpilledResult] = field(
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        self._cleanup = weakref.finalize(self, _unlink, self.path)
+
+    def __enter__(self) -> SpilledResult:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Delete the spilled texts."""
+        self._cleanup()
+
+    @cached_property
+    def template(self) -> Template:
+        return Template.from_symbol_template(
+            SymbolTemplate(list(self.text), SymbolTable.create()),
+        )
+
+    def to_format_string(self) -> str:
+        return self.template.to_format_string()
+
+    def sources(self) -> Iterator[str]:
+        """Yield the analyzed texts, after NFC normalization."""
+        with self.path.open("rb") as file:
+            yield from _read_records(file)
+
+    def rows(self) -> Iterator[Chunks]:
+        """Yield the values of the variables for each text."""
+        literals = self.template.literals()
+        for source in self.sources():
+            yield [source[a:b] for a, b in _spans(source, literals)]
+
+    def column(self, var_id: int) -> Iterator[str]:
+        """Yield the value of variable ``var_id`` for every text."""
+        return (row[var_id] for row in self.rows())
+
+    def to_result(self) -> AnalyzerResult:
+        """Load all rows into an in-memory AnalyzerResult."""
+        literals = self.template.literals()
+        sources = list(self.sources())
+        symbols = [s for s in self.text if isinstance(s, Symbol)]
+        spans = [_spans(source, literals) for source in sources]
+        return AnalyzerResult(
+            self.text,
+            SpanTable.from_spans(sources, symbols, spans),
+        )
+
+
+def _unlink(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+def analyze_spilled(
+    texts: Iterable[str],
+    *,
+    batch_size: int = 1024,
+    tokenizer: TokenizerLike = "char",
+    backend: BackendLike = "difflib",
+    directory: str | os.PathLike[str] | None = None,
+) -> SpilledResult:
+    """Analyze more texts than fit in memory.
+
+    Texts are read in batches. Each batch is written to a temporary file
+    and merged into the template, and then its rows are dropped, so only
+    the template and one batch are ever held in memory. The template is
+    the same as the one ``analyze`` derives.
+
+    The args are not tracked through the merges. Since every merge only
+    generalizes the template, each spilled text still matches the final
+    template, and ``SpilledResult`` extracts the args by matching the
+    texts again, anchoring each literal at its leftmost occurrence.
+
+    Args:
+        texts: Texts to analyze, from any iterable.
+        batch_size: Number of texts held in memory at a time.
+        tokenizer: See ``analyze``.
+        backend: See ``analyze``.
+        directory: Directory of the temporary file; the system default if
+            None.
+
+    Returns:
+        A SpilledResult that reads the args back from disk.
+
+    Raises:
+        ValueError: If texts is empty, batch_size is less than 1 or an
+            option is invalid.
+
+    Example:
+        >>> with analyze_spilled(iter(["id=1", "id=22"])) as result:
+        ...     result.to_format_string(), list(result.rows())
+        ('id={0}', [['1'], ['22']])
+
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}.")
+    fd, name = tempfile.mkstemp(suffix=".spill", dir=directory)
+    spilled = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            template, count = _spill(
+                file,
+                iter(texts),
+                batch_size,
+                tokenizer,
+                backend,
+            )
+    except BaseException:
+        _unlink(spilled)
+        raise
+    return SpilledResult(template.text, spilled, count)
+
+
+def _spill(
+    file: BinaryIO,
+    texts: Iterator[str],
+    batch_size: int,
+    tokenizer: TokenizerLike,
+    backend: BackendLike,
+) -> tuple[AnalyzerResult, int]:
+    split, align = resolve_tokenizer(tokenizer), resolve_backend(backend)
+    template: list[AnalyzerResult] = []
+    count = 0
+    while batch := list(islice(texts, batch_size)):
+        sources = [nfc(text) for text in batch]
+        _write_records(file, sources)
+        merged = Analyzer._reduce_sequential(
+            chain(template, _from_texts(sources, split)),
+            align,
+        )
+        # Dropping the rows keeps memory independent of the count.
+        template = [
+            AnalyzerResult(merged.text, merged.table.without_rows()),
+        ]
+        count += len(sources)
+    if not template:
+        raise ValueError("texts are empty.")
+    return template[0], count
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .alignment import AlignmentBackend, BackendLike, resolve_backend
+from .analyzer import Analyzer, AnalyzerResult
+from .stats import AnalyzerStats
+from .tokenizer import Tokenizer, TokenizerLike, resolve_tokenizer
+
+
+@dataclass
+class StreamingAnalyzer:
+    """Analyzer that accepts texts one at a time.
+
+    Each fed text is merged into the current result right away, so texts
+    can be consumed from a queue or generator without materializing the
+    corpus, and the template is available at any point.
+
+    Example:
+        >>> stream = StreamingAnalyzer.create()
+        >>> stream.feed("Hello Alice")
+        >>> stream.feed_many(iter(["Hello Bob"]))
+        >>> stream.snapshot().to_format_string()
+        'Hello {0}'
+
+    """
+
+    tokenizer: Tokenizer
+    backend: AlignmentBackend
+    max_texts: int | None
+    result: AnalyzerResult | None
+    count: int
+    stats: AnalyzerStats | None = None
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        tokenizer: TokenizerLike = "char",
+        backend: BackendLike = "difflib",
+        max_texts: int | None = None,
+        stats: AnalyzerStats | None = None,
+    ) -> StreamingAnalyzer:
+        return cls(
+            resolve_tokenizer(tokenizer),
+            resolve_backend(backend),
+            max_texts=max_texts,
+            result=None,
+            count=0,
+            stats=stats,
+        )
+
+    def feed(self, text: str) -> None:
+        """Merge one text into the current result.
+
+        Raises:
+            ValueError: If the text would exceed max_texts.
+
+        """
+        self.feed_result(AnalyzerResult._from_text(text, self.tokenizer))
+
+    def feed_result(self, result: AnalyzerResult) -> None:
+        """Merge the result of analyzing a batch of texts.
+
+        This lets batches be analyzed elsewhere, for example with
+        ``analyze(batch, merge_order="tree", workers=4)``, and then be
+        folded into the stream. Rows keep the order in which they are fed.
+
+        Raises:
+            ValueError: If the texts would exceed max_texts.
+
+        """
+        count = self.count + len(result.table)
+        Analyzer._assert_max_texts(count, self.max_texts)
+        if self.result is not None:
+            result = Analyzer._analyze_two_result(
+                self.result,
+                result,
+                self.backend,
+                self.stats,
+            )
+        self.result = result
+        self.count = count
+
+    def feed_many(self, texts: Iterable[str]) -> None:
+        """Merge texts from any iterable, one at a time."""
+        for text in texts:
+            self.feed(text)
+
+    def snapshot(self) -> AnalyzerResult:
+        """Return the result for all texts fed so far.
+
+        Results are immutable, so this does not copy anything and later
+        feeds do not affect a snapshot already taken.
+
+        Raises:
+            ValueError: If no text has been fed yet.
+
+        """
+        if self.result is None:
+            raise ValueError("texts are empty.")
+        return self.result
@@ -33,6 +33,11 @@ class SymbolTable:
         empty: dict[Symbol, SymbolValue] = {}
         return cls(MappingProxyType(empty))
 
+    def __reduce__(self) -> tuple[object, ...]:
+        # MappingProxyType cannot be pickled; rebuild the table from a dict
+        # so results can be sent to worker processes.
+        return (_symbol_table_from_dict, (dict(self.table),))
+
     def add(self, symbol: Symbol, chunk: SymbolValue) -> SymbolTable:
         new: dict[Symbol, SymbolValue] = {**self.table, symbol: chunk}
         return SymbolTable(MappingProxyType(new))
@@ -72,6 +77,12 @@ class SymbolTable:
         )
 
 
+def _symbol_table_from_dict(
+    table: dict[Symbol, SymbolValue],
+) -> SymbolTable:
+    return SymbolTable(MappingProxyType(table))
+
+
 SymbolOrCharacter = Symbol | Character
 SymbolChunk = Symbol | Chunk
 Chunks = list[Chunk]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .matcher import TemplateMatcher
 from .symbol import Symbol, SymbolTemplate
 
 
@@ -53,3 +54,30 @@ class Template:
 
     def to_format_string(self) -> str:
         return "".join(part.to_format_string() for part in self.parts)
+
+    def literals(self) -> tuple[str, ...]:
+        """Return the plain text before, between and after the variables.
+
+        Adjacent ``PlainText`` parts are joined, and there is always one
+        more literal than there are variables.
+        """
+        literals: list[str] = []
+        current: list[str] = []
+        for part in self.parts:
+            if isinstance(part, Variable):
+                literals.append("".join(current))
+                current = []
+            else:
+                current.append(part.value)
+        return (*literals, "".join(current))
+
+    def compile(self) -> TemplateMatcher:
+        """Build a matcher that extracts the variables from new texts.
+
+        Example:
+            >>> template = Template([PlainText("id="), Variable(0)])
+            >>> template.compile().match("id=42")
+            ['42']
+
+        """
+        return TemplateMatcher(self.literals())
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+Token = str
+Tokenizer = Callable[[str], Sequence[Token]]
+TokenizerLike = str | re.Pattern[str] | Tokenizer
+
+# Runs of word characters, runs of whitespace and runs of everything else.
+WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]+")
+
+
+def nfc(text: str) -> str:
+    """Return the NFC normalization of a text.
+
+    ASCII text is always normalized, so it is returned as is without
+    looking at its characters one by one.
+    """
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFC", text)
+
+
+def tokenize_chars(text: str) -> tuple[Token, ...]:
+    """Split a text into single characters (the default granularity)."""
+    return tuple(text)
+
+
+@dataclass(frozen=True)
+class RegexTokenizer:
+    """Split a text into the matches of a pattern and the gaps between them.
+
+    Unmatched stretches of the text are kept as tokens of their own,
+    so joining the tokens always gives back the original text.
+
+    Example:
+        >>> RegexTokenizer(re.compile(r"\\d+"))("id=42;")
+        ('id=', '42', ';')
+
+    """
+
+    pattern: re.Pattern[str]
+
+    def __call__(self, text: str) -> tuple[Token, ...]:
+        tokens: list[Token] = []
+        pos = 0
+        for match in self.pattern.finditer(text):
+            tokens.extend(_non_empty(text[pos : match.start()], match[0]))
+            pos = match.end()
+        tokens.extend(_non_empty(text[pos:]))
+        return tuple(tokens)
+
+
+@dataclass(frozen=True)
+class CheckedTokenizer:
+    """Wrap a user tokenizer and check that it does not lose any text."""
+
+    tokenizer: Tokenizer
+
+    def __call__(self, text: str) -> tuple[Token, ...]:
+        tokens = tuple(_non_empty(*self.tokenizer(text)))
+        if "".join(tokens) != text:
+            raise ValueError(
+                "tokenizer must split the text without dropping or "
+                "rewriting characters: joined tokens differ from the input.",
+            )
+        return tokens
+
+
+def _non_empty(*tokens: Token) -> list[Token]:
+    return [token for token in tokens if token]
+
+
+TOKENIZERS: dict[str, Tokenizer] = {
+    "char": tokenize_chars,
+    "word": RegexTokenizer(WORD_PATTERN),
+}
+
+
+def _named_tokenizer(name: str) -> Tokenizer:
+    try:
+        return TOKENIZERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown tokenizer {name!r}; expected one of "
+            f"{sorted(TOKENIZERS)}, a compiled regex or a callable.",
+        ) from None
+
+
+def resolve_tokenizer(tokenizer: TokenizerLike) -> Tokenizer:
+    """Turn a tokenizer name, regex or callable into a tokenizer.
+
+    Args:
+        tokenizer: ``"char"``, ``"word"``, a compiled regular expression
+            whose matches become tokens, or a callable returning tokens.
+
+    Raises:
+        ValueError: If the tokenizer name is unknown.
+
+    """
+    if isinstance(tokenizer, str):
+        return _named_tokenizer(tokenizer)
+    if isinstance(tokenizer, re.Pattern):
+        return RegexTokenizer(tokenizer)
+    return CheckedTokenizer(tokenizer)
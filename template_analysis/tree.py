@@ -0,0 +1,511 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from functools import cached_property
+from html import escape
+from html.parser import HTMLParser
+from typing import Any, Literal
+
+from .alignment import AlignmentBackend, BackendLike, Match, resolve_backend
+from .analyzer import Analyzer
+from .symbol import Chunks
+from .template import PlainText, Template, TemplatePart, Variable
+from .tokenizer import Tokenizer, TokenizerLike, resolve_tokenizer
+
+TreeFormat = Literal["html", "json"]
+
+# Elements that never have children or an end tag.
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    },
+)
+# Tags of JSON containers. Members of an object are elements tagged with
+# their name after JSON_MEMBER, holding their value as the only child; the
+# prefix keeps a member named "{}" or "[]" apart from a container.
+JSON_OBJECT = "{}"
+JSON_ARRAY = "[]"
+JSON_MEMBER = ":"
+JSON_BRACKETS = {JSON_OBJECT: ("{", "}"), JSON_ARRAY: ("[", "]")}
+
+Attributes = tuple[tuple[str, str], ...]
+# Nodes of the same key are aligned with each other.
+Key = tuple[str, tuple[str, ...]] | None
+
+
+@dataclass(frozen=True)
+class Element:
+    """A parsed element: a tag with attributes and child nodes."""
+
+    tag: str
+    attrs: Attributes = ()
+    children: tuple[Node, ...] = ()
+
+    @property
+    def key(self) -> Key:
+        return self.tag, tuple(name for name, _ in self.attrs)
+
+
+# A node is an element or a text leaf.
+Node = Element | str
+
+
+def _key(node: Node) -> Key:
+    return None if isinstance(node, str) else node.key
+
+
+class _HTMLTreeBuilder(HTMLParser):
+    """Build a tree of Elements, closing unclosed elements leniently.
+
+    Comments, declarations and processing instructions are dropped.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        # Open elements, innermost last, under the root.
+        self.stack: list[tuple[str, Attributes, list[Node]]] = [("", (), [])]
+
+    def handle_starttag(
+        self,
+        tag: str,
+        attrs: list[tuple[str, str | None]],
+    ) -> None:
+        attributes = tuple((name, value or "") for name, value in attrs)
+        if tag in VOID_ELEMENTS:
+            self.stack[-1][2].append(Element(tag, attributes))
+            return
+        self.stack.append((tag, attributes, []))
+
+    def handle_startendtag(
+        self,
+        tag: str,
+        attrs: list[tuple[str, str | None]],
+    ) -> None:
+        attributes = tuple((name, value or "") for name, value in attrs)
+        self.stack[-1][2].append(Element(tag, attributes))
+
+    def handle_endtag(self, tag: str) -> None:
+        # A stray end tag is ignored; one that closes an outer element
+        # closes the unclosed elements inside it too.
+        if any(open_tag == tag for open_tag, _, _ in self.stack[1:]):
+            while self._pop() != tag:
+                pass
+
+    def handle_data(self, data: str) -> None:
+        children = self.stack[-1][2]
+        last = children[-1] if children else None
+        if isinstance(last, str):
+            children[-1] = last + data
+            return
+        children.append(data)
+
+    def _pop(self) -> str:
+        tag, attrs, children = self.stack.pop()
+        self.stack[-1][2].append(Element(tag, attrs, tuple(children)))
+        return tag
+
+    def root(self) -> Element:
+        self.close()
+        while len(self.stack) > 1:
+            self._pop()
+        return Element("", (), tuple(self.stack[0][2]))
+
+
+def parse_html(text: str) -> Element:
+    """Parse HTML into a tree under a root element with an empty tag.
+
+    Example:
+        >>> parse_html("<p class='x'>Hi<br></p>")
+        Element(tag='', attrs=(), children=(Element(tag='p', \
+attrs=(('class', 'x'),), children=('Hi', Element(tag='br', attrs=(), \
+children=()))),))
+
+    """
+    builder = _HTMLTreeBuilder()
+    builder.feed(text)
+    return builder.root()
+
+
+def _json_node(value: Any) -> Node:  # noqa: ANN401
+    if isinstance(value, dict):
+        return Element(
+            JSON_OBJECT,
+            (),
+            tuple(
+                Element(f"{JSON_MEMBER}{k}", (), (_json_node(v),))
+                for k, v in value.items()
+            ),
+        )
+    if isinstance(value, list):
+        return Element(JSON_ARRAY, (), tuple(map(_json_node, value)))
+    return json.dumps(value, ensure_ascii=False)
+
+
+def parse_json(text: str) -> Element:
+    """Parse JSON into a tree under a root element with an empty tag.
+
+    Objects and arrays become elements, and every scalar becomes a text
+    leaf holding its JSON representation.
+
+    Example:
+        >>> parse_json('{"id": 1}')
+        Element(tag='', attrs=(), children=(Element(tag='{}', attrs=(), \
+children=(Element(tag=':id', attrs=(), children=('1',)),)),))
+
+    """
+    return Element("", (), (_json_node(json.loads(text)),))
+
+
+PARSERS: dict[str, Callable[[str], Element]] = {
+    "html": parse_html,
+    "json": parse_json,
+}
+
+
+@dataclass(frozen=True)
+class TextSlot:
+    """Template of a text leaf or an attribute value.
+
+    The ids of its variables are global to the whole tree.
+    """
+
+    template: Template
+
+
+@dataclass(frozen=True)
+class SubtreeSlot:
+    """A variable holding the nodes that only some documents have.
+
+    Its value is the markup of those nodes, and empty in the documents
+    without them.
+    """
+
+    id: int
+
+
+@dataclass(frozen=True)
+class ElementTemplate:
+    """An element present in every document, with templated contents."""
+
+    tag: str
+    attrs: tuple[tuple[str, TextSlot], ...] = ()
+    children: tuple[TreeNode, ...] = ()
+
+
+# A node of a template tree.
+TreeNode = ElementTemplate | TextSlot | SubtreeSlot
+
+
+def _shift(template: Template, offset: int) -> Template:
+    parts: list[TemplatePart] = [
+        Variable(part.id + offset) if isinstance(part, Variable) else part
+        for part in template.parts
+    ]
+    return Template(parts)
+
+
+def _html_text(template: Template, quote: bool) -> str:
+    return "".join(
+        PlainText(escape(part.value, quote)).to_format_string()
+        if isinstance(part, PlainText)
+        else part.to_format_string()
+        for part in template.parts
+    )
+
+
+def _html_attrs(attrs: Sequence[tuple[str, str]]) -> str:
+    return "".join(f' {name}="{value}"' for name, value in attrs)
+
+
+def _render_html(node: TreeNode) -> str:
+    if isinstance(node, TextSlot):
+        return _html_text(node.template, quote=False)
+    if isinstance(node, SubtreeSlot):
+        return f"{{{node.id}}}"
+    attrs = [(k, _html_text(v.template, quote=True)) for k, v in node.attrs]
+    inner = "".join(map(_render_html, node.children))
+    return _html_element(node.tag, _html_attrs(attrs), inner)
+
+
+def _html_element(tag: str, attrs: str, inner: str) -> str:
+    if not tag:
+        return inner
+    if tag in VOID_ELEMENTS:
+        return f"<{tag}{attrs}>"
+    return f"<{tag}{attrs}>{inner}</{tag}>"
+
+
+def _html_markup(node: Node) -> str:
+    if isinstance(node, str):
+        return escape(node, quote=False)
+    attrs = [(name, escape(value)) for name, value in node.attrs]
+    inner = "".join(map(_html_markup, node.children))
+    return _html_element(node.tag, _html_attrs(attrs), inner)
+
+
+def _escape_braces(text: str) -> str:
+    return PlainText(text).to_format_string()
+
+
+def _json_container(
+    tag: str,
+    inner: str,
+    quote: Callable[[str], str],
+) -> str:
+    if tag.startswith(JSON_MEMBER):
+        name = json.dumps(tag.removeprefix(JSON_MEMBER), ensure_ascii=False)
+        return f"{quote(name)}: {inner}"
+    opening, closing = JSON_BRACKETS.get(tag, ("", ""))
+    return f"{quote(opening)}{inner}{quote(closing)}"
+
+
+def _render_json(node: TreeNode) -> str:
+    if isinstance(node, TextSlot):
+        return node.template.to_format_string()
+    if isinstance(node, SubtreeSlot):
+        return f"{{{node.id}}}"
+    children = ", ".join(map(_render_json, node.children))
+    return _json_container(node.tag, children, _escape_braces)
+
+
+def _json_markup(node: Node) -> str:
+    if isinstance(node, str):
+        return node
+    children = ", ".join(map(_json_markup, node.children))
+    return _json_container(node.tag, children, str)
+
+
+@dataclass(frozen=True)
+class _Dialect:
+    render: Callable[[TreeNode], str]
+    markup: Callable[[Sequence[Node]], str]
+
+
+def _html_gap(nodes: Sequence[Node]) -> str:
+    return "".join(map(_html_markup, nodes))
+
+
+def _json_gap(nodes: Sequence[Node]) -> str:
+    return ", ".join(map(_json_markup, nodes))
+
+
+DIALECTS = {
+    "html": _Dialect(_render_html, _html_gap),
+    "json": _Dialect(_render_json, _json_gap),
+}
+
+
+@dataclass(frozen=True)
+class TreeResult:
+    """Result of analyzing tree-structured documents.
+
+    Attributes:
+        format: Format of the documents, ``"html"`` or ``"json"``.
+        root: Template tree. Its root element has an empty tag and holds
+            the top-level nodes.
+        columns: Value of every variable in every document.
+        count: Number of analyzed documents.
+
+    """
+
+    format: TreeFormat
+    root: ElementTemplate
+    columns: tuple[tuple[str, ...], ...]
+    count: int
+
+    @cached_property
+    def args(self) -> list[Chunks]:
+        """The values of the variables for each document."""
+        if not self.columns:
+            return [[] for _ in range(self.count)]
+        return [list(row) for row in zip(*self.columns, strict=True)]
+
+    def to_format_string(self) -> str:
+        """Render the template tree with ``{n}`` placeholders.
+
+        HTML is rendered with its text escaped, and without the dropped
+        comments. JSON is rendered with ``", "`` and ``": "`` separators;
+        a subtree variable that is empty in a document leaves a dangling
+        separator there.
+        """
+        return DIALECTS[self.format].render(self.root)
+
+
+@dataclass
+class _Builder:
+    """Derive a template tree from aligned nodes of every document."""
+
+    dialect: _Dialect
+    tokenizer: Tokenizer
+    backend: AlignmentBackend
+    columns: list[tuple[str, ...]] = field(default_factory=list)
+
+    def text(self, values: list[str]) -> TextSlot:
+        if len(set(values)) == 1:
+            # Most leaves of similar documents are shared: skip the diffs.
+            return TextSlot(
+                Template([PlainText(values[0])] if values[0] else []),
+            )
+        result = Analyzer._analyze_texts(
+            values,
+            tokenizer=self.tokenizer,
+            backend=self.backend,
+        )
+        template = _shift(result.template, len(self.columns))
+        self.columns.extend(result.columns)
+        return TextSlot(template)
+
+    def subtree(self, values: list[str]) -> SubtreeSlot:
+        self.columns.append(tuple(values))
+        return SubtreeSlot(len(self.columns) - 1)
+
+    def node(self, nodes: list[Node]) -> TreeNode:
+        first = nodes[0]
+        if isinstance(first, str):
+            return self.text([node for node in nodes if isinstance(node, str)])
+        return self.element(
+            first,
+            [n for n in nodes if isinstance(n, Element)],
+        )
+
+    def element(self, first: Element, nodes: list[Element]) -> ElementTemplate:
+        attrs = tuple(
+            (name, self.text([node.attrs[i][1] for node in nodes]))
+            for i, (name, _) in enumerate(first.attrs)
+        )
+        children = self.children([node.children for node in nodes])
+        return ElementTemplate(first.tag, attrs, tuple(children))
+
+    def children(self, children: list[tuple[Node, ...]]) -> list[TreeNode]:
+        """Template the aligned children, with a variable for every gap."""
+        starts = [0] * len(children)
+        built: list[TreeNode] = []
+        for column in _align_children(children, self.backend):
+            built.extend(self.gap(children, starts, column))
+            built.append(
+                self.node(
+                    [n[i] for n, i in zip(children, column, strict=True)],
+                ),
+            )
+            starts = [i + 1 for i in column]
+        ends = [len(nodes) for nodes in children]
+        built.extend(self.gap(children, starts, ends))
+        return built
+
+    def gap(
+        self,
+        children: list[tuple[Node, ...]],
+        starts: list[int],
+        stops: list[int],
+    ) -> list[SubtreeSlot]:
+        """Return a variable for the unaligned children, if there are any."""
+        gaps = [
+            nodes[a:b]
+            for nodes, a, b in zip(children, starts, stops, strict=True)
+        ]
+        if not any(gaps):
+            return []
+        return [self.subtree([self.dialect.markup(g) for g in gaps])]
+
+
+def _match_keys(
+    keys1: list[Key],
+    keys2: list[Key],
+    backend: AlignmentBackend,
+) -> list[Match]:
+    if keys1 == keys2:
+        return [Match(0, 0, len(keys1))]
+    return backend(keys1, keys2)
+
+
+def _align_children(
+    children: list[tuple[Node, ...]],
+    backend: AlignmentBackend,
+) -> list[list[int]]:
+    """Return the index of every child present in all documents, per column.
+
+    The children of the first document are matched against those of the
+    next ones by key, keeping only the children matched every time.
+    """
+    common = [[i] for i in range(len(children[0]))]
+    for nodes in children[1:]:
+        keys = [_key(children[0][column[0]]) for column in common]
+        blocks = _match_keys(keys, list(map(_key, nodes)), backend)
+        common = [
+            [*common[a + k], b + k]
+            for a, b, size in blocks
+            for k in range(size)
+        ]
+    return common
+
+
+def analyze_tree(
+    texts: list[str],
+    *,
+    fmt: TreeFormat = "html",
+    tokenizer: TokenizerLike = "char",
+    backend: BackendLike = "difflib",
+) -> TreeResult:
+    """Analyze HTML or JSON documents by their structure.
+
+    Every document is parsed into a tree. The children of each node are
+    aligned across the documents by their tag and attribute names, or
+    by being text, and only the text leaves and attribute values of the
+    aligned nodes are analyzed like ``analyze`` does. Alignment never
+    crosses a tag boundary, and each character-level analysis only sees
+    one short text per document instead of a whole page.
+
+    Children that are not present in every document become a subtree
+    variable whose value is their markup.
+
+    Args:
+        texts: Non-empty list of documents.
+        fmt: ``"html"`` (default) or ``"json"``.
+        tokenizer: Tokenizer for the text leaves; see ``analyze``.
+        backend: Alignment backend for both the children and the text
+            leaves; see ``analyze``.
+
+    Returns:
+        A TreeResult with the template tree and the args per document.
+
+    Raises:
+        ValueError: If texts is empty, the format or an option is invalid,
+            or a JSON document does not parse.
+
+    Example:
+        >>> result = analyze_tree(
+        ...     ["<li class='a'>Alice</li>", "<li class='b'>Bob</li>"],
+        ... )
+        >>> result.to_format_string()
+        '<li class="{0}">{1}</li>'
+        >>> result.args
+        [['a', 'Alice'], ['b', 'Bob']]
+
+    """
+    if not texts:
+        raise ValueError("texts are empty.")
+    if fmt not in PARSERS:
+        raise ValueError(
+            f"Unknown format {fmt!r}; expected one of {sorted(PARSERS)}.",
+        )
+    builder = _Builder(
+        DIALECTS[fmt],
+        resolve_tokenizer(tokenizer),
+        resolve_backend(backend),
+    )
+    root = builder.element(Element(""), list(map(PARSERS[fmt], texts)))
+    return TreeResult(fmt, root, tuple(builder.columns), len(texts))
@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from template_analysis import analyze, analyze_async, analyze_incremental
+
+TEXTS = [f"user={i} action=login" for i in range(10)]
+
+
+async def _produce(texts: list[str]) -> AsyncIterator[str]:
+    for text in texts:
+        await asyncio.sleep(0)
+        yield text
+
+
+def test_analyze_async_matches_analyze() -> None:
+    result = asyncio.run(analyze_async(_produce(TEXTS), batch_size=3))
+
+    assert result == analyze(TEXTS)
+
+
+def test_analyze_async_accepts_plain_iterables() -> None:
+    assert asyncio.run(analyze_async(TEXTS)) == analyze(TEXTS)
+
+
+def test_analyze_async_with_process_pool() -> None:
+    async def run() -> object:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            return await analyze_async(TEXTS, batch_size=4, executor=executor)
+
+    assert asyncio.run(run()) == analyze(TEXTS)
+
+
+def test_analyze_incremental_yields_after_every_batch() -> None:
+    async def collect() -> list[int]:
+        return [
+            len(result.args)
+            async for result in analyze_incremental(TEXTS, batch_size=4)
+        ]
+
+    assert asyncio.run(collect()) == [4, 8, 10]
+
+
+async def _recording(read: list[str]) -> AsyncIterator[str]:
+    for text in TEXTS:
+        read.append(text)
+        yield text
+
+
+def test_analyze_incremental_applies_backpressure() -> None:
+    read: list[str] = []
+
+    async def first() -> None:
+        results = analyze_incremental(_recording(read), batch_size=2)
+        await anext(results)
+        await results.aclose()
+
+    asyncio.run(first())
+
+    assert len(read) == 2
+
+
+async def _tick(ticks: list[int]) -> None:
+    while True:
+        ticks.append(1)
+        await asyncio.sleep(0)
+
+
+def test_analyze_async_keeps_the_loop_responsive() -> None:
+    texts = [f"{'x' * 200} {i} {'y' * 200}" for i in range(40)]
+    ticks: list[int] = []
+
+    async def run() -> None:
+        ticker = asyncio.create_task(_tick(ticks))
+        await analyze_async(texts, batch_size=10)
+        ticker.cancel()
+
+    asyncio.run(run())
+
+    assert len(ticks) > 1
+
+
+def test_analyze_async_errors() -> None:
+    with pytest.raises(ValueError, match="texts are empty"):
+        asyncio.run(analyze_async([]))
+    with pytest.raises(ValueError, match="batch_size must be at least 1"):
+        asyncio.run(analyze_async(TEXTS, batch_size=0))
+    with pytest.raises(ValueError, match="Too many texts"):
+        asyncio.run(analyze_async(TEXTS, max_texts=5))
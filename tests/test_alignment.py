@@ -0,0 +1,269 @@
+import pickle
+import random
+import unicodedata
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from template_analysis import alignment, analyze
+from template_analysis.alignment import (
+    AnchoredBackend,
+    BudgetBackend,
+    Match,
+    anchors_only,
+    comparisons,
+    difflib_blocks,
+    myers_blocks,
+    resolve_backend,
+)
+
+# Inputs of the analyzer tests: every backend must derive the same
+# templates and args from them.
+CORPUS = [
+    ["A dog is a good pet"],
+    ["A dog is a good pet", "A cat is a good pet"],
+    ["axb", "ab"],
+    ["ab", "axb"],
+    [
+        "A dog is a good pet",
+        "A cat is a good pet",
+        "A cat is a pretty pet",
+        "A bird is a great pet",
+    ],
+    ["abc123xyz", "abc456xyz", "abc456uvw"],
+    ["a " * 95 + "dog", "a " * 95 + "cat"],
+    ["{name} is a dog in {group}", "{name} is a cat in {group}"],
+    [
+        unicodedata.normalize("NFC", "café"),
+        unicodedata.normalize("NFD", "café"),
+    ],
+]
+
+
+def _lcs_length(seq1: Sequence[str], seq2: Sequence[str]) -> int:
+    prev = [0] * (len(seq2) + 1)
+    for x in seq1:
+        curr = [0]
+        for j, y in enumerate(seq2):
+            curr.append(prev[j] + 1 if x == y else max(prev[j + 1], curr[j]))
+        prev = curr
+    return prev[-1]
+
+
+def _assert_valid_blocks(
+    seq1: Sequence[str],
+    seq2: Sequence[str],
+    blocks: list[Match],
+) -> None:
+    assert blocks[-1] == (len(seq1), len(seq2), 0)
+    a = b = 0
+    for block in blocks[:-1]:
+        assert block.size > 0
+        assert block.a >= a
+        assert block.b >= b
+        assert (
+            seq1[block.a : block.a + block.size]
+            == (seq2[block.b : block.b + block.size])
+        )
+        a, b = block.a + block.size, block.b + block.size
+
+
+@pytest.mark.parametrize("texts", CORPUS)
+def test_backends_produce_equivalent_templates(texts: list[str]) -> None:
+    assert analyze(texts, backend="myers") == analyze(texts, backend="difflib")
+
+
+def test_myers_blocks_are_a_longest_common_subsequence() -> None:
+    rng = random.Random(0)  # noqa: S311
+    for _ in range(500):
+        seq1 = rng.choices("abc", k=rng.randint(0, 12))
+        seq2 = rng.choices("abc", k=rng.randint(0, 12))
+        blocks = myers_blocks(seq1, seq2)
+
+        _assert_valid_blocks(seq1, seq2, blocks)
+        assert sum(b.size for b in blocks) == _lcs_length(seq1, seq2)
+
+
+def test_myers_blocks_merges_prefix_and_suffix() -> None:
+    assert myers_blocks("abXcd", "abYcd") == [
+        Match(0, 0, 2),
+        Match(3, 3, 2),
+        Match(5, 5, 0),
+    ]
+    assert myers_blocks("", "") == [Match(0, 0, 0)]
+    assert myers_blocks("abc", "abc") == [Match(0, 0, 3), Match(3, 3, 0)]
+
+
+def test_myers_blocks_falls_back_to_difflib_on_many_edits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[tuple[Sequence[object], Sequence[object]]] = []
+
+    def spy(seq1: Sequence[object], seq2: Sequence[object]) -> list[Match]:
+        calls.append((seq1, seq2))
+        return difflib_blocks(seq1, seq2)
+
+    monkeypatch.setattr(alignment, "MYERS_MAX_EDITS", 3)
+    monkeypatch.setattr(alignment, "difflib_blocks", spy)
+
+    assert myers_blocks("pAbBcCdDq", "pwbxcydzq") == [
+        Match(0, 0, 1),
+        Match(2, 2, 1),
+        Match(4, 4, 1),
+        Match(6, 6, 1),
+        Match(8, 8, 1),
+        Match(9, 9, 0),
+    ]
+    assert calls == [("AbBcCdD", "wbxcydz")]
+    assert myers_blocks("pAbq", "pwbq") == [
+        Match(0, 0, 1),
+        Match(2, 2, 2),
+        Match(4, 4, 0),
+    ]
+    assert len(calls) == 1
+
+
+def test_difflib_blocks_keeps_frequent_elements() -> None:
+    seq1 = "a " * 150 + "x"
+    seq2 = "a " * 150 + "y"
+    assert difflib_blocks(seq1, seq2)[0] == Match(0, 0, 300)
+
+
+def test_analyze_with_callable_backend() -> None:
+    result = analyze(["a-b", "a-c"], backend=myers_blocks)
+    assert result.to_format_string() == "a-{0}"
+
+
+def test_analyze_backend_without_sentinel() -> None:
+    with pytest.raises(RuntimeError, match="must end with the sentinel"):
+        analyze(["ab", "ac"], backend=lambda _a, _b: [])
+
+
+def test_resolve_backend_unknown_name() -> None:
+    with pytest.raises(ValueError, match="Unknown backend 'lcs'"):
+        resolve_backend("lcs")
+
+
+@pytest.mark.parametrize("texts", CORPUS)
+def test_anchored_backend_matches_its_inner_backend(texts: list[str]) -> None:
+    backend = AnchoredBackend.create(anchor_size=2)
+
+    assert analyze(texts, backend=backend) == analyze(texts)
+
+
+def test_anchored_blocks_are_valid() -> None:
+    rng = random.Random(0)  # noqa: S311
+    backend = AnchoredBackend.create("myers", anchor_size=2)
+    for _ in range(500):
+        seq1 = rng.choices("abcdef", k=rng.randint(0, 30))
+        seq2 = rng.choices("abcdef", k=rng.randint(0, 30))
+
+        _assert_valid_blocks(seq1, seq2, backend(seq1, seq2))
+
+
+def test_anchored_backend_splits_at_unique_anchors() -> None:
+    backend = AnchoredBackend.create(anchor_size=3)
+
+    assert backend("a1bXYZc2d", "a3bXYZc4d") == [
+        Match(0, 0, 1),
+        Match(2, 2, 5),
+        Match(8, 8, 1),
+        Match(9, 9, 0),
+    ]
+
+
+def test_anchored_backend_aligns_segments_with_an_executor() -> None:
+    texts = ["key=1 " * 20 + "end=a", "key=1 " * 20 + "end=b"]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        backend = AnchoredBackend.create(anchor_size=4, executor=executor)
+
+        assert analyze(texts, backend=backend) == analyze(texts)
+
+
+def test_anchored_backend_pickles_without_its_executor() -> None:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        backend = AnchoredBackend.create("myers", executor=executor)
+
+        restored = pickle.loads(pickle.dumps(backend))  # noqa: S301
+
+    assert restored == backend
+    assert restored.executor is None
+    assert repr(restored) == "AnchoredBackend(myers_blocks, anchor_size=8)"
+
+
+def test_anchored_backend_rejects_small_anchors() -> None:
+    with pytest.raises(ValueError, match="anchor_size must be at least 1"):
+        AnchoredBackend.create(anchor_size=0)
+
+
+def test_analyze_with_anchored_backend_name() -> None:
+    texts = ["A dog is a good pet", "A cat is a good pet"]
+
+    assert analyze(texts, backend="anchored") == analyze(texts)
+
+
+def test_anchors_only_matches_prefix_suffix_and_anchors() -> None:
+    # Only whole anchors of four characters are matched between the
+    # common prefix and suffix.
+    seq1 = "GET /a HTTP/1.1 200 OK"
+    seq2 = "GET /bb HTTP/1.1 404 OK"
+
+    assert anchors_only(seq1, seq2) == [
+        Match(0, 0, 5),
+        Match(6, 7, 8),
+        Match(19, 20, 3),
+        Match(22, 23, 0),
+    ]
+
+
+def test_comparisons_counts_pairs_of_equal_elements() -> None:
+    assert comparisons("aab", "abb") == 4
+    assert comparisons("abc", "") == 0
+
+
+def test_budget_backend_within_budget_uses_inner() -> None:
+    backend = BudgetBackend.create(
+        difflib_blocks,
+        seconds=60,
+        max_comparisons=100,
+    )
+
+    assert backend.select("abc", "abd") == (difflib_blocks, False)
+
+
+@pytest.mark.parametrize(
+    ("seconds", "max_comparisons"),
+    [(0, None), (None, 3), (60, 3)],
+)
+def test_budget_backend_beyond_budget_uses_fallback(
+    seconds: float | None,
+    max_comparisons: int | None,
+) -> None:
+    backend = BudgetBackend.create(
+        difflib_blocks,
+        seconds=seconds,
+        max_comparisons=max_comparisons,
+    )
+
+    assert backend.select("abcd", "abcd") == (anchors_only, True)
+
+
+@pytest.mark.parametrize(
+    ("seconds", "max_comparisons", "message"),
+    [
+        (-1, None, "budget must be at least 0"),
+        (None, 0, "max_comparisons must be at least 1"),
+    ],
+)
+def test_budget_backend_rejects(
+    seconds: float | None,
+    max_comparisons: int | None,
+    message: str,
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        BudgetBackend.create(
+            difflib_blocks,
+            seconds=seconds,
+            max_comparisons=max_comparisons,
+        )
@@ -1,8 +1,10 @@
+import random
+import re
 import unicodedata
 
 import pytest
 
-from template_analysis import analyze
+from template_analysis import MergeOrder, StreamingAnalyzer, analyze
 
 
 def test_analyzer_analyze_0_text() -> None:
@@ -167,3 +169,272 @@ def test_analyzer_max_texts_none() -> None:
     ]
     result = analyze(texts, max_texts=None)
     assert len(result.args) == 3
+
+
+def test_analyzer_word_tokenizer_keeps_words_whole() -> None:
+    texts = ["The dog barks", "The frog barks"]
+
+    assert analyze(texts).to_format_string() == "The {0}og barks"
+
+    result = analyze(texts, tokenizer="word")
+    assert result.to_format_string() == "The {0} barks"
+    assert result.args[0] == ["dog"]
+    assert result.args[1] == ["frog"]
+
+
+def test_analyzer_regex_tokenizer() -> None:
+    texts = ["id=12;ok", "id=13;ok", "id=7;ng"]
+    result = analyze(texts, tokenizer=re.compile(r"\d+|;"))
+
+    assert result.to_format_string() == "id={0};{1}"
+    assert result.args[2] == ["7", "ng"]
+
+
+def test_analyzer_callable_tokenizer() -> None:
+    result = analyze(
+        ["a-b-c", "a-x-c"],
+        tokenizer=lambda text: re.split(r"(-)", text),
+    )
+
+    assert result.to_format_string() == "a-{0}-c"
+    assert result.args == [["b"], ["x"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyzer_tree_merge_order(workers: int) -> None:
+    texts = [
+        "A dog is a good pet",
+        "A cat is a good pet",
+        "A cat is a pretty pet",
+        "A bird is a great pet",
+        "A fish is a nice pet",
+    ]
+    result = analyze(texts, merge_order="tree", workers=workers)
+
+    assert result.to_format_string() == "A {0} is a {1} pet"
+    assert result.args == [
+        ["dog", "good"],
+        ["cat", "good"],
+        ["cat", "pretty"],
+        ["bird", "great"],
+        ["fish", "nice"],
+    ]
+    assert result == analyze(texts)
+
+
+def test_analyzer_tree_merge_order_single_text() -> None:
+    result = analyze(["only"], merge_order="tree", workers=2)
+    assert result.to_format_string() == "only"
+    assert result.args == [[]]
+
+
+def test_analyzer_invalid_merge_order() -> None:
+    with pytest.raises(ValueError, match="Unknown merge_order 'random'"):
+        analyze(["a", "b"], merge_order="random")  # type: ignore[arg-type]
+
+
+def test_analyzer_invalid_workers() -> None:
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        analyze(["a", "b"], merge_order="tree", workers=0)
+
+
+@pytest.mark.parametrize("merge_order", ["sequential", "similarity"])
+def test_analyzer_workers_need_tree_merge_order(
+    merge_order: MergeOrder,
+) -> None:
+    with pytest.raises(ValueError, match="needs merge_order='tree'"):
+        analyze(["a", "b"], merge_order=merge_order, workers=2)
+
+
+def test_analyzer_result_tables() -> None:
+    result = analyze(["A dog is a good pet", "A cat is a good pet"])
+    (symbol,) = result.symbols
+
+    assert [table.lookup(symbol) for table in result.tables] == ["dog", "cat"]
+
+
+def test_analyzer_result_row_and_column() -> None:
+    result = analyze(["A dog is good", "A cat is nice", "A bird is calm"])
+
+    assert result.row(1) == ["cat", "nice"]
+    assert result.row(-1) == ["bird", "calm"]
+    assert result.column(0) == ("dog", "cat", "bird")
+    assert result.column(1) == ("good", "nice", "calm")
+    with pytest.raises(IndexError):
+        result.row(3)
+
+
+def test_analyzer_result_caches_derived_values() -> None:
+    result = analyze(["A dog is a good pet", "A cat is a good pet"])
+
+    assert result.args is result.args
+    assert result.template is result.template
+    assert hash(result) == hash(
+        analyze(["A dog is a good pet", "A cat is a good pet"]),
+    )
+
+
+def test_analyzer_result_spans() -> None:
+    texts = ["A dog is good", "A zebra is nice", "A cat is calm"]
+    result = analyze(texts)
+
+    assert result.sources == tuple(texts)
+    for var_id in range(len(result.symbols)):
+        starts, ends = result.spans(var_id)
+        assert [
+            source[start:end]
+            for source, start, end in zip(texts, starts, ends, strict=True)
+        ] == list(result.column(var_id))
+
+
+def test_analyzer_result_spans_are_independent_of_later_merges() -> None:
+    stream = StreamingAnalyzer.create()
+    stream.feed_many(["A dog", "A cat"])
+    starts, _ = stream.snapshot().spans(0)
+    stream.feed("A bird")
+
+    assert starts.tolist() == [2, 2]
+    assert stream.snapshot().spans(0)[0].tolist() == [2, 2, 2]
+
+
+def test_analyzer_sample_size_verifies_the_rest() -> None:
+    texts = [f"user={i} action=login" for i in range(50)]
+
+    result = analyze(texts, sample_size=5)
+
+    assert result.to_format_string() == "user={0} action=login"
+    assert result.args == [[str(i)] for i in range(50)]
+
+
+def test_analyzer_sample_size_refines_with_unmatched_texts() -> None:
+    texts = ["id=1 ok"] * 20 + ["id=2 ok extra"] + ["id=3 ok"] * 20
+
+    result = analyze(texts, sample_size=3, seed=1)
+
+    assert result.to_format_string() == "id={0} ok{1}"
+    assert result.args[0] == ["1", ""]
+    assert result.args[20] == ["2", " extra"]
+    assert len(result.args) == len(texts)
+
+
+def test_analyzer_sample_size_larger_than_texts() -> None:
+    texts = ["A dog is good", "A cat is nice"]
+
+    assert analyze(texts, sample_size=10) == analyze(texts)
+
+
+def test_analyzer_invalid_sample_size() -> None:
+    with pytest.raises(ValueError, match="sample_size must be at least 1"):
+        analyze(["a", "b"], sample_size=0)
+
+
+def test_analyzer_similarity_merge_order_keeps_row_order() -> None:
+    texts = [
+        "GET /index.html 200",
+        "disk sda1 is full",
+        "GET /about.html 404",
+        "disk sdb2 is full",
+        "GET /login.html 200",
+    ]
+
+    result = analyze(texts, merge_order="similarity", tokenizer="word")
+
+    assert result.to_format_string() == "{0} {1} {2}"
+    assert result.args == [text.split(" ", 2) for text in texts]
+
+
+def test_analyzer_similarity_merge_order_matches_similar_texts() -> None:
+    texts = [
+        "A dog is a good pet",
+        "A cat is a good pet",
+        "A bird is a great pet",
+    ]
+
+    result = analyze(texts, merge_order="similarity")
+
+    assert result == analyze(texts)
+    assert analyze(["only"], merge_order="similarity").args == [[]]
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_analyzer_bytes_texts(wrap: type) -> None:
+    texts = [wrap(b"id=7 caf\xc3\xa9"), wrap(b"id=42 caf\xc3\xa9")]
+
+    result = analyze(texts)
+
+    assert result.byte_args == [[b"7"], [b"42"]]
+    assert result.byte_column(0) == (b"7", b"42")
+    assert result.args == [["7"], ["42"]]
+    assert result.sources[0] == "id=7 cafÃ©"
+
+
+@pytest.mark.parametrize("merge_order", ["tree", "similarity"])
+def test_analyzer_bytes_texts_with_merge_orders(
+    merge_order: MergeOrder,
+) -> None:
+    texts = [b"GET /a 200", b"GET /bb 404", b"GET /c 200"]
+
+    result = analyze(texts, merge_order=merge_order, sample_size=2)
+
+    assert result.byte_args == analyze(texts).byte_args
+    assert result.table.binary
+
+
+def test_analyzer_byte_args_of_str_texts_are_utf8() -> None:
+    result = analyze(["café 1", "café é"])
+
+    assert result.byte_args == [[b"1"], ["é".encode()]]
+
+
+def test_analyzer_rejects_mixed_str_and_bytes() -> None:
+    with pytest.raises(ValueError, match="texts mix str and bytes"):
+        analyze(["a", b"b"])
+
+
+def test_analyzer_is_exact_within_budget() -> None:
+    texts = ["A dog is a good pet", "A cat is a good pet"]
+    result = analyze(texts, budget=60, max_comparisons=10_000)
+
+    assert not result.approximate
+    assert result == analyze(texts)
+
+
+@pytest.mark.parametrize("merge_order", ["sequential", "tree", "similarity"])
+def test_analyzer_approximates_beyond_budget(merge_order: MergeOrder) -> None:
+    texts = ["GET /a HTTP/1.1 OK", "GET /bb HTTP/1.1 OK", "GET /c HTTP/1.1 OK"]
+    result = analyze(texts, budget=0, merge_order=merge_order)
+
+    assert result.approximate
+    assert result.to_format_string() == "GET /{0} HTTP/1.1 OK"
+    assert result.args == [["a"], ["bb"], ["c"]]
+    assert result != analyze(texts, merge_order=merge_order)
+
+
+def test_analyzer_approximates_large_merges() -> None:
+    rng = random.Random(0)  # noqa: S311
+    texts = ["".join(rng.choices("ab", k=2000)) for _ in range(3)]
+    result = analyze(texts, max_comparisons=100_000)
+
+    assert result.approximate
+    matcher = result.template.compile()
+    assert all(matcher.match(text) is not None for text in texts)
+
+
+def test_analyzer_approximate_flag_survives_workers_and_sampling() -> None:
+    texts = [f"id={i} ok" for i in range(8)]
+
+    assert analyze(texts, budget=0, merge_order="tree", workers=2).approximate
+    assert analyze(texts, budget=0, sample_size=3).approximate
+
+
+@pytest.mark.parametrize(
+    ("budget", "max_comparisons", "message"),
+    [(-1.0, None, "budget"), (None, 0, "max_comparisons")],
+)
+def test_analyzer_rejects_invalid_budget(
+    budget: float | None,
+    max_comparisons: int | None,
+    message: str,
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        analyze(["a", "b"], budget=budget, max_comparisons=max_comparisons)
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.corpus import CORPORA, Shape
+from benchmarks.runner import Case, load_baseline, measure, save_baseline
+from template_analysis import analyze
+
+
+@pytest.mark.parametrize("corpus", sorted(CORPORA))
+def test_corpus_is_deterministic(corpus: str) -> None:
+    shape = Shape(count=5, fields=4)
+
+    texts = CORPORA[corpus](shape)
+
+    assert len(texts) == 5
+    assert texts == CORPORA[corpus](shape)
+    assert texts != CORPORA[corpus](Shape(count=5, fields=4, seed=1))
+
+
+def test_corpus_density_controls_variables() -> None:
+    constant = CORPORA["csv"](Shape(count=5, density=0.0))
+    varying = CORPORA["csv"](Shape(count=5, density=1.0))
+
+    assert len(set(constant)) == 1
+    assert len(analyze(varying).symbols) >= 1
+
+
+def test_corpus_alphabet() -> None:
+    texts = CORPORA["csv"](Shape(count=5, alphabet=2))
+
+    assert set("".join(texts)) <= {"a", "b", ","}
+    with pytest.raises(ValueError, match="alphabet must be between"):
+        Shape(alphabet=0)
+
+
+def test_measure_and_baseline_roundtrip(tmp_path: Path) -> None:
+    measurement = measure(Case("log", Shape(count=3, fields=2), "difflib"))
+    path = tmp_path / "baseline.json"
+
+    save_baseline(path, [measurement])
+
+    assert measurement.seconds > 0
+    assert measurement.peak_bytes > 0
+    assert load_baseline(path) == {measurement.name: measurement}
+    assert load_baseline(tmp_path / "missing.json") == {}
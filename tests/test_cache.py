@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import pytest
+
+from template_analysis import AnalysisCache, AnalyzerStats, MergeOrder, analyze
+
+TEXTS = [f"user={i} action={'in' if i % 2 else 'out'}" for i in range(12)]
+
+
+def test_cache_returns_cached_result() -> None:
+    cache = AnalysisCache.create()
+
+    first = cache.analyze(TEXTS)
+    second = cache.analyze(TEXTS)
+
+    assert first == analyze(TEXTS)
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_resumes_from_shared_prefix() -> None:
+    cache = AnalysisCache.create()
+    cache.analyze(TEXTS[:10])
+    stats = AnalyzerStats()
+
+    result = cache.analyze(TEXTS, stats=stats)
+
+    assert result == analyze(TEXTS)
+    assert len(stats.merges) == 2
+
+
+def test_cache_resumes_from_power_of_two_checkpoint() -> None:
+    cache = AnalysisCache.create()
+    cache.analyze([*TEXTS[:9], "something else"])
+    stats = AnalyzerStats()
+
+    result = cache.analyze(TEXTS, stats=stats)
+
+    assert result == analyze(TEXTS)
+    assert len(stats.merges) == len(TEXTS) - 8
+
+
+def test_cache_keys_include_options() -> None:
+    cache = AnalysisCache.create()
+    cache.analyze(TEXTS)
+
+    result = cache.analyze(TEXTS, tokenizer="word")
+
+    assert result == analyze(TEXTS, tokenizer="word")
+    assert cache.misses == 2
+
+
+def test_cache_normalizes_texts() -> None:
+    cache = AnalysisCache.create()
+    cache.analyze(["café 1", "café 2"])
+
+    cache.analyze(["café 1", "café 2"])
+
+    assert cache.hits == 1
+
+
+def test_cache_tree_merge_order_is_cached_whole() -> None:
+    cache = AnalysisCache.create()
+    cache.analyze(TEXTS, merge_order="tree")
+
+    result = cache.analyze(TEXTS, merge_order="tree")
+
+    assert result == analyze(TEXTS, merge_order="tree")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_on_disk_survives_new_instances(tmp_path: Path) -> None:
+    AnalysisCache.create(tmp_path).analyze(TEXTS)
+    cache = AnalysisCache.create(tmp_path)
+
+    result = cache.analyze(TEXTS)
+
+    assert result == analyze(TEXTS)
+    assert cache.hits == 1
+
+
+def test_cache_on_disk_ignores_corrupt_files(tmp_path: Path) -> None:
+    AnalysisCache.create(tmp_path).analyze(TEXTS)
+    for path in tmp_path.iterdir():
+        data = bytearray(path.read_bytes())
+        data[5] = 0xFF
+        path.write_bytes(bytes(data))
+    cache = AnalysisCache.create(tmp_path)
+
+    assert cache.analyze(TEXTS) == analyze(TEXTS)
+    assert cache.misses == 1
+
+
+def test_cache_bounds_memory_and_disk(tmp_path: Path) -> None:
+    cache = AnalysisCache.create(tmp_path, max_entries=2, max_bytes=600)
+
+    cache.analyze(TEXTS)
+
+    assert len(cache.memory.entries) == 2
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 600
+
+
+def test_cache_rejects_empty_texts() -> None:
+    with pytest.raises(ValueError, match="texts are empty"):
+        AnalysisCache.create().analyze([])
+
+
+def test_cache_rejects_options_without_a_stable_name() -> None:
+    cache = AnalysisCache.create()
+
+    def local(text: str) -> tuple[str, ...]:
+        return tuple(text)
+
+    for tokenizer in [lambda text: tuple(text), lambda text: (text,), local]:
+        with pytest.raises(ValueError, match="no stable name"):
+            cache.analyze(TEXTS, tokenizer=tokenizer)
+
+
+def test_cache_accepts_bytes_texts() -> None:
+    cache = AnalysisCache.create()
+    data = [text.encode() for text in TEXTS]
+    cache.analyze(TEXTS)
+
+    result = cache.analyze(data)
+
+    assert result == analyze(data)
+    assert cache.analyze(data) is result
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_rejects_mixed_texts() -> None:
+    with pytest.raises(ValueError, match="mix str and bytes"):
+        AnalysisCache.create().analyze(["a", b"b"])
+
+
+@pytest.mark.parametrize("merge_order", ["sequential", "tree"])
+def test_cache_forwards_budget(merge_order: MergeOrder) -> None:
+    cache = AnalysisCache.create()
+    exact = cache.analyze(TEXTS, merge_order=merge_order)
+
+    result = cache.analyze(TEXTS, merge_order=merge_order, budget=0)
+
+    assert not exact.approximate
+    assert result.approximate
+    assert cache.misses == 2
+    assert cache.analyze(
+        TEXTS,
+        merge_order=merge_order,
+        max_comparisons=1,
+    ).approximate
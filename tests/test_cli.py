@@ -0,0 +1,116 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from template_analysis.cli import main
+
+LINES = ["A dog is a good pet", "A cat is a good pet", "A cat is a pretty pet"]
+
+
+def _rows(output: str) -> list[dict[str, object]]:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    path = tmp_path / "corpus.txt"
+    path.write_text("\n".join(LINES) + "\n")
+    return path
+
+
+def test_cli_analyze_file(
+    corpus: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert main(["analyze", str(corpus)]) == 0
+
+    assert _rows(capsys.readouterr().out) == [
+        {"template": "A {0} is a {1} pet"},
+        {"index": 0, "args": ["dog", "good"]},
+        {"index": 1, "args": ["cat", "good"]},
+        {"index": 2, "args": ["cat", "pretty"]},
+    ]
+
+
+def test_cli_analyze_stdin_with_workers(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(LINES)))
+
+    main(["analyze", "--workers", "2", "--batch-size", "2"])
+
+    rows = _rows(capsys.readouterr().out)
+    assert rows[0] == {"template": "A {0} is a {1} pet"}
+    assert [row["args"] for row in rows[1:]] == [
+        ["dog", "good"],
+        ["cat", "good"],
+        ["cat", "pretty"],
+    ]
+
+
+def test_cli_analyze_max_texts(
+    corpus: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    with pytest.raises(SystemExit) as exit_info:
+        main(["analyze", "--max-texts", "2", str(corpus)])
+
+    assert exit_info.value.code == 1
+    captured = capsys.readouterr()
+    assert "Too many texts" in captured.err
+    assert "--max-texts" in captured.err
+    assert "analyze_spilled" not in captured.err
+    assert captured.out == ""
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_analyze_within_max_texts(
+    corpus: Path,
+    capsys: pytest.CaptureFixture[str],
+    workers: str,
+) -> None:
+    argv = ["analyze", "--max-texts", "3", "--workers", workers, str(corpus)]
+
+    assert main(argv) == 0
+    assert len(_rows(capsys.readouterr().out)) == 4
+
+
+def test_cli_extract_saved_template(
+    corpus: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    template = tmp_path / "template.tpla"
+    main(["analyze", str(corpus), "--save-template", str(template)])
+    capsys.readouterr()
+    monkeypatch.setattr(
+        "sys.stdin",
+        io.StringIO("A fox is a calm pet\nnope\n"),
+    )
+
+    main(["extract", str(template), "--unmatched"])
+    main(["extract", str(template), str(corpus), "--workers", "2"])
+
+    rows = _rows(capsys.readouterr().out)
+    assert rows[:2] == [
+        {"file": "-", "line": 0, "args": ["fox", "calm"]},
+        {"file": "-", "line": 1, "args": None},
+    ]
+    assert [row["args"] for row in rows[2:]] == [
+        ["dog", "good"],
+        ["cat", "good"],
+        ["cat", "pretty"],
+    ]
+
+
+def test_cli_rejects_invalid_workers(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    with pytest.raises(SystemExit):
+        main(["analyze", "--workers", "0"])
+
+    assert "must be at least 1" in capsys.readouterr().err
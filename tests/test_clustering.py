@@ -0,0 +1,74 @@
+import pytest
+
+from template_analysis.clustering import ClusterIndex, analyze_clusters
+
+
+def test_analyze_clusters_separates_templates() -> None:
+    texts = [
+        "connected to 10.0.0.1 port 22",
+        "disk sda1 is 91% full",
+        "connected to 10.0.0.7 port 8080",
+        "disk sdb2 is 45% full",
+    ]
+    result = analyze_clusters(texts)
+
+    assert result.membership == (0, 1, 0, 1)
+    assert result.members(1) == [1, 3]
+    assert [r.to_format_string() for r in result.results] == [
+        "connected to 10.0.0.{0} port {1}",
+        "disk sd{0} is {1}% full",
+    ]
+    assert result.results[1].args == [["a1", "91"], ["b2", "45"]]
+
+
+def test_analyze_clusters_tokenizer() -> None:
+    texts = ["user alice logged in", "user bob logged in"]
+    result = analyze_clusters(texts, tokenizer="word")
+
+    assert result.results[0].to_format_string() == "user {0} logged in"
+
+
+def test_analyze_clusters_similarity_threshold() -> None:
+    texts = ["a b c d", "a x y z"]
+
+    assert analyze_clusters(texts, similarity=0.25, depth=1).membership == (
+        0,
+        0,
+    )
+    assert analyze_clusters(texts, similarity=0.5, depth=1).membership == (
+        0,
+        1,
+    )
+
+
+@pytest.mark.parametrize("depth", [1, 2])
+def test_analyze_clusters_ignores_separators(depth: int) -> None:
+    texts = [
+        "user alice deleted file",
+        "user bob created dir",
+        "user carol renamed link",
+    ]
+
+    result = analyze_clusters(texts, depth=depth)
+
+    assert result.membership == (0, 1, 2)
+
+
+def test_analyze_clusters_empty() -> None:
+    with pytest.raises(ValueError, match="texts are empty"):
+        analyze_clusters([])
+
+
+def test_analyze_clusters_invalid_similarity() -> None:
+    with pytest.raises(ValueError, match="similarity must be between"):
+        analyze_clusters(["a"], similarity=1.5)
+
+
+def test_cluster_index_groups_by_length_and_prefix() -> None:
+    index = ClusterIndex(similarity=0.0, depth=1)
+
+    assert index.insert(0, ["GET", " ", "/a"]) == 0
+    assert index.insert(1, ["GET", " ", "/b"]) == 0
+    assert index.insert(2, ["PUT", " ", "/a"]) == 1
+    assert index.insert(3, ["GET", " ", "/a", "?"]) == 2
+    assert index.clusters[0].pattern == ["GET", " ", None]
@@ -0,0 +1,123 @@
+import pickle
+from array import array
+
+import pytest
+
+from template_analysis.columns import Column, SpanTable, constant, shift
+from template_analysis.symbol import Symbol
+
+
+def test_column_extend_latest_view_appends_in_place() -> None:
+    column = Column.of([1, 2])
+    extended = column.extend(Column.of([3]))
+
+    assert extended.buffer is column.buffer
+    assert list(extended) == [1, 2, 3]
+    assert list(column) == [1, 2]
+    assert len(column) == 2
+
+
+def test_column_extend_older_view_copies() -> None:
+    column = Column.of([1, 2])
+    newer = column.extend(Column.of([3]))
+    branch = column.extend(Column.of([4]))
+
+    assert branch.buffer is not column.buffer
+    assert list(newer) == [1, 2, 3]
+    assert list(branch) == [1, 2, 4]
+
+
+def test_column_getitem_is_bounded_by_view() -> None:
+    column = Column.of([1, 2])
+    column.extend(Column.of([3]))
+
+    assert column[1] == 2
+    with pytest.raises(IndexError):
+        column[2]
+
+
+def test_column_pickles_only_its_view() -> None:
+    column = Column.of(array("q", [1, 2]))
+    column.extend(Column.of(array("q", [3])))
+
+    restored = pickle.loads(pickle.dumps(column))  # noqa: S301
+
+    assert list(restored) == [1, 2]
+    assert len(restored.buffer) == 2
+
+
+def test_constant_and_shift() -> None:
+    column = constant(5, 3)
+
+    assert list(column) == [5, 5, 5]
+    assert shift(column, 0) is column
+    assert list(shift(column, -2)) == [3, 3, 3]
+
+
+def test_span_table_select_and_concat() -> None:
+    s1 = Symbol.create()
+    s2 = Symbol.create()
+    left = SpanTable.from_source("A dog!")
+    right = SpanTable.from_source("A cat!")
+
+    # "A " [d o g] "!" -> "A " s1 "!"
+    table = left.select(list("A dog!"), [(s1, 2, 5)]).concat(
+        right.select(list("A cat!"), [(s1, 2, 5)]),
+    )
+    assert table.column(s1) == ("dog", "cat")
+
+    # "A " s1 "!" -> s2 covering "A " s1
+    text = ["A", " ", s1, "!"]
+    selected = table.select(text, [(s2, 0, 3)])
+    assert selected.column(s2) == ("A dog", "A cat")
+
+
+def test_span_table_select_shares_unchanged_columns() -> None:
+    s1 = Symbol.create()
+    s2 = Symbol.create()
+    table = SpanTable.from_source("xay").select(list("xay"), [(s1, 1, 2)])
+
+    selected = table.select(["x", s1, "y"], [(s2, 1, 2)])
+
+    assert selected.columns[s2] == table.columns[s1]
+    assert selected.column(s2) == ("a",)
+
+
+def test_span_table_select_keeps_surviving_symbols() -> None:
+    s1 = Symbol.create()
+    s2 = Symbol.create()
+    table = SpanTable.from_source("xay").select(list("xay"), [(s1, 1, 2)])
+
+    # "x" s1 "y" -> s2 s1 "y"
+    selected = table.select(["x", s1, "y"], [(s2, 0, 1)], [s1])
+
+    assert selected.columns[s1] == table.columns[s1]
+    assert selected.column(s1) == ("a",)
+    assert selected.column(s2) == ("x",)
+
+
+def test_span_table_select_literal_after_symbol() -> None:
+    s1 = Symbol.create()
+    s2 = Symbol.create()
+    table = SpanTable.from_source("ab-cd").select(list("ab-cd"), [(s1, 0, 2)])
+
+    # s1 "-" "c" "d" -> s1 "-" s2
+    selected = table.select([s1, "-", "c", "d"], [(s1, 0, 1), (s2, 2, 4)])
+
+    assert selected.column(s1) == ("ab",)
+    assert selected.column(s2) == ("cd",)
+
+
+def test_span_table_take_reorders_rows() -> None:
+    s1 = Symbol.create()
+    table = SpanTable.from_spans(
+        ["id=1", "id=22", "id=333"],
+        [s1],
+        [[(3, 4)], [(3, 5)], [(3, 6)]],
+    )
+
+    taken = table.take([2, 0])
+
+    assert list(taken.sources) == ["id=333", "id=1"]
+    assert taken.column(s1) == ("333", "1")
+    assert table.column(s1) == ("1", "22", "333")
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from template_analysis import extract
+from template_analysis.extract import extract_columns, extract_file
+from template_analysis.symbol import Chunks
+from template_analysis.template import PlainText, Template, Variable
+
+TEMPLATE = Template(
+    [PlainText("user="), Variable(0), PlainText(" id="), Variable(1)],
+)
+
+
+def test_extract_file(tmp_path: Path) -> None:
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"user=alice id=1\r\nnoise\nuser=b\xc3\xb6b id=22\n")
+
+    assert list(extract_file(path, TEMPLATE)) == [
+        ["alice", "1"],
+        None,
+        ["b\xf6b", "22"],
+    ]
+
+
+def test_extract_file_without_trailing_newline(tmp_path: Path) -> None:
+    path = tmp_path / "log.txt"
+    path.write_text("user=a id=1\nuser=b id=2")
+
+    assert list(extract_file(path, TEMPLATE)) == [["a", "1"], ["b", "2"]]
+
+
+def test_extract_file_empty(tmp_path: Path) -> None:
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    assert list(extract_file(path, TEMPLATE)) == []
+
+
+def test_extract_file_sharded_keeps_line_order(tmp_path: Path) -> None:
+    path = tmp_path / "log.txt"
+    lines = [f"user=u{i} id={i}" if i % 7 else "skip" for i in range(200)]
+    path.write_text("\n".join(lines) + "\n")
+
+    serial = list(extract_file(path, TEMPLATE))
+    sharded = list(extract_file(path, TEMPLATE, workers=3))
+
+    assert sharded == serial
+    assert len(serial) == 200
+    assert serial[1] == ["u1", "1"]
+    assert serial[7] is None
+
+
+def test_extract_file_sharded_bounds_shard_size(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(extract, "SHARD_BYTES", 64)
+    path = tmp_path / "log.txt"
+    path.write_text("".join(f"user=u{i} id={i}\n" for i in range(200)))
+
+    size = path.stat().st_size
+    assert extract._shard_count(size, 2) > 2 * extract.SHARDS_PER_WORKER
+    assert list(extract_file(path, TEMPLATE, workers=2)) == list(
+        extract_file(path, TEMPLATE),
+    )
+
+
+def test_map_bounded_limits_shards_in_flight() -> None:
+    submitted: list[int] = []
+
+    def task(start: int, end: int) -> list[Chunks | None]:
+        submitted.append(start)
+        return [[str(start)]] * (end - start)
+
+    shards = [(i, i + 1) for i in range(10)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rows = extract._map_bounded(executor, task, shards, 3)
+        assert next(rows) == ["0"]
+        # The first shard was yielded and one more was submitted.
+        assert len(submitted) <= 4
+        assert list(rows) == [[str(i)] for i in range(1, 10)]
+
+
+def test_extract_file_invalid_workers(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        extract_file(tmp_path / "log.txt", TEMPLATE, workers=0)
+
+
+def test_extract_columns(tmp_path: Path) -> None:
+    path = tmp_path / "log.txt"
+    path.write_text("user=a id=1\nnoise\nuser=b id=2\n")
+
+    extracted = extract_columns(path, TEMPLATE)
+
+    assert extracted.lines == [0, 2]
+    assert extracted.columns == [["a", "b"], ["1", "2"]]
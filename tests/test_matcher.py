@@ -0,0 +1,73 @@
+import unicodedata
+
+from template_analysis import analyze
+from template_analysis.matcher import TemplateMatcher, scan_spans
+
+
+def test_matcher_extracts_args_of_analyzed_template() -> None:
+    result = analyze(["A dog is a good pet", "A cat is a good pet"])
+    matcher = result.template.compile()
+
+    assert matcher.variables == 1
+    assert matcher.match("A bird is a good pet") == ["bird"]
+    assert matcher.match("A bird is a great pet") is None
+
+
+def test_matcher_without_variables() -> None:
+    matcher = TemplateMatcher(("fixed",))
+
+    assert matcher.match("fixed") == []
+    assert matcher.match("fixed!") is None
+    assert matcher.match("fix") is None
+
+
+def test_matcher_prefix_and_suffix_are_anchored() -> None:
+    matcher = TemplateMatcher(("<", ">"))
+
+    assert matcher.match("<a>b>") == ["a>b"]
+    assert matcher.match("x<a>") is None
+    assert matcher.match("<a>x") is None
+    assert matcher.match("<") is None
+
+
+def test_matcher_leftmost_anchoring() -> None:
+    matcher = TemplateMatcher(("", "=", ";", ""))
+
+    assert matcher.match("a=b=c;d;") == ["a", "b=c", "d;"]
+
+
+def test_matcher_adjacent_variables() -> None:
+    matcher = TemplateMatcher(("a", "", "b"))
+
+    assert matcher.match("axyb") == ["", "xy"]
+
+
+def test_matcher_suffix_longer_than_text() -> None:
+    matcher = TemplateMatcher(("", ":", "suffix"))
+
+    assert matcher.match("a:b") is None
+    assert matcher.partial_match("a:b") == []
+
+
+def test_matcher_partial_match() -> None:
+    matcher = TemplateMatcher(("id=", ";name=", ";age=", ""))
+
+    assert matcher.partial_match("id=1;name=bob;age=3") == ["1", "bob", "3"]
+    assert matcher.partial_match("id=1;name=bob") == ["1"]
+    assert matcher.partial_match("no=1") == []
+
+
+def test_matcher_spans_index_normalized_text() -> None:
+    matcher = TemplateMatcher(("caf", "!"))
+    text = unicodedata.normalize("NFD", "café!")
+
+    assert matcher.match_spans(text) == [(3, 4)]
+    assert matcher.match(text) == ["é"]
+
+
+def test_scan_spans_on_bytes_range() -> None:
+    haystack = b"xx[a]yy"
+    spans, matched = scan_spans(haystack, [b"[", b"]"], 2, 5)
+
+    assert matched
+    assert spans == [(3, 4)]
@@ -0,0 +1,51 @@
+import pytest
+
+from template_analysis.minhash import (
+    SIGNATURE_SIZE,
+    guide_tree,
+    signature,
+    similarity,
+)
+
+
+def test_signature_is_deterministic_and_dense() -> None:
+    sig = signature("user=42 action=login")
+
+    assert len(sig) == SIGNATURE_SIZE
+    assert all(value >= 0 for value in sig)
+    assert sig == signature("user=42 action=login")
+
+
+def test_similarity_orders_texts_by_shared_shingles() -> None:
+    base = signature("user=42 action=login from 10.0.0.1")
+    near = signature("user=43 action=login from 10.0.0.1")
+    far = signature("disk /dev/sda1 is 98% full")
+
+    assert similarity(base, base) == pytest.approx(1.0)
+    assert similarity(base, near) > similarity(base, far)
+
+
+def test_signature_of_short_and_empty_texts() -> None:
+    assert similarity(signature(""), signature("")) == pytest.approx(1.0)
+    assert similarity(signature("ab"), signature("cd")) < 1.0
+
+
+def test_guide_tree_merges_similar_texts_first() -> None:
+    texts = [
+        "user=1 action=login from 10.0.0.1",
+        "disk /dev/sda1 is 98% full",
+        "user=2 action=login from 10.0.0.2",
+        "disk /dev/sdb1 is 97% full",
+    ]
+
+    merges = guide_tree([signature(text) for text in texts])
+
+    assert merges[:2] == [(0, 2), (1, 3)] or merges[:2] == [(1, 3), (0, 2)]
+    assert merges[-1] == (0, 1)
+
+
+def test_guide_tree_connects_unrelated_texts() -> None:
+    texts = ["aaaa", "bbbb", "cccc"]
+
+    assert guide_tree([signature(text) for text in texts]) == [(0, 1), (0, 2)]
+    assert guide_tree([signature("only")]) == []
@@ -0,0 +1,83 @@
+import pytest
+
+from template_analysis import AnalyzerStats, analyze, refine
+
+HISTORY = [f"GET /item/{i} OK" for i in range(100)]
+
+
+def test_refine_matching_texts_keeps_the_template() -> None:
+    result = analyze(HISTORY)
+    refined = refine(result, ["GET /item/x OK", "GET /item/y OK"])
+
+    assert refined.to_format_string() == result.to_format_string()
+    assert refined.args[-2:] == [["x"], ["y"]]
+    assert refined.args[:100] == result.args
+
+
+def test_refine_splits_literals_and_backfills_old_rows() -> None:
+    texts = ["A dog is a good pet", "A cat is a good pet"]
+    result = refine(analyze(texts), ["A cat is a pretty pet"])
+
+    assert result.to_format_string() == "A {0} is a {1} pet"
+    assert result.args == [
+        ["dog", "good"],
+        ["cat", "good"],
+        ["cat", "pretty"],
+    ]
+    assert result == analyze([*texts, "A cat is a pretty pet"])
+
+
+def test_refine_does_not_align_the_history_again() -> None:
+    stats = AnalyzerStats()
+    texts = ["GET /item/x OK", "GET /item/y FAIL", "GET /item/z OK"]
+    result = refine(analyze(HISTORY), texts, stats=stats)
+
+    assert len(stats.merges) == 1
+    assert result.to_format_string() == "GET /item/{0} {1}"
+    assert result.column(1)[:100] == ("OK",) * 100
+    assert result.column(1)[100:] == ("OK", "FAIL", "OK")
+
+
+def test_refine_leaves_the_given_result_unchanged() -> None:
+    result = analyze(["id=1", "id=2"])
+    refined = refine(result, ["id=3"])
+    refine(result, ["key=4"])
+
+    assert result.args == [["1"], ["2"]]
+    assert refined.args == [["1"], ["2"], ["3"]]
+
+
+def test_refine_with_no_texts() -> None:
+    result = analyze(["id=1", "id=2"])
+
+    assert refine(result, []) is result
+
+
+def test_refine_bytes() -> None:
+    result = analyze([b"id=1 OK", b"id=2 OK"])
+    result = refine(result, [b"id=\xff FAIL"])
+
+    assert result.byte_args == [
+        [b"1", b"OK"],
+        [b"2", b"OK"],
+        [b"\xff", b"FAIL"],
+    ]
+
+
+@pytest.mark.parametrize(
+    ("texts", "new"),
+    [(["id=1"], [b"id=2"]), ([b"id=1"], ["id=2"])],
+)
+def test_refine_rejects_other_kinds(
+    texts: list[str | bytes],
+    new: list[str | bytes],
+) -> None:
+    with pytest.raises(ValueError, match="mix str and bytes"):
+        refine(analyze(texts), new)
+
+
+def test_refine_keeps_the_approximate_flag() -> None:
+    result = analyze(["id=1 ok", "id=2 ok"], budget=0)
+
+    assert refine(result, ["id=3 ok"]).approximate
+    assert not refine(analyze(["id=1"]), ["id=2"]).approximate
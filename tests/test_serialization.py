@@ -0,0 +1,223 @@
+import contextlib
+import json
+import re
+
+import pytest
+
+from template_analysis import (
+    PlainText,
+    SerializationFormat,
+    StreamingAnalyzer,
+    Template,
+    Variable,
+    analyze,
+    dump_result,
+    dump_template,
+    load_result,
+    load_template,
+)
+
+TEXTS = ["A dog is a good pet", "A cat is a pretty pet", "A cät {x} pet"]
+FORMATS = ["binary", "json"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_template_roundtrip(fmt: str) -> None:
+    template = analyze(TEXTS).template
+
+    loaded = load_template(dump_template(template, fmt=fmt))  # type: ignore[arg-type]
+
+    assert loaded.to_format_string() == template.to_format_string()
+    assert loaded.literals() == template.literals()
+
+
+def test_template_joins_plain_text_parts() -> None:
+    template = Template([PlainText("a"), PlainText("b"), Variable(0)])
+
+    loaded = load_template(dump_template(template))
+
+    assert loaded == Template([PlainText("ab"), Variable(0)])
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("texts", [TEXTS, ["same", "same"], ["", "x"]])
+def test_result_roundtrip(fmt: str, texts: list[str]) -> None:
+    result = analyze(texts)
+
+    loaded = load_result(dump_result(result, fmt=fmt))  # type: ignore[arg-type]
+
+    assert loaded == result
+    assert loaded.args == result.args
+    assert loaded.sources == result.sources
+
+
+def test_result_roundtrip_keeps_tokens() -> None:
+    result = analyze(["hello dog", "hello cat"], tokenizer="word")
+
+    loaded = load_result(dump_result(result))
+
+    tokens = [t for t in result.text if isinstance(t, str)]
+    assert [t for t in loaded.text if isinstance(t, str)] == tokens
+    assert tokens == ["hello", " "]
+    assert len(loaded.text) == len(result.text)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_result_roundtrip_keeps_bytes(fmt: SerializationFormat) -> None:
+    result = analyze([b"id=\xe9", b"id=\xff"])
+    loaded = load_result(dump_result(result, fmt=fmt))
+
+    assert loaded.byte_args == [[b"\xe9"], [b"\xff"]]
+    assert loaded == result
+    assert loaded != analyze(["id=\xe9", "id=\xff"])
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_result_roundtrip_keeps_approximate(fmt: SerializationFormat) -> None:
+    approximate = analyze(TEXTS, max_comparisons=1)
+
+    assert approximate.approximate
+    assert load_result(dump_result(approximate, fmt=fmt)).approximate
+    assert not load_result(dump_result(analyze(TEXTS), fmt=fmt)).approximate
+
+
+def test_loaded_result_can_be_merged_further() -> None:
+    stream = StreamingAnalyzer.create()
+    stream.result = load_result(dump_result(analyze(TEXTS[:2])))
+    stream.count = 2
+    stream.feed(TEXTS[2])
+
+    assert stream.snapshot() == analyze(TEXTS)
+
+
+def test_binary_is_smaller_than_json() -> None:
+    result = analyze([f"user={i} action=login" for i in range(100)])
+
+    assert len(dump_result(result)) < len(dump_result(result, fmt="json"))
+
+
+def test_json_is_a_plain_document() -> None:
+    document = json.loads(dump_result(analyze(["id=1", "id=2"]), fmt="json"))
+
+    assert document["items"] == ["id=", 0]
+    assert document["columns"] == [["1", "2"]]
+
+
+def test_load_accepts_str() -> None:
+    data = dump_template(Template([Variable(0)]), fmt="json").decode()
+
+    assert load_template(data) == Template([Variable(0)])
+
+
+def test_load_rejects_other_kind() -> None:
+    data = dump_template(Template([Variable(0)]))
+
+    with pytest.raises(ValueError, match="Expected a serialized result"):
+        load_result(data)
+
+
+def test_load_rejects_unknown_version() -> None:
+    document = json.loads(dump_template(Template([]), fmt="json"))
+    document["version"] = 99
+
+    with pytest.raises(ValueError, match="Unsupported serialization version"):
+        load_template(json.dumps(document))
+
+
+def test_load_rejects_truncated_data() -> None:
+    data = dump_result(analyze(TEXTS))
+
+    with pytest.raises(ValueError, match="Truncated"):
+        load_result(data[:-3])
+
+
+# Offsets of the kind, has tokens, flags and typecode bytes of the binary
+# header.
+@pytest.mark.parametrize(
+    ("offset", "byte", "message"),
+    [
+        (5, 7, "bad header"),
+        (6, 2, "bad header"),
+        (7, 0x80, "bad header"),
+        (7, 0x04, "bad header"),
+        (8, ord("f"), "typecode"),
+    ],
+)
+def test_load_rejects_corrupt_header(
+    offset: int,
+    byte: int,
+    message: str,
+) -> None:
+    data = bytearray(dump_result(analyze(TEXTS)))
+    data[offset] = byte
+
+    with pytest.raises(ValueError, match=message):
+        load_result(bytes(data))
+
+
+@pytest.mark.parametrize("tokenizer", ["char", "word"])
+@pytest.mark.parametrize("mask", [0xFF, *(1 << bit for bit in range(8))])
+def test_load_raises_value_error_on_any_corrupt_byte(
+    tokenizer: str,
+    mask: int,
+) -> None:
+    data = dump_result(analyze(TEXTS, tokenizer=tokenizer))
+    for i in range(4, len(data)):
+        corrupt = bytearray(data)
+        corrupt[i] ^= mask
+        with contextlib.suppress(ValueError):
+            load_result(bytes(corrupt))
+
+
+def test_load_rejects_corrupt_token_lengths() -> None:
+    result = analyze(["hello dog", "hello cat"], tokenizer="word")
+    document = json.loads(dump_result(result, fmt="json"))
+    document["tokens"] = [len("hello"), 0, 1]
+
+    with pytest.raises(ValueError, match="bad token lengths"):
+        load_result(json.dumps(document))
+
+
+@pytest.mark.parametrize("key", ["kind", "items"])
+def test_load_rejects_json_without_required_keys(key: str) -> None:
+    document = json.loads(dump_result(analyze(TEXTS), fmt="json"))
+    del document[key]
+
+    with pytest.raises(ValueError, match=f"missing or invalid '{key}'"):
+        load_result(json.dumps(document))
+
+
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [
+        ("kind", ["result"]),
+        ("items", "A {0} pet"),
+        ("items", [None]),
+        ("tokens", [1, "2"]),
+        ("rows", "3"),
+        ("rows", True),
+        ("columns", [1, 2]),
+        ("columns", [["dog"], [2]]),
+        ("binary", 1),
+        ("approximate", None),
+    ],
+)
+def test_load_rejects_json_with_mistyped_fields(
+    key: str,
+    value: object,
+) -> None:
+    document = json.loads(dump_result(analyze(TEXTS), fmt="json"))
+    document[key] = value
+
+    with pytest.raises(ValueError, match=f"missing or invalid '{key}'"):
+        load_result(json.dumps(document))
+
+
+def test_load_rejects_foreign_json() -> None:
+    with pytest.raises(ValueError, match=re.escape("Not a serialized")):
+        load_template("[]")
+
+
+def test_dump_rejects_unknown_format() -> None:
+    with pytest.raises(ValueError, match="Unknown format 'xml'"):
+        dump_template(Template([]), fmt="xml")  # type: ignore[arg-type]
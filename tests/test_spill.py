@@ -0,0 +1,96 @@
+import contextlib
+import gc
+from pathlib import Path
+
+import pytest
+
+from template_analysis import analyze, analyze_spilled
+
+TEXTS = [f"user={i} action=login" for i in range(10)]
+# Open file descriptors of this process, on Linux.
+FDS = Path("/proc/self/fd")
+
+
+def test_analyze_spilled_matches_analyze() -> None:
+    with analyze_spilled(iter(TEXTS), batch_size=3) as result:
+        expected = analyze(TEXTS)
+        assert result.to_format_string() == expected.to_format_string()
+        assert len(result) == len(TEXTS)
+        assert list(result.rows()) == expected.args
+        assert result.to_result() == expected
+
+
+def test_analyze_spilled_with_word_tokenizer() -> None:
+    texts = ["A dog is a good pet", "A cat is a good pet"]
+    with analyze_spilled(texts, tokenizer="word") as result:
+        assert result.to_format_string() == "A {0} is a good pet"
+        assert list(result.column(0)) == ["dog", "cat"]
+
+
+def test_analyze_spilled_normalizes_sources(tmp_path: Path) -> None:
+    texts = ["cafe\u0301", "cafe"]
+    with analyze_spilled(texts, directory=tmp_path) as result:
+        assert list(result.sources()) == ["caf\u00e9", "cafe"]
+
+
+def test_analyze_spilled_keeps_no_rows_in_memory() -> None:
+    with analyze_spilled(TEXTS, batch_size=4) as result:
+        assert "table" not in vars(result)
+
+
+def test_close_removes_the_file(tmp_path: Path) -> None:
+    result = analyze_spilled(TEXTS, directory=tmp_path)
+    assert result.path.exists()
+
+    result.close()
+
+    assert not result.path.exists()
+    result.close()
+
+
+def test_garbage_collection_removes_the_file(tmp_path: Path) -> None:
+    analyze_spilled(TEXTS, directory=tmp_path)
+    gc.collect()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def _open_fds() -> int:
+    return len(list(FDS.iterdir()))
+
+
+@pytest.mark.skipif(
+    not FDS.is_dir(),
+    reason="needs /proc/self/fd",
+)
+@pytest.mark.parametrize("texts", [TEXTS, []])
+def test_analyze_spilled_closes_the_file(
+    tmp_path: Path,
+    texts: list[str],
+) -> None:
+    before = _open_fds()
+    for _ in range(5):
+        with contextlib.suppress(ValueError):
+            analyze_spilled(texts, directory=tmp_path).close()
+    gc.collect()
+
+    assert _open_fds() == before
+
+
+@pytest.mark.parametrize(
+    ("texts", "batch_size", "message"),
+    [
+        ([], 1, "texts are empty"),
+        (TEXTS, 0, "batch_size must be at least 1"),
+    ],
+)
+def test_analyze_spilled_rejects(
+    tmp_path: Path,
+    texts: list[str],
+    batch_size: int,
+    message: str,
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        analyze_spilled(texts, batch_size=batch_size, directory=tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,49 @@
+import pytest
+
+from template_analysis import (
+    AnalyzerStats,
+    MergeStats,
+    StreamingAnalyzer,
+    analyze,
+)
+
+TEXTS = ["A dog is good", "A cat is nice", "A bird is calm", "A fox is shy"]
+
+
+def test_stats_records_every_merge() -> None:
+    stats = AnalyzerStats()
+
+    result = analyze(TEXTS, stats=stats)
+
+    assert result == analyze(TEXTS)
+    assert len(stats.merges) == len(TEXTS) - 1
+    assert [merge.rows for merge in stats.merges] == [2, 3, 4]
+    last = stats.merges[-1]
+    assert last.right_length == len(TEXTS[-1])
+    assert last.symbols == len(result.symbols)
+    assert last.blocks >= 1
+    assert stats.seconds == pytest.approx(
+        stats.align_seconds + stats.walk_seconds + stats.table_seconds,
+    )
+
+
+def test_stats_tree_merges_in_worker_processes() -> None:
+    stats = AnalyzerStats()
+
+    analyze(TEXTS * 3, merge_order="tree", workers=2, stats=stats)
+
+    assert len(stats.merges) == len(TEXTS) * 3 - 1
+    assert sorted(merge.rows for merge in stats.merges)[-1] == len(TEXTS) * 3
+
+
+def test_stats_record_can_be_overridden() -> None:
+    seen: list[int] = []
+
+    class Forwarding(AnalyzerStats):
+        def record(self, merge: MergeStats) -> None:
+            seen.append(merge.rows)
+
+    stream = StreamingAnalyzer.create(stats=Forwarding())
+    stream.feed_many(TEXTS[:3])
+
+    assert seen == [2, 3]
@@ -0,0 +1,82 @@
+import pytest
+
+from template_analysis import analyze
+from template_analysis.streaming import StreamingAnalyzer
+
+
+def test_streaming_analyzer_matches_analyze() -> None:
+    texts = [
+        "A dog is a good pet",
+        "A cat is a good pet",
+        "A cat is a pretty pet",
+        "A bird is a great pet",
+    ]
+    stream = StreamingAnalyzer.create()
+    stream.feed_many(text for text in texts)
+
+    assert stream.count == 4
+    assert stream.snapshot() == analyze(texts)
+
+
+def test_streaming_analyzer_snapshot_is_not_affected_by_later_feeds() -> None:
+    stream = StreamingAnalyzer.create()
+    stream.feed("A dog is a good pet")
+    stream.feed("A cat is a good pet")
+    snapshot = stream.snapshot()
+
+    stream.feed("A cat is a pretty pet")
+
+    assert snapshot.to_format_string() == "A {0} is a good pet"
+    assert snapshot.args == [["dog"], ["cat"]]
+    assert stream.snapshot().to_format_string() == "A {0} is a {1} pet"
+
+
+def test_streaming_analyzer_tokenizer() -> None:
+    stream = StreamingAnalyzer.create(tokenizer="word")
+    stream.feed_many(["The dog barks", "The frog barks"])
+
+    assert stream.snapshot().to_format_string() == "The {0} barks"
+
+
+def test_streaming_analyzer_empty_snapshot() -> None:
+    with pytest.raises(ValueError, match="texts are empty"):
+        StreamingAnalyzer.create().snapshot()
+
+
+def test_streaming_analyzer_max_texts() -> None:
+    stream = StreamingAnalyzer.create(max_texts=1)
+    stream.feed("a")
+    with pytest.raises(ValueError, match="Too many texts"):
+        stream.feed("b")
+    assert stream.count == 1
+
+
+def test_streaming_analyzer_backend() -> None:
+    stream = StreamingAnalyzer.create(backend="myers")
+    stream.feed_many(["A dog is a good pet", "A cat is a good pet"])
+
+    assert stream.snapshot().to_format_string() == "A {0} is a good pet"
+
+
+def test_streaming_feed_result_merges_a_batch() -> None:
+    texts = ["A dog is good", "A cat is nice", "A bird is calm"]
+    stream = StreamingAnalyzer.create(max_texts=3)
+    stream.feed(texts[0])
+
+    stream.feed_result(analyze(texts[1:]))
+
+    assert stream.count == 3
+    assert stream.snapshot() == analyze(texts)
+    with pytest.raises(ValueError, match="Too many texts"):
+        stream.feed_result(analyze(["x"]))
+
+
+def test_streaming_feed_result_merges_its_own_snapshot() -> None:
+    stream = StreamingAnalyzer.create()
+    stream.feed_many(["a x b", "a y b"])
+
+    stream.feed_result(stream.snapshot())
+
+    result = stream.snapshot()
+    assert result.to_format_string() == "a {0} b"
+    assert result.args == [["x"], ["y"], ["x"], ["y"]]
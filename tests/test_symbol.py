@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from template_analysis.symbol import (
@@ -100,3 +102,14 @@ def test_symbol_template() -> None:
     template = SymbolTemplate(["a", "b", symbol1, "c", "d"], table)
     assert template.resolve() == ["a", "b", "x", "c", "d"]
     assert template.args() == ["x"]
+
+
+def test_symbol_table_pickle_keeps_symbol_identity() -> None:
+    symbol = Symbol.create()
+    table = SymbolTable.create().add(symbol, "x")
+
+    restored_symbol, restored_table = pickle.loads(  # noqa: S301
+        pickle.dumps((symbol, table)),
+    )
+
+    assert restored_table.lookup(restored_symbol) == "x"
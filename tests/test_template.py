@@ -40,3 +40,25 @@ def test_template_to_format_string_preserves_literal_braces() -> None:
     assert format_string.startswith("{{name}} is a ")
     assert format_string.endswith(" in {{group}}")
     assert format_string.format("dog") == "{name} is a dog in {group}"
+
+
+def test_template_literals_joins_plain_text() -> None:
+    template = Template(
+        [
+            PlainText("a"),
+            PlainText("b"),
+            Variable(0),
+            Variable(1),
+            PlainText("c"),
+        ],
+    )
+    assert template.literals() == ("ab", "", "c")
+    assert Template([]).literals() == ("",)
+
+
+def test_template_compile() -> None:
+    template = Template([PlainText("cogito "), Variable(0), PlainText(" sum")])
+    matcher = template.compile()
+
+    assert matcher.match("cogito ergo sum") == ["ergo"]
+    assert matcher.match("cogito ergo") is None
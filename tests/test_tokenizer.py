@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+from template_analysis.tokenizer import (
+    RegexTokenizer,
+    nfc,
+    resolve_tokenizer,
+    tokenize_chars,
+)
+
+
+def test_tokenize_chars() -> None:
+    assert tokenize_chars("abc") == ("a", "b", "c")
+    assert tokenize_chars("") == ()
+
+
+def test_word_tokenizer_splits_runs() -> None:
+    tokenizer = resolve_tokenizer("word")
+    assert tokenizer("user=alice, id 42") == (
+        "user",
+        "=",
+        "alice",
+        ",",
+        " ",
+        "id",
+        " ",
+        "42",
+    )
+
+
+def test_regex_tokenizer_keeps_unmatched_text() -> None:
+    tokenizer = RegexTokenizer(re.compile(r"\d+"))
+    assert tokenizer("a1b22") == ("a", "1", "b", "22")
+    assert tokenizer("") == ()
+
+
+def test_resolve_tokenizer_compiled_pattern() -> None:
+    tokenizer = resolve_tokenizer(re.compile(r"\S+"))
+    assert tokenizer("a bc") == ("a", " ", "bc")
+
+
+def test_resolve_tokenizer_callable_drops_empty_tokens() -> None:
+    tokenizer = resolve_tokenizer(lambda text: text.partition(":"))
+    assert tokenizer("key:") == ("key", ":")
+
+
+def test_resolve_tokenizer_callable_must_preserve_text() -> None:
+    tokenizer = resolve_tokenizer(str.split)
+    with pytest.raises(ValueError, match="joined tokens differ"):
+        tokenizer("a b")
+
+
+def test_resolve_tokenizer_unknown_name() -> None:
+    with pytest.raises(ValueError, match="Unknown tokenizer 'line'"):
+        resolve_tokenizer("line")
+
+
+def test_nfc_returns_ascii_unchanged() -> None:
+    text = "user=42 action=login"
+
+    assert nfc(text) is text
+    assert nfc("cafe\u0301") == "caf\u00e9"
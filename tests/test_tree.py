@@ -0,0 +1,155 @@
+import pytest
+
+from template_analysis import PlainText, Template, analyze_tree
+from template_analysis.tree import (
+    Element,
+    ElementTemplate,
+    SubtreeSlot,
+    TextSlot,
+    parse_html,
+    parse_json,
+)
+
+
+def test_parse_html_closes_unclosed_elements() -> None:
+    root = parse_html("<div><p>a<p>b</div></span><!-- note -->c")
+
+    assert root == Element(
+        "",
+        (),
+        (
+            Element(
+                "div",
+                (),
+                (Element("p", (), ("a", Element("p", (), ("b",)))),),
+            ),
+            "c",
+        ),
+    )
+
+
+def test_parse_html_void_and_self_closing_elements() -> None:
+    root = parse_html('<img src="a.png">x<br/>y &amp; z')
+
+    assert root.children == (
+        Element("img", (("src", "a.png"),)),
+        "x",
+        Element("br"),
+        "y & z",
+    )
+
+
+def test_parse_json_scalars_keep_their_json_text() -> None:
+    root = parse_json('[1, "a", null, {"k": true}]')
+
+    assert root.children == (
+        Element(
+            "[]",
+            (),
+            (
+                "1",
+                '"a"',
+                "null",
+                Element("{}", (), (Element(":k", (), ("true",)),)),
+            ),
+        ),
+    )
+
+
+def test_analyze_tree_html_aligns_elements() -> None:
+    texts = [
+        '<div class="user"><h1>Alice</h1><p>Admin since 2019</p></div>',
+        '<div class="user"><h1>Bob</h1><p>Admin since 2023</p></div>',
+    ]
+
+    result = analyze_tree(texts)
+
+    assert result.to_format_string() == (
+        '<div class="user"><h1>{0}</h1><p>Admin since 20{1}</p></div>'
+    )
+    assert result.args == [["Alice", "19"], ["Bob", "23"]]
+
+
+def test_analyze_tree_html_missing_children_become_subtrees() -> None:
+    texts = [
+        "<ul><li>a</li><li>b</li></ul>",
+        "<ul><li>c</li></ul>",
+        "<ul><li>d</li><li>e</li><li>f</li></ul>",
+    ]
+
+    result = analyze_tree(texts)
+
+    (ul,) = result.root.children
+    assert isinstance(ul, ElementTemplate)
+    assert [type(child) for child in ul.children] == [
+        ElementTemplate,
+        SubtreeSlot,
+    ]
+    assert result.to_format_string() == "<ul><li>{0}</li>{1}</ul>"
+    assert result.args == [
+        ["a", "<li>b</li>"],
+        ["c", ""],
+        ["d", "<li>e</li><li>f</li>"],
+    ]
+
+
+def test_analyze_tree_does_not_align_across_tags() -> None:
+    texts = ["<b>x</b><i>y</i>", "<i>y</i>"]
+
+    result = analyze_tree(texts)
+
+    assert result.to_format_string() == "{0}<i>y</i>"
+    assert result.args == [["<b>x</b>"], [""]]
+
+
+def test_analyze_tree_json() -> None:
+    texts = [
+        '{"id": 1, "name": "Alice", "tags": ["a"]}',
+        '{"id": 22, "name": "Bob", "tags": ["b"]}',
+    ]
+
+    result = analyze_tree(texts, fmt="json")
+
+    assert result.to_format_string() == (
+        '{{"id": {0}, "name": "{1}", "tags": ["{2}"]}}'
+    )
+    assert result.args == [["1", "Alice", "a"], ["22", "Bob", "b"]]
+
+
+def test_analyze_tree_json_members_named_like_containers() -> None:
+    texts = ['{"{}": {"a": 1}, "[]": [1]}', '{"{}": {"a": 2}}']
+
+    result = analyze_tree(texts, fmt="json")
+
+    assert result.to_format_string() == '{{"{{}}": {{"a": {0}}}, {1}}}'
+    assert result.args == [["1", '"[]": [1]'], ["2", ""]]
+
+
+def test_analyze_tree_identical_documents_have_no_variables() -> None:
+    result = analyze_tree(["<p>same</p>"] * 3)
+
+    (p,) = result.root.children
+    assert p == ElementTemplate(
+        "p",
+        (),
+        (TextSlot(Template([PlainText("same")])),),
+    )
+    assert result.to_format_string() == "<p>same</p>"
+    assert result.args == [[], [], []]
+
+
+@pytest.mark.parametrize(
+    ("texts", "fmt", "message"),
+    [
+        ([], "html", "texts are empty"),
+        (["<p/>"], "xml", "Unknown format 'xml'"),
+        (["{"], "json", "Expecting"),
+    ],
+)
+def test_analyze_tree_rejects(
+    texts: list[str],
+    fmt: str,
+    message: str,
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        analyze_tree(texts, fmt=fmt)  # type: ignore[arg-type]